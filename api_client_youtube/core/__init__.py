@@ -1,4 +1,24 @@
 from api_client_youtube.core.service import YouTubeService
 from api_client_youtube.core.cache import CacheManager
+from api_client_youtube.core.persistent_cache import PersistentCache
+from api_client_youtube.core.http import create_session, session_scope
+from api_client_youtube.core.stream_cache import StreamCache
+from api_client_youtube.core.executor import ExtractionExecutor, ExtractionBacklogFull, ExtractionTimeout
+from api_client_youtube.core.quota import QuotaTracker
+from api_client_youtube.core.ydl_pool import YDLPool
+from api_client_youtube.core.scheduler import FairScheduler
 
-__all__ = ['YouTubeService', 'CacheManager']
\ No newline at end of file
+__all__ = [
+    'YouTubeService', 
+    'CacheManager', 
+    'PersistentCache', 
+    'StreamCache', 
+    'create_session', 
+    'session_scope', 
+    'ExtractionExecutor', 
+    'ExtractionBacklogFull', 
+    'ExtractionTimeout', 
+    'QuotaTracker', 
+    'YDLPool', 
+    'FairScheduler'
+]
\ No newline at end of file
@@ -1,52 +1,336 @@
-from datetime import datetime
+import asyncio
+import sys
+import time
+from collections import OrderedDict
+from datetime import timedelta
 
 class CacheManager:
     """
     Manages caching of YouTube API responses
+
+    Entries are kept in least-recently-used order and bounded by entry count
+    and approximate size. Each key prefix (namespace) can have its own TTL and
+    a background sweeper drops expired entries that are never read again.
+
+    Concurrent fetches of the same key can be coalesced with single_flight(),
+    and failed lookups are cached briefly with add_negative() so a broken
+    video does not get re-requested on every call, nor stuck for hours.
     """
-    def __init__(self, cache_timeout):
+    def __init__(self, cache_timeout, max_entries=5000, max_bytes=None, namespace_timeouts=None, sweep_interval=300, persistent=None, negative_timeout=timedelta(seconds=60)):
         """
         Initialize the cache manager
-        
+
         Args:
-            cache_timeout (timedelta): Time before cache entries expire
+            cache_timeout (timedelta): Default time before cache entries expire
+            max_entries (int, optional): Maximum number of entries kept in memory
+            max_bytes (int, optional): Maximum approximate size of all cached values
+            namespace_timeouts (dict, optional): Key prefix -> timedelta overriding the default timeout
+            sweep_interval (float): Seconds between background expiry sweeps
+            persistent (PersistentCache, optional): On-disk tier consulted on misses
+            negative_timeout (timedelta): Time before negative (failed lookup) entries expire
         """
         self.cache_timeout = cache_timeout
-        self.cache_timestamp = {}  # Store timestamps for cache invalidation
-        self.cache_data = {}  # Store actual cache data
-    
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.namespace_timeouts = dict(namespace_timeouts or {})
+        self.sweep_interval = sweep_interval
+        self.persistent = persistent
+        self.negative_timeout = negative_timeout
+
+        self.cache_data = OrderedDict()  # Key -> value, least recently used first
+        self.cache_expiry = {}  # Key -> expiry time (epoch seconds)
+        self.cache_sizes = {}  # Key -> approximate size in bytes
+        self.total_bytes = 0
+
+        self._inflight = {}  # Key -> task fetching the value for that key
+
+        self.stats = {'hits': 0, 'misses': 0, 'disk_hits': 0, 'evictions': 0, 'expirations': 0, 'coalesced': 0, 'negative': 0}
+        self._sweeper_task = None
+
     def get_from_cache(self, key):
         """
-        Get a value from cache if it exists and is not expired
-        
+        Get a value from the in-memory cache if it exists and is not expired
+
+        Never touches the disk tier, use get_cached() from async code for that.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            object: Cached value or None if not found or expired
+        """
+        value = self._get_memory(key)
+        if value is None:
+            self.stats['misses'] += 1
+        return value
+
+    async def get_cached(self, key):
+        """
+        Get a value from memory, falling back to the disk tier on a worker thread
+
+        Entries found on disk are promoted into memory.
+
         Args:
             key (str): Cache key
-            
+
         Returns:
             object: Cached value or None if not found or expired
         """
-        if key in self.cache_timestamp:
-            # Check if cache is expired
-            if datetime.now() - self.cache_timestamp[key] < self.cache_timeout:
-                return self.cache_data.get(key)
+        return (await self.get_many_cached([key])).get(key)
+
+    async def get_many_cached(self, keys):
+        """
+        Get several values, looking up all memory misses on disk in one query
+
+        Args:
+            keys (list): Cache keys
+
+        Returns:
+            dict: Key -> cached value for the keys found
+        """
+        found = {}
+        disk_keys = []
+        for key in keys:
+            value = self._get_memory(key)
+            if value is not None:
+                found[key] = value
+            elif self.persistent is not None and self.persistent.handles(key):
+                disk_keys.append(key)
             else:
-                # Expired, clean up
-                self.cache_data.pop(key, None)
-                self.cache_timestamp.pop(key, None)
-        return None
-    
-    def add_to_cache(self, key, value):
+                self.stats['misses'] += 1
+
+        if disk_keys:
+            stored = await asyncio.to_thread(self.persistent.get_many, disk_keys)
+            for key in disk_keys:
+                if key in stored:
+                    value, expires_at = stored[key]
+                    self._store(key, value, expires_at)
+                    self.stats['disk_hits'] += 1
+                    found[key] = value
+                else:
+                    self.stats['misses'] += 1
+
+        return found
+
+    def add_to_cache(self, key, value, timeout=None):
         """
-        Add a value to cache with current timestamp
-        
+        Add a value to cache, evicting least recently used entries if needed
+
         Args:
             key (str): Cache key
             value (object): Value to cache
+            timeout (timedelta, optional): Override the namespace/default timeout
         """
-        self.cache_data[key] = value
-        self.cache_timestamp[key] = datetime.now()
-    
+        timeout = timeout or self.get_timeout(key)
+        expires_at = time.time() + timeout.total_seconds()
+        self._store(key, value, expires_at)
+
+        if self.persistent is not None and self.persistent.handles(key):
+            self.persistent.put(key, value, expires_at)
+
+    def add_negative(self, key, value, timeout=None):
+        """
+        Cache the placeholder returned for a failed lookup
+
+        Negative entries use a short timeout and are only kept in memory, so
+        a temporary API failure is retried soon and never reaches the disk tier.
+
+        Args:
+            key (str): Cache key
+            value (object): Placeholder value (e.g. default details)
+            timeout (timedelta, optional): Override the negative timeout
+        """
+        timeout = timeout or self.negative_timeout
+        self._store(key, value, time.time() + timeout.total_seconds())
+        self.stats['negative'] += 1
+
+    async def single_flight(self, key, fetch):
+        """
+        Run a fetch for a key, sharing it with concurrent callers of the same key
+
+        The first caller starts fetch(); callers arriving before it finishes
+        await the same result instead of issuing their own request. The fetch
+        runs to completion even if the caller that started it is cancelled.
+
+        Args:
+            key (str): Cache key identifying the request
+            fetch (callable): No-argument coroutine function producing the value
+
+        Returns:
+            object: Result of the shared fetch
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish_flight(key, done))
+        else:
+            self.stats['coalesced'] += 1
+
+        return await asyncio.shield(task)
+
+    def get_timeout(self, key):
+        """
+        Get the timeout that applies to a key based on its namespace prefix
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            timedelta: Timeout for the key
+        """
+        best_prefix = None
+        for prefix in self.namespace_timeouts:
+            if key.startswith(prefix) and (best_prefix is None or len(prefix) > len(best_prefix)):
+                best_prefix = prefix
+
+        if best_prefix is None:
+            return self.cache_timeout
+        return self.namespace_timeouts[best_prefix]
+
+    def remove_expired(self):
+        """
+        Drop every expired entry
+
+        Returns:
+            int: Number of entries removed
+        """
+        now = time.time()
+        expired_keys = [key for key, expiry in self.cache_expiry.items() if expiry <= now]
+        for key in expired_keys:
+            self._remove(key)
+
+        self.stats['expirations'] += len(expired_keys)
+        return len(expired_keys)
+
+    def get_stats(self):
+        """
+        Get cache counters and current usage
+
+        Returns:
+            dict: Hit, miss, eviction and expiration counts plus entry count and size
+        """
+        return {
+            **self.stats,
+            'entries': len(self.cache_data),
+            'bytes': self.total_bytes
+        }
+
     def clear_cache(self):
         """Clear all cached data"""
         self.cache_data.clear()
-        self.cache_timestamp.clear()
\ No newline at end of file
+        self.cache_expiry.clear()
+        self.cache_sizes.clear()
+        self.total_bytes = 0
+
+        if self.persistent is not None:
+            self.persistent.clear()
+
+    async def close(self):
+        """Stop the sweeper and flush the on-disk tier without blocking the loop"""
+        self.stop_sweeper()
+        if self.persistent is not None:
+            await asyncio.to_thread(self.persistent.close)
+
+    def stop_sweeper(self):
+        """Stop the background expiry sweeper"""
+        if self._sweeper_task is not None:
+            self._sweeper_task.cancel()
+            self._sweeper_task = None
+
+    def _finish_flight(self, key, task):
+        """Forget a finished fetch and mark its exception as retrieved"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()
+
+    def _get_memory(self, key):
+        """Get an unexpired in-memory value, counting hits and expirations"""
+        if key not in self.cache_data:
+            return None
+
+        # Check if cache is expired
+        if time.time() < self.cache_expiry[key]:
+            self.cache_data.move_to_end(key)
+            self.stats['hits'] += 1
+            return self.cache_data[key]
+
+        # Expired, clean up
+        self._remove(key)
+        self.stats['expirations'] += 1
+        return None
+
+    def _store(self, key, value, expires_at):
+        """Insert a value into the in-memory tier and enforce limits"""
+        if key in self.cache_data:
+            self._remove(key)
+
+        size = _approximate_size(value)
+        self.cache_data[key] = value
+        self.cache_expiry[key] = expires_at
+        self.cache_sizes[key] = size
+        self.total_bytes += size
+
+        self._enforce_limits()
+        self._ensure_sweeper()
+
+    def _remove(self, key):
+        """Remove a key from all internal structures"""
+        self.cache_data.pop(key, None)
+        self.cache_expiry.pop(key, None)
+        self.total_bytes -= self.cache_sizes.pop(key, 0)
+
+    def _enforce_limits(self):
+        """Evict least recently used entries until the cache fits its limits"""
+        while self.cache_data and (
+            (self.max_entries and len(self.cache_data) > self.max_entries) or
+            (self.max_bytes and self.total_bytes > self.max_bytes)
+        ):
+            oldest_key = next(iter(self.cache_data))
+            self._remove(oldest_key)
+            self.stats['evictions'] += 1
+
+    def _ensure_sweeper(self):
+        """Start the background sweeper if an event loop is running"""
+        if self._sweeper_task is not None and not self._sweeper_task.done():
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No running loop (e.g. synchronous use), expiry happens on read
+
+        self._sweeper_task = loop.create_task(self._sweep_loop())
+
+    async def _sweep_loop(self):
+        """Periodically remove expired entries"""
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                removed = self.remove_expired()
+                if removed:
+                    print(f"Cache sweeper removed {removed} expired entries")
+            except Exception as e:
+                print(f"Error sweeping cache: {e}")
+
+
+def _approximate_size(value, _depth=0):
+    """
+    Estimate the memory footprint of a cached value
+
+    Args:
+        value (object): Value to measure
+
+    Returns:
+        int: Approximate size in bytes
+    """
+    size = sys.getsizeof(value)
+    if _depth > 4:
+        return size
+
+    if isinstance(value, dict):
+        size += sum(_approximate_size(k, _depth + 1) + _approximate_size(v, _depth + 1) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set)):
+        size += sum(_approximate_size(item, _depth + 1) for item in value)
+    return size
@@ -0,0 +1,183 @@
+"""
+Dedicated worker pool for blocking yt-dlp extraction work
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+
+class ExtractionBacklogFull(Exception):
+    """Raised when too many extraction calls are already waiting for a worker"""
+
+
+class ExtractionTimeout(Exception):
+    """Raised when an extraction call takes longer than its timeout"""
+
+
+class ExtractionExecutor:
+    """
+    Runs blocking extraction calls (yt-dlp) on a dedicated pool so the
+    event loop never stalls while YouTube pages are fetched and parsed
+    """
+    def __init__(self, kind='thread', max_workers=4, timeout=30, max_backlog=64):
+        """
+        Initialize the extraction executor
+
+        Args:
+            kind (str): 'thread' or 'process' worker pool
+            max_workers (int): Number of extractions allowed to run at once
+            timeout (float): Default per-call timeout in seconds
+            max_backlog (int): Maximum number of calls allowed to wait for a free worker
+        """
+        if kind not in ('thread', 'process'):
+            raise ValueError(f"Unknown executor kind: {kind}")
+
+        self.kind = kind
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_backlog = max_backlog
+
+        self._pool = None
+        self._local_pool = None  # Threads for run_local() when the main pool is process based
+        self._slots = asyncio.Semaphore(max_workers)
+        self._waiting = 0  # Calls waiting for a free worker
+        self._running = 0  # Calls currently executing in the pool
+
+    def _get_pool(self):
+        """Create the worker pool on first use"""
+        if self._pool is None:
+            if self.kind == 'process':
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix='yt-extract'
+                )
+        return self._pool
+
+    def _get_local_pool(self):
+        """Get a thread pool of this process (the main pool when it is thread based)"""
+        if self.kind == 'thread':
+            return self._get_pool()
+        if self._local_pool is None:
+            self._local_pool = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix='yt-extract-local'
+            )
+        return self._local_pool
+
+    async def run(self, func, *args, timeout=None, **kwargs):
+        """
+        Run a blocking function on the worker pool
+
+        Args:
+            func (callable): Blocking function to run (must be picklable for process pools)
+            *args: Positional arguments for the function
+            timeout (float, optional): Override the default timeout in seconds
+            **kwargs: Keyword arguments for the function
+
+        Returns:
+            object: Return value of the function
+
+        Raises:
+            ExtractionBacklogFull: If the backlog is at capacity
+            ExtractionTimeout: If the call does not finish in time
+        """
+        return await self._run(self._get_pool, func, args, kwargs, timeout)
+
+    async def run_local(self, func, *args, timeout=None, **kwargs):
+        """
+        Run a blocking function on a thread of this process, with the same limits as run()
+
+        For work bound to state that cannot be sent to a worker process,
+        such as a lazy playlist walk that continues across calls.
+
+        Args:
+            func (callable): Blocking function to run
+            *args: Positional arguments for the function
+            timeout (float, optional): Override the default timeout in seconds
+            **kwargs: Keyword arguments for the function
+
+        Returns:
+            object: Return value of the function
+
+        Raises:
+            ExtractionBacklogFull: If the backlog is at capacity
+            ExtractionTimeout: If the call does not finish in time
+        """
+        return await self._run(self._get_local_pool, func, args, kwargs, timeout)
+
+    async def _run(self, get_pool, func, args, kwargs, timeout):
+        """Wait for a worker slot, then run a call on the given pool"""
+        if self._waiting >= self.max_backlog:
+            raise ExtractionBacklogFull(
+                f"Extraction backlog full ({self._waiting} calls waiting)"
+            )
+
+        # Wait for a free worker so the timeout only covers actual execution
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+
+        loop = asyncio.get_running_loop()
+        self._running += 1
+        try:
+            work = get_pool().submit(functools.partial(func, *args, **kwargs))
+        except BaseException:
+            self._running -= 1
+            self._slots.release()
+            raise
+
+        # Keep the slot until the worker really finishes, even if the caller
+        # gives up early - a running thread cannot be interrupted
+        def _release(_):
+            try:
+                loop.call_soon_threadsafe(self._release_slot)
+            except RuntimeError:
+                pass  # Event loop already closed
+        work.add_done_callback(_release)
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(work), timeout or self.timeout)
+        except asyncio.TimeoutError:
+            work.cancel()
+            raise ExtractionTimeout(f"Extraction timed out after {timeout or self.timeout}s")
+        except asyncio.CancelledError:
+            work.cancel()
+            raise
+
+    def _release_slot(self):
+        """Release a worker slot (called on the event loop)"""
+        self._running -= 1
+        self._slots.release()
+
+    def stats(self):
+        """
+        Get current executor load
+
+        Returns:
+            dict: Number of running and waiting calls plus configured limits
+        """
+        return {
+            'kind': self.kind,
+            'running': self._running,
+            'waiting': self._waiting,
+            'max_workers': self.max_workers,
+            'max_backlog': self.max_backlog
+        }
+
+    def shutdown(self, wait=False):
+        """
+        Shut down the worker pool
+
+        Args:
+            wait (bool): Wait for running extractions to finish
+        """
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+        if self._local_pool is not None:
+            self._local_pool.shutdown(wait=wait, cancel_futures=True)
+            self._local_pool = None
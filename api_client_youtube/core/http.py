@@ -0,0 +1,50 @@
+"""
+HTTP session helpers for the YouTube API client
+"""
+from contextlib import asynccontextmanager
+import aiohttp
+
+def create_session(limit=20, limit_per_host=10, keepalive_timeout=60, dns_cache_ttl=300, request_timeout=15):
+    """
+    Create a pooled aiohttp session tuned for repeated calls to googleapis.com
+
+    Args:
+        limit (int): Maximum number of open connections
+        limit_per_host (int): Maximum number of open connections per host
+        keepalive_timeout (float): Seconds an idle connection is kept alive
+        dns_cache_ttl (int): Seconds resolved DNS entries are cached
+        request_timeout (float): Total timeout for a single request in seconds
+
+    Returns:
+        aiohttp.ClientSession: New client session
+    """
+    connector = aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        keepalive_timeout=keepalive_timeout,
+        ttl_dns_cache=dns_cache_ttl,
+        use_dns_cache=True,
+        enable_cleanup_closed=True
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=request_timeout)
+    )
+
+@asynccontextmanager
+async def session_scope(session=None):
+    """
+    Use the given session, or a temporary one if none was injected
+
+    Args:
+        session (aiohttp.ClientSession, optional): Shared session to reuse
+
+    Yields:
+        aiohttp.ClientSession: Session to issue requests with
+    """
+    if session is not None:
+        yield session
+        return
+
+    async with aiohttp.ClientSession() as temporary_session:
+        yield temporary_session
@@ -0,0 +1,198 @@
+"""
+Optional on-disk tier for the metadata cache, backed by SQLite
+"""
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+# Key prefixes worth keeping across restarts (video/playlist metadata and search results)
+DEFAULT_PERSISTED_PREFIXES = ('video_details_', 'playlist_details_', 'videos_', 'playlists_')
+
+_STOP = object()
+_CLEAR = object()
+
+class PersistentCache:
+    """
+    SQLite store for cache entries and their expiry times
+
+    Reads are primary-key lookups made only when the in-memory cache
+    misses, so entries are loaded lazily. They are blocking and meant to be
+    run off the event loop (CacheManager.get_cached uses a worker thread).
+    Writes are queued and committed in batches by a background thread, so
+    callers never wait on disk I/O.
+    """
+    def __init__(self, path, prefixes=DEFAULT_PERSISTED_PREFIXES, purge_interval=3600):
+        """
+        Initialize the persistent cache
+
+        Args:
+            path (str): SQLite database file (e.g. on a mounted volume)
+            prefixes (tuple): Key prefixes that should be persisted
+            purge_interval (float): Seconds between deletions of expired rows
+
+        Raises:
+            sqlite3.Error: If the database cannot be opened or is not a valid SQLite file
+        """
+        self.path = path
+        self.prefixes = tuple(prefixes)
+        self.purge_interval = purge_interval
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+
+        self._reader = None
+        self._reader_lock = threading.Lock()  # Reads may come from several worker threads
+        # Opened here so a bad path or a corrupt file fails the constructor,
+        # then owned by the writer thread
+        connection = self._connect()
+
+        self._writes = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, args=(connection,), name='yt-cache-writer', daemon=True)
+        self._writer.start()
+
+    def handles(self, key):
+        """
+        Check whether a key belongs to a persisted namespace
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            bool: True if the key should be persisted
+        """
+        return key.startswith(self.prefixes)
+
+    def get(self, key):
+        """
+        Look up an unexpired entry (blocking)
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            tuple: (value, expiry epoch seconds) or None if missing or expired
+        """
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys):
+        """
+        Look up several unexpired entries in one query (blocking)
+
+        Args:
+            keys (list): Cache keys
+
+        Returns:
+            dict: Key -> (value, expiry epoch seconds) for the keys found
+        """
+        if not keys:
+            return {}
+
+        found = {}
+        try:
+            with self._reader_lock:
+                if self._reader is None:
+                    self._reader = self._connect()
+                # Stay below SQLite's default limit of 999 bound parameters
+                for i in range(0, len(keys), 500):
+                    chunk = keys[i:i + 500]
+                    rows = self._reader.execute(
+                        f"SELECT key, value, expires_at FROM cache WHERE key IN ({','.join('?' * len(chunk))}) AND expires_at > ?",
+                        (*chunk, time.time())
+                    ).fetchall()
+                    for key, value, expires_at in rows:
+                        found[key] = (json.loads(value), expires_at)
+        except Exception as e:
+            print(f"Error reading persistent cache: {e}")
+        return found
+
+    def put(self, key, value, expires_at):
+        """
+        Queue an entry to be written in the background
+
+        Args:
+            key (str): Cache key
+            value (object): JSON-serialisable value
+            expires_at (float): Expiry time in epoch seconds
+        """
+        # Nothing would drain the writes, keep them from piling up in memory
+        if self._writer.is_alive():
+            self._writes.put((key, value, expires_at))
+
+    def clear(self):
+        """Queue removal of all persisted entries"""
+        if self._writer.is_alive():
+            self._writes.put(_CLEAR)
+
+    def close(self, timeout=5):
+        """
+        Flush pending writes and stop the writer thread
+
+        Args:
+            timeout (float): Seconds to wait for pending writes
+        """
+        self._writes.put(_STOP)
+        self._writer.join(timeout)
+        with self._reader_lock:
+            if self._reader is not None:
+                self._reader.close()
+                self._reader = None
+
+    def _connect(self):
+        """Open a connection and make sure the schema exists"""
+        connection = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS cache ('
+            'key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)'
+        )
+        return connection
+
+    def _write_loop(self, connection):
+        """Background thread: batch queued writes into transactions"""
+        last_purge = 0
+
+        while True:
+            item = self._writes.get()
+            batch = [item]
+            # Drain whatever else is queued so bursts share one commit
+            while True:
+                try:
+                    batch.append(self._writes.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = False
+            try:
+                for entry in batch:
+                    if entry is _STOP:
+                        stop = True
+                    elif entry is _CLEAR:
+                        connection.execute('DELETE FROM cache')
+                    else:
+                        key, value, expires_at = entry
+                        try:
+                            serialised = json.dumps(value)
+                        except (TypeError, ValueError) as e:
+                            print(f"Skipping unserialisable cache entry {key}: {e}")
+                            continue
+                        connection.execute(
+                            'INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)',
+                            (key, serialised, expires_at)
+                        )
+
+                now = time.time()
+                if now - last_purge > self.purge_interval:
+                    connection.execute('DELETE FROM cache WHERE expires_at <= ?', (now,))
+                    last_purge = now
+
+                connection.commit()
+            except Exception as e:
+                print(f"Error writing persistent cache: {e}")
+
+            if stop:
+                connection.close()
+                return
@@ -0,0 +1,270 @@
+"""
+YouTube Data API quota accounting and request rate limiting
+"""
+import asyncio
+import json
+import os
+import time
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+# Unit cost of each Data API endpoint (list calls), see the API's quota calculator
+ENDPOINT_COSTS = {
+    'search': 100,
+    'videos': 1,
+    'playlists': 1,
+    'playlistItems': 1,
+    'channels': 1
+}
+
+# The daily quota resets at midnight Pacific Time
+QUOTA_TIMEZONE = ZoneInfo('America/Los_Angeles')
+
+# Error reasons the API returns once the daily quota is used up
+QUOTA_ERROR_REASONS = ('quotaExceeded', 'dailyLimitExceeded')
+
+class QuotaTracker:
+    """
+    Tracks Data API units spent against the daily budget
+    
+    Every request is charged its endpoint's unit cost before it is sent, and
+    passes through a token bucket that caps the request rate. Expensive calls
+    (search) stop being allowed once spending them would dip into the reserve,
+    which keeps the cheap 1-unit lookups working for the rest of the day.
+    
+    With a state path, today's usage is written to a JSON file a few seconds
+    after it changes and reloaded on startup, so restarts and deploys during
+    the day do not reset the count Google keeps.
+    """
+    def __init__(self, daily_budget=10000, reserve=1000, rate=5.0, burst=10, state_path=None, save_delay=10.0):
+        """
+        Initialize the quota tracker
+        
+        Args:
+            daily_budget (int): Units available per day
+            reserve (int): Units kept back from expensive endpoints for 1-unit calls
+            rate (float): Requests per second allowed on average
+            burst (int): Requests allowed back to back before rate limiting applies
+            state_path (str, optional): JSON file keeping today's usage across restarts
+            save_delay (float): Seconds usage changes are collected before the file is written
+        """
+        self.daily_budget = daily_budget
+        self.reserve = reserve
+        self.rate = rate
+        self.burst = burst
+        
+        self._day = self._current_day()
+        self._used = 0
+        self._exhausted = False  # The API reported the quota as used up
+        self._by_endpoint = {}  # Endpoint -> units used today
+        
+        self.state_path = state_path
+        self.save_delay = save_delay
+        self._save_task = None
+        self._load_state()
+        
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        
+        self.stats = {'requests': 0, 'denied': 0, 'throttled': 0}
+    
+    def cost(self, endpoint):
+        """
+        Get the unit cost of an endpoint
+        
+        Args:
+            endpoint (str): Endpoint name (e.g. 'search', 'videos')
+        
+        Returns:
+            int: Units charged per call
+        """
+        return ENDPOINT_COSTS.get(endpoint, 1)
+    
+    def remaining(self):
+        """
+        Get the units left today
+        
+        Returns:
+            int: Remaining units
+        """
+        self._roll_over()
+        if self._exhausted:
+            return 0
+        return max(self.daily_budget - self._used, 0)
+    
+    def can_spend(self, endpoint):
+        """
+        Check whether a call to an endpoint fits in today's budget
+        
+        Args:
+            endpoint (str): Endpoint name
+        
+        Returns:
+            bool: True if the call is allowed
+        """
+        cost = self.cost(endpoint)
+        floor = self.reserve if cost > 1 else 0
+        return self.remaining() - cost >= floor
+    
+    async def acquire(self, endpoint):
+        """
+        Charge a call to an endpoint, waiting for the rate limiter if needed
+        
+        Args:
+            endpoint (str): Endpoint name
+        
+        Returns:
+            bool: True if the request may be sent, False if the budget is spent
+        """
+        if not self.can_spend(endpoint):
+            self.stats['denied'] += 1
+            return False
+        
+        await self._take_token()
+        
+        # Charge after waiting so concurrent callers see each other's spending
+        if not self.can_spend(endpoint):
+            self.stats['denied'] += 1
+            return False
+        
+        cost = self.cost(endpoint)
+        self._used += cost
+        self._by_endpoint[endpoint] = self._by_endpoint.get(endpoint, 0) + cost
+        self.stats['requests'] += 1
+        self._schedule_save()
+        return True
+    
+    async def check_response(self, response):
+        """
+        Inspect a failed API response and stop spending if the quota ran out
+        
+        Args:
+            response (aiohttp.ClientResponse): Response with a non-200 status
+        """
+        if response.status not in (403, 429):
+            return
+        
+        try:
+            body = await response.json()
+            reasons = [error.get('reason') for error in body.get('error', {}).get('errors', [])]
+        except Exception:
+            return
+        
+        if any(reason in QUOTA_ERROR_REASONS for reason in reasons):
+            print(f"YouTube API quota exhausted ({', '.join(filter(None, reasons))}), pausing API calls until the daily reset")
+            self._exhausted = True
+            self._schedule_save()
+    
+    async def flush(self):
+        """Write pending usage now (e.g. on shutdown)"""
+        if self._save_task is not None and not self._save_task.done():
+            self._save_task.cancel()
+        self._save_task = None
+        
+        if self.state_path:
+            try:
+                await asyncio.to_thread(self._save_state, self._state())
+            except Exception as e:
+                print(f"Error saving quota state: {e}")
+    
+    def get_stats(self):
+        """
+        Get today's usage
+        
+        Returns:
+            dict: Units used and remaining, per-endpoint usage and request counters
+        """
+        remaining = self.remaining()
+        return {
+            **self.stats,
+            'day': self._day.isoformat(),
+            'used': self._used,
+            'remaining': remaining,
+            'budget': self.daily_budget,
+            'exhausted': self._exhausted,
+            'by_endpoint': dict(self._by_endpoint)
+        }
+    
+    def _roll_over(self):
+        """Reset usage when the Pacific Time day has changed"""
+        today = self._current_day()
+        if today != self._day:
+            self._day = today
+            self._used = 0
+            self._exhausted = False
+            self._by_endpoint.clear()
+    
+    def _state(self):
+        """Get today's usage as a JSON-serialisable dict"""
+        return {
+            'day': self._day.isoformat(),
+            'used': self._used,
+            'exhausted': self._exhausted,
+            'by_endpoint': dict(self._by_endpoint)
+        }
+    
+    def _schedule_save(self):
+        """Write the usage a few seconds from now, once per burst of changes"""
+        if not self.state_path or (self._save_task is not None and not self._save_task.done()):
+            return
+        try:
+            self._save_task = asyncio.get_running_loop().create_task(self._delayed_save())
+        except RuntimeError:
+            pass  # No running loop, flush() writes it later
+    
+    async def _delayed_save(self):
+        """Wait for more changes, then write the usage off the event loop"""
+        await asyncio.sleep(self.save_delay)
+        try:
+            await asyncio.to_thread(self._save_state, self._state())
+        except Exception as e:
+            print(f"Error saving quota state: {e}")
+    
+    def _load_state(self):
+        """Restore usage stored earlier on the same Pacific Time day"""
+        if not self.state_path or not os.path.exists(self.state_path):
+            return
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error reading quota state: {e}")
+            return
+        
+        if state.get('day') != self._day.isoformat():
+            return
+        
+        self._used = int(state.get('used', 0))
+        self._exhausted = bool(state.get('exhausted', False))
+        self._by_endpoint = {endpoint: int(units) for endpoint, units in state.get('by_endpoint', {}).items()}
+        print(f"Restored YouTube API quota usage for {state['day']}: {self._used} units")
+    
+    def _save_state(self, state):
+        """Write the usage atomically"""
+        directory = os.path.dirname(self.state_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+        
+        temp_path = f"{self.state_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(temp_path, self.state_path)
+    
+    @staticmethod
+    def _current_day():
+        """Get today's date in the quota's timezone"""
+        return datetime.now(QUOTA_TIMEZONE).date()
+    
+    async def _take_token(self):
+        """Wait until the token bucket allows another request"""
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+            self._refilled_at = now
+            
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            
+            self.stats['throttled'] += 1
+            await asyncio.sleep((1 - self._tokens) / self.rate)
@@ -0,0 +1,212 @@
+"""
+Fair-share admission of extraction and API work across guilds
+"""
+import asyncio
+import contextvars
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+
+# Lanes in priority order: resolving the stream of the next track, requests a
+# user is waiting on, and playlist paging/enrichment running in the background
+LANES = ('stream', 'interactive', 'background')
+
+# Guild the current task works for, set at the bot's entry points
+current_guild = contextvars.ContextVar('scheduler_guild', default=None)
+
+
+class FairScheduler:
+    """
+    Decides which pending extraction or API call runs next
+
+    Work waits in one of three priority lanes. Inside a lane, guilds are
+    served round-robin, so a guild queueing hundreds of playlist pages only
+    gets one turn per rotation. Each guild may run at most guild_limit
+    interactive/background calls at once, and the last reserved_stream
+    slots are kept for the stream lane so the next song can always start.
+    """
+    def __init__(self, max_concurrent=6, guild_limit=2, reserved_stream=1):
+        """
+        Initialize the scheduler
+
+        Args:
+            max_concurrent (int): Calls allowed to run at once across all lanes
+            guild_limit (int): Interactive/background calls one guild may run at once
+            reserved_stream (int): Slots only the stream lane may use
+        """
+        self.max_concurrent = max_concurrent
+        self.guild_limit = guild_limit
+        self.reserved_stream = min(reserved_stream, max_concurrent - 1)
+
+        self._waiting = {lane: OrderedDict() for lane in LANES}  # Lane -> guild -> deque of (future, enqueued at)
+        self._running = 0
+        self._running_by_lane = {lane: 0 for lane in LANES}
+        self._running_by_guild = {}  # Guild -> interactive/background calls running
+
+        self.stats = {lane: {'granted': 0, 'wait_total': 0.0, 'wait_max': 0.0} for lane in LANES}
+
+    @staticmethod
+    def bind_guild(guild_id):
+        """
+        Attribute the current task's work (and tasks it creates) to a guild
+
+        Args:
+            guild_id (str): Discord guild ID, or None for unattributed work
+        """
+        current_guild.set(str(guild_id) if guild_id is not None else None)
+
+    @asynccontextmanager
+    async def slot(self, lane, guild_id=None):
+        """
+        Wait for a turn in a lane and hold it for the duration of a with block
+
+        Args:
+            lane (str): 'stream', 'interactive' or 'background'
+            guild_id (str, optional): Guild the work is for, the bound guild if omitted
+        """
+        if lane not in self._waiting:
+            raise ValueError(f"Unknown lane: {lane}")
+        if guild_id is None:
+            guild_id = current_guild.get()
+
+        await self._acquire(lane, guild_id)
+        try:
+            yield
+        finally:
+            self._release(lane, guild_id)
+
+    def get_stats(self):
+        """
+        Get queue depths, running calls and wait times
+
+        Returns:
+            dict: Per-lane waiting/running/granted counts and wait times (ms),
+                plus totals and the guilds with the most waiting calls
+        """
+        lanes = {}
+        waiting_by_guild = {}
+        for lane in LANES:
+            waiting = 0
+            for guild_id, waiters in self._waiting[lane].items():
+                waiting += len(waiters)
+                waiting_by_guild[guild_id] = waiting_by_guild.get(guild_id, 0) + len(waiters)
+
+            stats = self.stats[lane]
+            lanes[lane] = {
+                'waiting': waiting,
+                'running': self._running_by_lane[lane],
+                'granted': stats['granted'],
+                'avg_wait_ms': round(stats['wait_total'] / stats['granted'] * 1000, 1) if stats['granted'] else 0.0,
+                'max_wait_ms': round(stats['wait_max'] * 1000, 1)
+            }
+
+        busiest = sorted(waiting_by_guild.items(), key=lambda item: item[1], reverse=True)[:5]
+        return {
+            'lanes': lanes,
+            'running': self._running,
+            'capacity': self.max_concurrent,
+            'waiting_guilds': len(waiting_by_guild),
+            'busiest_guilds': dict(busiest)
+        }
+
+    async def _acquire(self, lane, guild_id):
+        """Wait until the dispatcher grants this call a slot"""
+        if self._can_start(lane, guild_id) and not self._has_waiters(lane):
+            self._start(lane, guild_id, 0.0)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        waiter = (future, time.monotonic())
+        self._waiting[lane].setdefault(guild_id, deque()).append(waiter)
+        # Waiters ahead may only be held back by their guild's cap
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just before being cancelled, hand the slot back
+                self._release(lane, guild_id)
+            else:
+                self._discard(lane, guild_id, waiter)
+            raise
+
+    def _release(self, lane, guild_id):
+        """Free a slot and let the next waiters in"""
+        self._running -= 1
+        self._running_by_lane[lane] -= 1
+        if lane != 'stream':
+            remaining = self._running_by_guild.get(guild_id, 0) - 1
+            if remaining > 0:
+                self._running_by_guild[guild_id] = remaining
+            else:
+                self._running_by_guild.pop(guild_id, None)
+        self._dispatch()
+
+    def _can_start(self, lane, guild_id):
+        """Check capacity, the stream reserve and the guild's cap"""
+        if lane == 'stream':
+            return self._running < self.max_concurrent
+        if self._running >= self.max_concurrent - self.reserved_stream:
+            return False
+        return self._running_by_guild.get(guild_id, 0) < self.guild_limit
+
+    def _has_waiters(self, lane):
+        """Check whether a lane or a higher-priority lane has calls waiting"""
+        for other in LANES:
+            if self._waiting[other]:
+                return True
+            if other == lane:
+                return False
+        return False
+
+    def _start(self, lane, guild_id, waited):
+        """Account for a call that is about to run"""
+        self._running += 1
+        self._running_by_lane[lane] += 1
+        if lane != 'stream':
+            self._running_by_guild[guild_id] = self._running_by_guild.get(guild_id, 0) + 1
+
+        stats = self.stats[lane]
+        stats['granted'] += 1
+        stats['wait_total'] += waited
+        stats['wait_max'] = max(stats['wait_max'], waited)
+
+    def _dispatch(self):
+        """Grant free slots by lane priority, round-robin over guilds within a lane"""
+        for lane in LANES:
+            queue = self._waiting[lane]
+            blocked = 0  # Guilds in a row that are at their cap
+            while queue and blocked < len(queue):
+                if self._running >= self.max_concurrent:
+                    return
+
+                guild_id, waiters = next(iter(queue.items()))
+                queue.move_to_end(guild_id)
+                if not self._can_start(lane, guild_id):
+                    blocked += 1
+                    continue
+
+                blocked = 0
+                future, enqueued_at = waiters.popleft()
+                if not waiters:
+                    del queue[guild_id]
+                if future.cancelled():
+                    continue  # Its task was cancelled and has not cleaned up yet
+                self._start(lane, guild_id, time.monotonic() - enqueued_at)
+                future.set_result(None)
+
+            # Lower lanes only run once this lane has nothing it can start
+            if queue and lane == 'stream':
+                return
+
+    def _discard(self, lane, guild_id, waiter):
+        """Remove a cancelled waiter"""
+        waiters = self._waiting[lane].get(guild_id)
+        if waiters is None:
+            return
+        try:
+            waiters.remove(waiter)
+        except ValueError:
+            return
+        if not waiters:
+            del self._waiting[lane][guild_id]
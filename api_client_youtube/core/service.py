@@ -1,14 +1,23 @@
 import os
+import time
 from datetime import timedelta
 import types
 
 from api_client_youtube.core.cache import CacheManager
-from api_client_youtube.search.videos import search_videos
+from api_client_youtube.core.persistent_cache import PersistentCache
+from api_client_youtube.core.executor import ExtractionExecutor
+from api_client_youtube.core.stream_cache import StreamCache
+from api_client_youtube.core.http import create_session
+from api_client_youtube.core.quota import QuotaTracker
+from api_client_youtube.core.scheduler import FairScheduler
+from api_client_youtube.core.ydl_pool import get_pool, warm_pool
+from api_client_youtube.search.videos import search_videos_enriched
 from api_client_youtube.search.playlists import search_playlists
 from api_client_youtube.search.artists import search_artists
-from api_client_youtube.details.video_details import get_video_details
+from api_client_youtube.details.video_details import get_video_details, get_video_details_batch
 from api_client_youtube.details.playlist_details import get_playlist_details
 from api_client_youtube.details.playlist_videos import get_playlist_videos
+from api_client_youtube.details.playlist_items import iter_playlist_items
 from api_client_youtube.extractors.video_id import extract_video_id
 from api_client_youtube.extractors.playlist_id import extract_playlist_id
 from api_client_youtube.extractors.playlist_url import normalize_playlist_url
@@ -25,24 +34,167 @@ class YouTubeService:
         if not self.api_key:
             print("WARNING: No YouTube API key provided, YouTube API search will not work")
         
-        # Cache settings
-        self.cache_manager = CacheManager(timedelta(hours=1))
+        # Cache settings - search results go stale faster than video metadata
+        max_cache_mb = os.environ.get('YOUTUBE_CACHE_MAX_MB')
+        self.cache_manager = CacheManager(
+            timedelta(hours=1),
+            max_entries=int(os.environ.get('YOUTUBE_CACHE_MAX_ENTRIES', 5000)),
+            max_bytes=int(float(max_cache_mb) * 1024 * 1024) if max_cache_mb else None,
+            namespace_timeouts={
+                'videos_': timedelta(minutes=15),
+                'playlists_': timedelta(minutes=15),
+                'playlist_videos_': timedelta(minutes=30),
+                'playlist_details_': timedelta(hours=1),
+                'video_details_': timedelta(hours=6)
+            },
+            persistent=self._create_persistent_cache()
+        )
+        
+        # Dedicated pool for blocking yt-dlp work (thread or process based)
+        self.extraction_executor = ExtractionExecutor(
+            kind=os.environ.get('YTDLP_EXECUTOR', 'thread'),
+            max_workers=int(os.environ.get('YTDLP_MAX_WORKERS', 4)),
+            timeout=float(os.environ.get('YTDLP_TIMEOUT', 30)),
+            max_backlog=int(os.environ.get('YTDLP_MAX_BACKLOG', 64))
+        )
+        
+        # Resolved stream URLs, reused until shortly before their signature expires
+        self.stream_cache = StreamCache(
+            expiry_margin=float(os.environ.get('STREAM_CACHE_EXPIRY_MARGIN', 300)),
+            max_entries=int(os.environ.get('STREAM_CACHE_MAX_ENTRIES', 1000))
+        )
+        
+        # Daily Data API budget (resets at midnight Pacific Time) and request rate limit
+        self.quota = QuotaTracker(
+            daily_budget=int(os.environ.get('YOUTUBE_DAILY_QUOTA', 10000)),
+            reserve=int(os.environ.get('YOUTUBE_QUOTA_RESERVE', 1000)),
+            rate=float(os.environ.get('YOUTUBE_API_RATE', 5)),
+            burst=int(os.environ.get('YOUTUBE_API_BURST', 10)),
+            state_path=os.environ.get('YOUTUBE_QUOTA_STATE')
+        )
+        
+        # Admission of extraction and API work: stream resolution before
+        # interactive requests before playlist paging, guilds served in turn
+        self.scheduler = FairScheduler(
+            max_concurrent=int(os.environ.get('SCHEDULER_MAX_CONCURRENT', 6)),
+            guild_limit=int(os.environ.get('SCHEDULER_GUILD_LIMIT', 2)),
+            reserved_stream=int(os.environ.get('SCHEDULER_STREAM_RESERVE', 1))
+        )
+        
+        # Filled in by warm_up()
+        self.warmup_stats = None
+        
+        # Shared HTTP session for all YouTube Data API calls (created lazily
+        # because it must be bound to the running event loop)
+        self._session = None
+        self.http_pool_limit = int(os.environ.get('YOUTUBE_HTTP_POOL_LIMIT', 20))
+        self.http_pool_limit_per_host = int(os.environ.get('YOUTUBE_HTTP_POOL_LIMIT_PER_HOST', 10))
+        self.http_keepalive_timeout = float(os.environ.get('YOUTUBE_HTTP_KEEPALIVE', 60))
         
         # CRITICAL FIX: Apply audio extractors during initialization
         self._apply_audio_extractors()
     
+    def _create_persistent_cache(self):
+        """
+        Create the on-disk cache tier if YOUTUBE_CACHE_DB is configured
+        
+        Returns:
+            PersistentCache: Persistent tier, or None when disabled or unavailable
+        """
+        cache_db = os.environ.get('YOUTUBE_CACHE_DB')
+        if not cache_db:
+            return None
+        
+        try:
+            return PersistentCache(cache_db)
+        except Exception as e:
+            print(f"WARNING: Could not open persistent cache at {cache_db}: {e}")
+            return None
+    
+    async def get_session(self):
+        """
+        Get the shared HTTP session, creating it on first use
+        
+        Returns:
+            aiohttp.ClientSession: Pooled keep-alive session
+        """
+        if self._session is None or self._session.closed:
+            self._session = create_session(
+                limit=self.http_pool_limit,
+                limit_per_host=self.http_pool_limit_per_host,
+                keepalive_timeout=self.http_keepalive_timeout
+            )
+        return self._session
+    
+    async def close(self):
+        """Close the shared HTTP session and shut down the extraction pool"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        await self.quota.flush()
+        await self.cache_manager.close()
+        self.extraction_executor.shutdown()
+        get_pool().close()
+    
+    async def warm_up(self):
+        """
+        Prepare yt-dlp ahead of the first request
+        
+        Creates the pooled instances, loads their extractors and resolves one
+        stream so the player JS is fetched and its signature functions are
+        cached (in YTDLP_CACHE_DIR when set). The outcome and timings are
+        kept in warmup_stats. With a process executor only the worker that
+        runs this call is warmed.
+        
+        Returns:
+            dict: Warm-up stats
+        """
+        started = time.monotonic()
+        try:
+            async with self.scheduler.slot('background'):
+                report = await self.extraction_executor.run(warm_pool, timeout=120)
+        except Exception as e:
+            print(f"Error warming yt-dlp: {e}")
+            report = {'error': str(e)}
+        
+        self.warmup_stats = {**report, 'seconds': round(time.monotonic() - started, 3), 'finished_at': time.time()}
+        print(f"yt-dlp warm-up finished in {self.warmup_stats['seconds']}s: {report}")
+        return self.warmup_stats
+    
+    def get_warmup_stats(self):
+        """
+        Get the outcome of the startup warm-up
+        
+        Returns:
+            dict: Warmed profiles, timings (seconds) and whether the warm-up extraction
+                succeeded, or None if warm-up has not finished
+        """
+        return self.warmup_stats
+    
+    async def __aenter__(self):
+        await self.get_session()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
     def _apply_audio_extractors(self):
         """
         Apply audio extraction methods directly to the instance
         This is called automatically during initialization
         """
         try:
-            from api_client_youtube.extractors.audio_url import extract_audio_url, get_ffmpeg_options, process_youtube_url
+            from api_client_youtube.extractors.audio_url import extract_audio_url, resolve_stream, get_ffmpeg_options, process_youtube_url
+            from api_client_youtube.extractors.playlist_entries import iter_playlist_entries
+            from api_client_youtube.extractors.ytsearch import search_videos_ytdlp
             
             # Bind the functions to this instance
             self.extract_audio_url = types.MethodType(extract_audio_url, self)
+            self.resolve_stream = types.MethodType(resolve_stream, self)
             self.get_ffmpeg_options = types.MethodType(get_ffmpeg_options, self)
             self.process_youtube_url = types.MethodType(process_youtube_url, self)
+            self.iter_playlist_entries = types.MethodType(iter_playlist_entries, self)
+            self.search_videos_ytdlp = types.MethodType(search_videos_ytdlp, self)
             print("Audio extractors successfully applied to YouTubeService")
         except Exception as e:
             print(f"WARNING: Error applying audio extractors: {e}")
@@ -56,24 +208,52 @@ class YouTubeService:
             max_results (int): Maximum number of results to return
             
         Returns:
-            list: List of video objects with id, title, thumbnail, channel
+            list: VideoSearchResult dicts with id, title, thumbnail, channel, duration, duration_str
         """
-        results = await search_videos(self.api_key, query, max_results, self.cache_manager)
+        # Identical searches running at the same time share one request
+        return await self.cache_manager.single_flight(
+            f"videos_enriched_{query}_{max_results}",
+            lambda: self._in_lane('interactive', lambda: self._search_videos(query, max_results))
+        )
+    
+    async def _search_videos(self, query, max_results):
+        """Search for videos through the API, or the fallback when it is unavailable"""
+        # Without a key or enough quota for another search (100 units), fall
+        # back to cached results and then to yt-dlp
+        if not self.api_key or not self.quota.can_spend('search'):
+            return await self._search_videos_fallback(query, max_results)
         
-        # FIX: Get video details to add duration for each search result
-        if results:
-            for result in results:
-                try:
-                    # Get full details including duration
-                    details = await self.get_video_details(result['id'])
-                    if details and 'duration' in details:
-                        result['duration'] = details['duration']
-                        result['duration_str'] = format_duration(details['duration'])
-                except Exception as e:
-                    print(f"Warning: Could not get duration for video {result['id']}: {e}")
-                    result['duration'] = 0
-                    result['duration_str'] = "00:00"
+        # One search request plus one batched videos request, merged and cached together
+        results = await search_videos_enriched(self.api_key, query, max_results, self.cache_manager, session=await self.get_session(), quota=self.quota)
+        
+        # The API may have reported the quota as exhausted during this call
+        if not results and not self.quota.can_spend('search'):
+            return await self._search_videos_fallback(query, max_results)
+        
+        return results
+    
+    async def _search_videos_fallback(self, query, max_results):
+        """
+        Search without spending API quota: cached results first, then yt-dlp
+        
+        Args:
+            query (str): Search query
+            max_results (int): Maximum number of results to return
+            
+        Returns:
+            list: List of video objects with id, title, thumbnail, channel, duration
+        """
+        cache_key = f"videos_enriched_{query}_{max_results}"
+        cached_result = await self.cache_manager.get_cached(cache_key)
+        if cached_result:  # An empty list may be the negative entry of the failed API call
+            return cached_result
         
+        results = await self.search_videos_ytdlp(query, max_results)
+        for video in results:
+            video['duration_str'] = format_duration(video['duration'])
+        
+        if results:
+            self.cache_manager.add_to_cache(cache_key, results)
         return results
     
     async def search_playlists(self, query, max_results=5):
@@ -87,11 +267,19 @@ class YouTubeService:
         Returns:
             list: List of playlist objects with id, title, thumbnail, channel
         """
-        return await search_playlists(self.api_key, query, max_results, self.cache_manager)
+        session = await self.get_session()
+        return await self._in_lane(
+            'interactive',
+            lambda: search_playlists(self.api_key, query, max_results, self.cache_manager, session=session, quota=self.quota)
+        )
     
     async def search_artists(self, query, max_results=10):
         """Search for YouTube channels (artists) based on a query"""
-        return await search_artists(self.api_key, query, max_results)
+        session = await self.get_session()
+        return await self._in_lane(
+            'interactive',
+            lambda: search_artists(self.api_key, query, max_results, session=session, quota=self.quota)
+        )
     
     async def get_playlist_details(self, playlist_id):
         """
@@ -103,7 +291,14 @@ class YouTubeService:
         Returns:
             dict: Playlist details including title, channel, thumbnail, video count
         """
-        return await get_playlist_details(self.api_key, playlist_id, self.cache_manager)
+        session = await self.get_session()
+        return await self.cache_manager.single_flight(
+            f"playlist_details_{playlist_id}",
+            lambda: self._in_lane(
+                'interactive',
+                lambda: get_playlist_details(self.api_key, playlist_id, self.cache_manager, session=session, quota=self.quota)
+            )
+        )
     
     async def get_playlist_videos(self, playlist_id, page_token=None, max_results=25):
         """
@@ -117,25 +312,47 @@ class YouTubeService:
         Returns:
             tuple: (videos, next_page_token, total_results)
         """
-        results = await get_playlist_videos(self.api_key, playlist_id, page_token, max_results, self.cache_manager)
+        session = await self.get_session()
+        results = await self._in_lane(
+            'interactive',
+            lambda: get_playlist_videos(self.api_key, playlist_id, page_token, max_results, self.cache_manager, session=session, quota=self.quota)
+        )
         
-        # FIX: Add duration to playlist videos
+        # FIX: Add duration to playlist videos (in its own slot, slots are never nested)
         videos, next_page_token, total_results = results
         if videos:
-            for video in videos:
-                try:
-                    # Get full details including duration
-                    details = await self.get_video_details(video['id'])
-                    if details and 'duration' in details:
-                        video['duration'] = details['duration']
-                        video['duration_str'] = format_duration(details['duration'])
-                except Exception as e:
-                    print(f"Warning: Could not get duration for video {video['id']}: {e}")
-                    video['duration'] = 0
-                    video['duration_str'] = "00:00"
+            await self._add_durations(videos)
         
         return videos, next_page_token, total_results
     
+    async def iter_playlist(self, playlist_id, start=0, stop=None, lane='background'):
+        """
+        Stream the videos of a playlist without materialising the whole list
+        
+        Uses playlistItems pages when an API key is configured and yt-dlp
+        playlist slices otherwise. The next page is only fetched once the
+        consumer has taken the current one.
+        
+        Args:
+            playlist_id (str): YouTube playlist ID
+            start (int): Index of the first video to yield (0-based)
+            stop (int, optional): Index after the last video to yield
+            lane (str): Scheduler lane each page is fetched in ('interactive' for previews)
+            
+        Yields:
+            dict: Video with id, title, channel and position
+        """
+        if self.api_key:
+            source = iter_playlist_items(
+                self.api_key, playlist_id, start, stop,
+                session=await self.get_session(), quota=self.quota, scheduler=self.scheduler, lane=lane
+            )
+        else:
+            source = self.iter_playlist_entries(playlist_id, start, stop, lane=lane)
+        
+        async for video in source:
+            yield video
+    
     async def get_video_details(self, video_id):
         """
         Get details about a YouTube video
@@ -146,7 +363,15 @@ class YouTubeService:
         Returns:
             dict: Video details including title, channel, thumbnail, duration
         """
-        details = await get_video_details(self.api_key, video_id, self.cache_manager)
+        # Concurrent lookups of the same video (e.g. one link pasted in several guilds) share one request
+        session = await self.get_session()
+        details = await self.cache_manager.single_flight(
+            f"video_details_{video_id}",
+            lambda: self._in_lane(
+                'interactive',
+                lambda: get_video_details(self.api_key, video_id, self.cache_manager, session=session, quota=self.quota)
+            )
+        )
         
         # FIX: Ensure duration is properly formatted
         if details and 'duration' in details:
@@ -154,6 +379,64 @@ class YouTubeService:
         
         return details
     
+    async def _in_lane(self, lane, fetch):
+        """
+        Run a fetch once the scheduler grants it a slot in a lane
+        
+        Args:
+            lane (str): 'stream', 'interactive' or 'background'
+            fetch (callable): No-argument coroutine function
+            
+        Returns:
+            object: Result of the fetch
+        """
+        async with self.scheduler.slot(lane):
+            return await fetch()
+    
+    async def get_video_details_batch(self, video_ids):
+        """
+        Get details about several YouTube videos in as few requests as possible
+        
+        Args:
+            video_ids (list): YouTube video IDs
+            
+        Returns:
+            dict: Video ID -> video details including title, channel, thumbnail, duration
+        """
+        session = await self.get_session()
+        details_by_id = await self._in_lane(
+            'background',
+            lambda: get_video_details_batch(self.api_key, video_ids, self.cache_manager, session=session, quota=self.quota)
+        )
+        
+        for details in details_by_id.values():
+            if 'duration' in details:
+                details['duration_str'] = format_duration(details['duration'])
+        
+        return details_by_id
+    
+    async def _add_durations(self, videos):
+        """
+        Add duration and duration_str to a list of video dicts in place
+        
+        Args:
+            videos (list): Video objects with an 'id' key
+        """
+        try:
+            details_by_id = await self.get_video_details_batch([video['id'] for video in videos])
+        except Exception as e:
+            print(f"Warning: Could not get durations for videos: {e}")
+            details_by_id = {}
+        
+        for video in videos:
+            details = details_by_id.get(video['id'])
+            if details and 'duration' in details:
+                video['duration'] = details['duration']
+                video['duration_str'] = format_duration(details['duration'])
+            else:
+                video['duration'] = 0
+                video['duration_str'] = "00:00"
+    
     def extract_video_id(self, url):
         """
         Extract video ID from various YouTube URL formats
@@ -218,6 +501,66 @@ class YouTubeService:
     def clear_cache(self):
         """Clear all cached data"""
         self.cache_manager.clear_cache()
+    
+    def invalidate_stream(self, video_id):
+        """
+        Forget a resolved stream so the next play resolves a fresh URL
+        
+        Args:
+            video_id (str): YouTube video ID
+        """
+        self.stream_cache.invalidate(video_id)
+    
+    def has_fresh_stream(self, video_id):
+        """
+        Check whether a usable resolved stream is cached for a video
+        
+        Args:
+            video_id (str): YouTube video ID
+            
+        Returns:
+            bool: True if resolve_stream would return without extracting
+        """
+        return self.stream_cache.get(video_id) is not None
+    
+    def get_cache_stats(self):
+        """
+        Get cache hit/miss/eviction counters and current usage
+        
+        Returns:
+            dict: Cache statistics
+        """
+        return {
+            **self.cache_manager.get_stats(),
+            'streams': self.stream_cache.get_stats()
+        }
+    
+    def get_ydl_pool_stats(self):
+        """
+        Get reuse counters of the yt-dlp instance pool (this process only)
+        
+        Returns:
+            dict: Created, reused and recycled counts plus idle instances per profile
+        """
+        return get_pool().get_stats()
+    
+    def get_quota_stats(self):
+        """
+        Get today's YouTube Data API quota usage
+        
+        Returns:
+            dict: Units used and remaining, per-endpoint usage and request counters
+        """
+        return self.quota.get_stats()
+    
+    def get_scheduler_stats(self):
+        """
+        Get queue depths and wait times of the extraction/API scheduler
+        
+        Returns:
+            dict: Waiting and running calls and wait times (ms) per lane, plus the busiest guilds
+        """
+        return self.scheduler.get_stats()
 
 
 # Keep these functions for compatibility with existing code
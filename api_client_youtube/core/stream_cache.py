@@ -0,0 +1,123 @@
+"""
+Cache of resolved audio streams keyed by YouTube video ID
+"""
+import asyncio
+import time
+from collections import OrderedDict
+
+class StreamCache:
+    """
+    Caches resolved stream info (see resolve_stream) until shortly before the
+    signed googlevideo URL expires, and coalesces concurrent resolutions of the
+    same video into a single yt-dlp extraction
+    """
+    def __init__(self, expiry_margin=300, max_entries=1000):
+        """
+        Initialize the stream cache
+
+        Args:
+            expiry_margin (float): Seconds of validity that must remain after the
+                track would finish playing for an entry to be reused
+            max_entries (int): Maximum number of resolved streams kept
+        """
+        self.expiry_margin = expiry_margin
+        self.max_entries = max_entries
+
+        self._streams = OrderedDict()  # Video ID -> stream info, least recently used first
+        self._inflight = {}  # Video ID -> task resolving the stream
+
+        self.stats = {'hits': 0, 'misses': 0, 'coalesced': 0, 'invalidations': 0}
+
+    def get(self, video_id):
+        """
+        Get a cached stream if it stays valid long enough to play the whole track
+
+        Args:
+            video_id (str): YouTube video ID
+
+        Returns:
+            dict: Stream info or None
+        """
+        stream = self._streams.get(video_id)
+        if stream is None:
+            return None
+
+        remaining = stream['expires_at'] - time.time()
+        if remaining <= self.expiry_margin + (stream.get('duration') or 0):
+            self._streams.pop(video_id, None)
+            return None
+
+        self._streams.move_to_end(video_id)
+        return stream
+
+    def put(self, stream):
+        """
+        Store a resolved stream
+
+        Args:
+            stream (dict): Stream info with at least id, url and expires_at
+        """
+        self._streams[stream['id']] = stream
+        self._streams.move_to_end(stream['id'])
+        while len(self._streams) > self.max_entries:
+            self._streams.popitem(last=False)
+
+    def invalidate(self, video_id):
+        """
+        Drop a cached stream, e.g. after FFmpeg was refused (HTTP 403) by googlevideo
+
+        Args:
+            video_id (str): YouTube video ID
+        """
+        if self._streams.pop(video_id, None) is not None:
+            self.stats['invalidations'] += 1
+
+    async def get_or_resolve(self, video_id, resolver):
+        """
+        Get a cached stream or resolve it, sharing one resolution between concurrent callers
+
+        Args:
+            video_id (str): YouTube video ID
+            resolver (callable): No-argument coroutine function returning stream info or None
+
+        Returns:
+            dict: Stream info or None
+        """
+        stream = self.get(video_id)
+        if stream is not None:
+            self.stats['hits'] += 1
+            return stream
+
+        task = self._inflight.get(video_id)
+        if task is not None:
+            self.stats['coalesced'] += 1
+        else:
+            self.stats['misses'] += 1
+            task = asyncio.ensure_future(self._resolve(video_id, resolver))
+            self._inflight[video_id] = task
+
+        # Shield so one caller giving up does not cancel the others
+        return await asyncio.shield(task)
+
+    async def _resolve(self, video_id, resolver):
+        """Run the resolver and store its result"""
+        try:
+            stream = await resolver()
+            if stream:
+                self.put(stream)
+            return stream
+        finally:
+            self._inflight.pop(video_id, None)
+
+    def get_stats(self):
+        """
+        Get cache counters and current usage
+
+        Returns:
+            dict: Hit, miss, coalesced and invalidation counts plus entry count
+        """
+        return {
+            **self.stats,
+            'entries': len(self._streams),
+            'inflight': len(self._inflight)
+        }
@@ -0,0 +1,267 @@
+"""
+Pool of reusable yt-dlp instances, one set per option profile
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import yt_dlp
+
+# yt-dlp options for each kind of extraction
+PROFILES = {
+    # Resolving a playable audio stream for one video
+    'stream': {
+        # Prefer YouTube's Opus/WebM audio (itag 251) so it can be passed straight to Discord
+        'format': 'bestaudio[acodec=opus]/bestaudio/best',
+        'noplaylist': True,
+        'quiet': True,
+        'no_warnings': True,
+        # Add these options to ensure full song duration
+        'fragment_retries': 10,
+        'retries': 10,
+        'skip_unavailable_fragments': False,
+        # Add postprocessing to get consistent audio quality
+        'postprocessor_args': [
+            '-reconnect', '1',
+            '-reconnect_streamed', '1',
+            '-reconnect_delay_max', '5'
+        ]
+    },
+    # Basic metadata for a URL or search query (process_youtube_url)
+    'metadata': {
+        'quiet': True,
+        'no_warnings': True,
+        'extract_flat': True,  # Extract basic metadata without downloading
+        'ignoreerrors': True,  # Continue processing if an individual video fails
+        'no_color': True,
+        'default_search': 'ytsearch',  # Ensure YouTube search
+        'max_downloads': 1  # Limit to first result for non-URL input
+    },
+    # Lazy flat walks over a playlist (extracted with process=False)
+    'playlist': {
+        'quiet': True,
+        'no_warnings': True,
+        'extract_flat': 'in_playlist',
+        'lazy_playlist': True,
+        'ignoreerrors': True,
+        'no_color': True
+    },
+    # ytsearch lookups used when the Data API is unavailable
+    'search': {
+        'quiet': True,
+        'no_warnings': True,
+        'extract_flat': True,
+        'ignoreerrors': True,
+        'no_color': True
+    }
+}
+
+# Video extracted at startup so the player JS and signature functions are cached
+DEFAULT_WARMUP_VIDEO = 'jNQXAC9IVRw'
+
+# Extractors each profile relies on, instantiated when the pool is warmed
+WARM_EXTRACTORS = {
+    'stream': ('Youtube',),
+    'metadata': ('Youtube', 'YoutubeTab', 'YoutubeSearch'),
+    'playlist': ('YoutubeTab',),
+    'search': ('YoutubeSearch',)
+}
+
+
+class YDLPool:
+    """
+    Reusable YoutubeDL instances, checked out by one worker thread at a time
+
+    Building a YoutubeDL parses its options and sets up the extractor
+    registry, and its extractors cache player data between calls, so
+    instances are kept and reused instead of being created per call. Each
+    instance is retired after max_uses extractions so per-instance state
+    cannot grow without bound.
+
+    yt-dlp keeps the deciphered signature functions of YouTube's player JS
+    in its cache directory; pointing cachedir at a mounted volume keeps
+    them across container rebuilds.
+    """
+    def __init__(self, profiles=PROFILES, max_uses=200, max_idle=8, cachedir=None):
+        """
+        Initialize the pool
+
+        Args:
+            profiles (dict): Profile name -> yt-dlp options
+            max_uses (int): Extractions after which an instance is recycled
+            max_idle (int): Idle instances kept per profile
+            cachedir (str, optional): yt-dlp cache directory, yt-dlp's default if omitted
+        """
+        if cachedir:
+            os.makedirs(cachedir, exist_ok=True)
+            profiles = {name: {**options, 'cachedir': cachedir} for name, options in profiles.items()}
+
+        self.profiles = profiles
+        self.cachedir = cachedir
+        self.max_uses = max_uses
+        self.max_idle = max_idle
+
+        self._idle = {name: [] for name in profiles}  # Profile -> [(instance, uses)]
+        self._lock = threading.Lock()
+
+        self.stats = {'created': 0, 'reused': 0, 'recycled': 0}
+
+    @contextmanager
+    def checkout(self, profile, **overrides):
+        """
+        Borrow an instance of a profile for the duration of a with block
+
+        Args:
+            profile (str): Profile name (stream, metadata, playlist, search)
+            **overrides: Options set on the instance for this checkout only
+
+        Yields:
+            yt_dlp.YoutubeDL: Instance owned by the caller until the block exits
+        """
+        ydl, uses = self._acquire(profile)
+
+        # Per-call options are applied to the live params and restored afterwards
+        previous = {key: ydl.params.get(key, _MISSING) for key in overrides}
+        ydl.params.update(overrides)
+        try:
+            yield ydl
+        finally:
+            for key, value in previous.items():
+                if value is _MISSING:
+                    ydl.params.pop(key, None)
+                else:
+                    ydl.params[key] = value
+            self._release(profile, ydl, uses + 1)
+
+    def warm(self, profiles=None, video_id=None):
+        """
+        Create an instance per profile and load the extractors it uses (blocking)
+
+        Args:
+            profiles (iterable, optional): Profiles to warm, all if omitted
+            video_id (str, optional): Video to resolve a stream for, which fetches
+                the player JS and fills the signature cache
+
+        Returns:
+            dict: Warmed profiles, seconds spent on instances and on the
+                extraction, and whether the extraction succeeded
+        """
+        started = time.monotonic()
+        warmed = []
+        for profile in profiles or self.profiles:
+            with self.checkout(profile) as ydl:
+                for extractor in WARM_EXTRACTORS.get(profile, ()):
+                    try:
+                        ydl.get_info_extractor(extractor)
+                    except Exception as e:
+                        print(f"Could not warm {extractor} extractor: {e}")
+            warmed.append(profile)
+        instances_done = time.monotonic()
+
+        extracted = None
+        if video_id:
+            try:
+                with self.checkout('stream') as ydl:
+                    info = ydl.extract_info(f"https://www.youtube.com/watch?v={video_id}", download=False)
+                extracted = bool(info and info.get('url'))
+            except Exception as e:
+                print(f"Warm-up extraction of {video_id} failed: {e}")
+                extracted = False
+
+        return {
+            'profiles': warmed,
+            'instances_seconds': round(instances_done - started, 3),
+            'extraction_seconds': round(time.monotonic() - instances_done, 3) if video_id else None,
+            'extracted': extracted,
+            'cachedir': self.cachedir
+        }
+
+    def get_stats(self):
+        """
+        Get pool counters and idle instances per profile
+
+        Returns:
+            dict: Created, reused and recycled counts plus idle sizes
+        """
+        with self._lock:
+            idle = {name: len(instances) for name, instances in self._idle.items()}
+        return {**self.stats, 'idle': idle}
+
+    def close(self):
+        """Close every idle instance"""
+        with self._lock:
+            instances = [ydl for idle in self._idle.values() for ydl, _ in idle]
+            for idle in self._idle.values():
+                idle.clear()
+        for ydl in instances:
+            _close(ydl)
+
+    def _acquire(self, profile):
+        """Take an idle instance of a profile or create a new one"""
+        with self._lock:
+            idle = self._idle[profile]
+            if idle:
+                self.stats['reused'] += 1
+                return idle.pop()
+
+        ydl = yt_dlp.YoutubeDL(dict(self.profiles[profile]))
+        with self._lock:
+            self.stats['created'] += 1
+        return ydl, 0
+
+    def _release(self, profile, ydl, uses):
+        """Return an instance to the pool, or close it once it is used up"""
+        with self._lock:
+            idle = self._idle[profile]
+            if uses < self.max_uses and len(idle) < self.max_idle:
+                idle.append((ydl, uses))
+                return
+            self.stats['recycled'] += 1
+        _close(ydl)
+
+
+_MISSING = object()
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """
+    Get this process's pool (each worker process of a process executor has its own)
+
+    Returns:
+        YDLPool: Shared pool
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = YDLPool(
+                    max_uses=int(os.environ.get('YTDLP_POOL_MAX_USES', 200)),
+                    max_idle=int(os.environ.get('YTDLP_MAX_WORKERS', 4)),
+                    cachedir=os.environ.get('YTDLP_CACHE_DIR') or None
+                )
+    return _pool
+
+
+def warm_pool():
+    """
+    Warm every profile of this process's pool and run the warm-up extraction
+    (blocking, run on the extraction pool)
+
+    YTDLP_WARMUP_VIDEO selects the video, an empty value skips the extraction.
+
+    Returns:
+        dict: Warm-up report (see YDLPool.warm)
+    """
+    return get_pool().warm(video_id=os.environ.get('YTDLP_WARMUP_VIDEO', DEFAULT_WARMUP_VIDEO))
+
+
+def _close(ydl):
+    """Close a YoutubeDL instance, ignoring errors"""
+    try:
+        ydl.close()
+    except Exception:
+        pass
@@ -1,5 +1,6 @@
-from api_client_youtube.details.video_details import get_video_details
+from api_client_youtube.details.video_details import get_video_details, get_video_details_batch
 from api_client_youtube.details.playlist_details import get_playlist_details
 from api_client_youtube.details.playlist_videos import get_playlist_videos
+from api_client_youtube.details.playlist_items import iter_playlist_items
 
-__all__ = ['get_video_details', 'get_playlist_details', 'get_playlist_videos']
\ No newline at end of file
+__all__ = ['get_video_details', 'get_video_details_batch', 'get_playlist_details', 'get_playlist_videos', 'iter_playlist_items']
\ No newline at end of file
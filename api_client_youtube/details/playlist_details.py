@@ -1,6 +1,6 @@
-import aiohttp
+from api_client_youtube.core.http import session_scope
 
-async def get_playlist_details(api_key, playlist_id, cache_manager=None):
+async def get_playlist_details(api_key, playlist_id, cache_manager=None, session=None, quota=None):
     """
     Get details about a YouTube playlist
     
@@ -8,6 +8,8 @@ async def get_playlist_details(api_key, playlist_id, cache_manager=None):
         api_key (str): YouTube API key
         playlist_id (str): YouTube playlist ID
         cache_manager (CacheManager, optional): Cache manager instance
+        session (aiohttp.ClientSession, optional): Shared HTTP session
+        quota (QuotaTracker, optional): Quota tracker charged for each request
         
     Returns:
         dict: Playlist details including title, channel, thumbnail, video count
@@ -26,11 +28,21 @@ async def get_playlist_details(api_key, playlist_id, cache_manager=None):
     
     # Try to get from cache if cache manager provided
     if cache_manager:
-        cached_result = cache_manager.get_from_cache(cache_key)
+        cached_result = await cache_manager.get_cached(cache_key)
         if cached_result is not None:
             return cached_result
+    
+    # Out of quota - return the defaults without caching them
+    if quota and not await quota.acquire('playlists'):
+        return {
+            'id': playlist_id,
+            'title': 'Unknown Playlist',
+            'channel': 'Unknown Channel',
+            'thumbnail': '',
+            'video_count': 0
+        }
         
-    async with aiohttp.ClientSession() as session:
+    async with session_scope(session) as session:
         url = 'https://www.googleapis.com/youtube/v3/playlists'
         params = {
             'part': 'snippet,contentDetails',
@@ -58,6 +70,8 @@ async def get_playlist_details(api_key, playlist_id, cache_manager=None):
                         if cache_manager:
                             cache_manager.add_to_cache(cache_key, details)
                         return details
+                elif quota:
+                    await quota.check_response(response)
         except Exception as e:
             print(f"Error getting playlist details: {e}")
     
@@ -70,7 +84,7 @@ async def get_playlist_details(api_key, playlist_id, cache_manager=None):
         'video_count': 0
     }
     
-    # Still cache the default to prevent repeated API failures
+    # Cache the default briefly to prevent repeated API failures
     if cache_manager:
-        cache_manager.add_to_cache(cache_key, default_details)
+        cache_manager.add_negative(cache_key, default_details)
     return default_details
\ No newline at end of file
@@ -0,0 +1,92 @@
+from contextlib import nullcontext
+
+from api_client_youtube.core.http import session_scope
+
+# playlistItems.list never returns more than 50 items per page
+PAGE_SIZE = 50
+
+# Partial responses: full pages only carry what a queue entry needs, pages
+# skipped on the way to the selected range only carry the next page token
+ITEM_FIELDS = 'nextPageToken,pageInfo/totalResults,items(snippet(title,videoOwnerChannelTitle,resourceId/videoId))'
+SKIP_FIELDS = 'nextPageToken,pageInfo/totalResults'
+
+async def iter_playlist_items(api_key, playlist_id, start=0, stop=None, session=None, quota=None, scheduler=None, lane='background'):
+    """
+    Stream the videos of a YouTube playlist page by page
+
+    Each page is only requested once the previous one has been consumed, so a
+    consumer that stops early (or is slower than the API) never causes the
+    whole playlist to be fetched. Pages before start are walked with a
+    minimal response because the API has no way to jump to an offset.
+
+    Args:
+        api_key (str): YouTube API key
+        playlist_id (str): YouTube playlist ID
+        start (int): Index of the first video to yield (0-based)
+        stop (int, optional): Index after the last video to yield
+        session (aiohttp.ClientSession, optional): Shared HTTP session
+        quota (QuotaTracker, optional): Quota tracker charged for each request
+        scheduler (FairScheduler, optional): Scheduler each page request waits on
+        lane (str): Scheduler lane of the page requests
+
+    Yields:
+        dict: Video with id, title, channel and position
+    """
+    if not api_key:
+        return
+
+    url = 'https://www.googleapis.com/youtube/v3/playlistItems'
+    page_token = None
+    page_start = 0
+
+    async with session_scope(session) as session:
+        while stop is None or page_start < stop:
+            skip_page = page_start + PAGE_SIZE <= start
+            params = {
+                'part': 'id' if skip_page else 'snippet',
+                'playlistId': playlist_id,
+                'key': api_key,
+                'maxResults': PAGE_SIZE,
+                'fields': SKIP_FIELDS if skip_page else ITEM_FIELDS
+            }
+            if page_token:
+                params['pageToken'] = page_token
+
+            if quota and not await quota.acquire('playlistItems'):
+                return
+
+            try:
+                async with scheduler.slot(lane) if scheduler else nullcontext():
+                    async with session.get(url, params=params) as response:
+                        if response.status != 200:
+                            print(f"Error getting playlist items: HTTP {response.status}")
+                            if quota:
+                                await quota.check_response(response)
+                            return
+                        results = await response.json()
+            except Exception as e:
+                print(f"Error getting playlist items: {e}")
+                return
+
+            if not skip_page:
+                for offset, item in enumerate(results.get('items', [])):
+                    position = page_start + offset
+                    if position < start:
+                        continue
+                    if stop is not None and position >= stop:
+                        return
+
+                    snippet = item.get('snippet', {})
+                    video_id = snippet.get('resourceId', {}).get('videoId')
+                    if video_id:
+                        yield {
+                            'id': video_id,
+                            'title': snippet.get('title', 'Unknown Title'),
+                            'channel': snippet.get('videoOwnerChannelTitle', 'Unknown'),
+                            'position': position
+                        }
+
+            page_token = results.get('nextPageToken')
+            if not page_token:
+                return
+            page_start += PAGE_SIZE
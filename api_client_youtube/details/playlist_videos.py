@@ -1,6 +1,6 @@
-import aiohttp
+from api_client_youtube.core.http import session_scope
 
-async def get_playlist_videos(api_key, playlist_id, page_token=None, max_results=25, cache_manager=None):
+async def get_playlist_videos(api_key, playlist_id, page_token=None, max_results=25, cache_manager=None, session=None, quota=None):
     """
     Get videos from a YouTube playlist with pagination support
     
@@ -10,6 +10,8 @@ async def get_playlist_videos(api_key, playlist_id, page_token=None, max_results
         page_token (str, optional): Token for pagination
         max_results (int): Maximum results per page
         cache_manager (CacheManager, optional): Cache manager instance
+        session (aiohttp.ClientSession, optional): Shared HTTP session
+        quota (QuotaTracker, optional): Quota tracker charged for each request
         
     Returns:
         tuple: (videos, next_page_token, total_results)
@@ -23,15 +25,20 @@ async def get_playlist_videos(api_key, playlist_id, page_token=None, max_results
     
     # Try to get from cache if cache manager provided and no page token
     if cache_manager and page_token is None:
-        cached_result = cache_manager.get_from_cache(cache_key)
+        cached_result = await cache_manager.get_cached(cache_key)
         if cached_result is not None:
             return cached_result
     
+    # Out of quota - return an empty page without caching it
+    if quota and not await quota.acquire('playlistItems'):
+        return [], None, 0
+    
     videos = []
     next_page_token = None
     total_results = 0
+    succeeded = False
     
-    async with aiohttp.ClientSession() as session:
+    async with session_scope(session) as session:
         url = 'https://www.googleapis.com/youtube/v3/playlistItems'
         params = {
             'part': 'snippet,contentDetails',
@@ -48,6 +55,7 @@ async def get_playlist_videos(api_key, playlist_id, page_token=None, max_results
             async with session.get(url, params=params) as response:
                 if response.status == 200:
                     results = await response.json()
+                    succeeded = True
                     
                     # Get total results and next page token
                     if 'pageInfo' in results and 'totalResults' in results['pageInfo']:
@@ -73,12 +81,17 @@ async def get_playlist_videos(api_key, playlist_id, page_token=None, max_results
                                     'channel': item['snippet']['channelTitle'] if 'channelTitle' in item['snippet'] else 'Unknown'
                                 }
                                 videos.append(video)
+                elif quota:
+                    await quota.check_response(response)
         except Exception as e:
             print(f"Error getting playlist videos: {e}")
     
     # Only cache first page results (without page token)
     result = (videos, next_page_token, total_results)
     if cache_manager and page_token is None:
-        cache_manager.add_to_cache(cache_key, result)
+        if succeeded:
+            cache_manager.add_to_cache(cache_key, result)
+        else:
+            cache_manager.add_negative(cache_key, result)
     
     return result
\ No newline at end of file
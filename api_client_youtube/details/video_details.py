@@ -1,7 +1,13 @@
-import aiohttp
+from api_client_youtube.core.http import session_scope
 from api_client_youtube.extractors.duration import parse_duration
 
-async def get_video_details(api_key, video_id, cache_manager=None):
+# The videos endpoint accepts at most 50 comma-separated IDs per request
+MAX_IDS_PER_REQUEST = 50
+
+# Partial response carrying only what _parse_video_item reads
+VIDEO_FIELDS = 'items(id,snippet(title,channelTitle,thumbnails/medium/url),contentDetails/duration)'
+
+async def get_video_details(api_key, video_id, cache_manager=None, session=None, quota=None):
     """
     Get details about a YouTube video
     
@@ -9,6 +15,8 @@ async def get_video_details(api_key, video_id, cache_manager=None):
         api_key (str): YouTube API key
         video_id (str): YouTube video ID
         cache_manager (CacheManager, optional): Cache manager instance
+        session (aiohttp.ClientSession, optional): Shared HTTP session
+        quota (QuotaTracker, optional): Quota tracker charged for each request
         
     Returns:
         dict: Video details including title, channel, thumbnail, duration
@@ -27,16 +35,27 @@ async def get_video_details(api_key, video_id, cache_manager=None):
     
     # Try to get from cache if cache manager provided
     if cache_manager:
-        cached_result = cache_manager.get_from_cache(cache_key)
+        cached_result = await cache_manager.get_cached(cache_key)
         if cached_result is not None:
             return cached_result
+    
+    # Out of quota - return the defaults without caching them
+    if quota and not await quota.acquire('videos'):
+        return {
+            'id': video_id,
+            'title': 'Unknown Video',
+            'channel': 'Unknown Channel',
+            'thumbnail': '',
+            'duration': 0
+        }
         
-    async with aiohttp.ClientSession() as session:
+    async with session_scope(session) as session:
         url = 'https://www.googleapis.com/youtube/v3/videos'
         params = {
             'part': 'snippet,contentDetails',
             'id': video_id,
-            'key': api_key
+            'key': api_key,
+            'fields': VIDEO_FIELDS
         }
         
         try:
@@ -44,25 +63,14 @@ async def get_video_details(api_key, video_id, cache_manager=None):
                 if response.status == 200:
                     results = await response.json()
                     if 'items' in results and len(results['items']) > 0:
-                        item = results['items'][0]
-                        
-                        # Parse duration from ISO 8601 format
-                        duration_str = item['contentDetails']['duration'] if 'contentDetails' in item and 'duration' in item['contentDetails'] else 'PT0S'
-                        duration_seconds = parse_duration(duration_str)
-                        
-                        # Extract video details
-                        details = {
-                            'id': video_id,
-                            'title': item['snippet']['title'],
-                            'channel': item['snippet']['channelTitle'],
-                            'thumbnail': item['snippet']['thumbnails']['medium']['url'] if 'thumbnails' in item['snippet'] and 'medium' in item['snippet']['thumbnails'] else '',
-                            'duration': duration_seconds
-                        }
+                        details = _parse_video_item(results['items'][0])
                         
                         # Cache the result if cache manager provided
                         if cache_manager:
                             cache_manager.add_to_cache(cache_key, details)
                         return details
+                elif quota:
+                    await quota.check_response(response)
         except Exception as e:
             print(f"Error getting video details: {e}")
     
@@ -75,7 +83,110 @@ async def get_video_details(api_key, video_id, cache_manager=None):
         'duration': 0
     }
     
-    # Still cache the default to prevent repeated API failures
+    # Cache the default briefly to prevent repeated API failures
     if cache_manager:
-        cache_manager.add_to_cache(cache_key, default_details)
-    return default_details
\ No newline at end of file
+        cache_manager.add_negative(cache_key, default_details)
+    return default_details
+
+async def get_video_details_batch(api_key, video_ids, cache_manager=None, session=None, quota=None):
+    """
+    Get details about several YouTube videos using the multi-ID videos endpoint
+    
+    Cached entries are served from the cache; the remaining IDs are fetched
+    in groups of 50 per request (one quota unit per request).
+    
+    Args:
+        api_key (str): YouTube API key
+        video_ids (list): YouTube video IDs
+        cache_manager (CacheManager, optional): Cache manager instance
+        session (aiohttp.ClientSession, optional): Shared HTTP session
+        quota (QuotaTracker, optional): Quota tracker charged for each request
+        
+    Returns:
+        dict: Video ID -> video details (same shape as get_video_details)
+    """
+    details_by_id = {}
+    missing_ids = []
+    answered_ids = set()  # IDs requested in a chunk the API answered successfully
+    
+    unique_ids = list(dict.fromkeys(video_ids))
+    cached = await cache_manager.get_many_cached([f"video_details_{video_id}" for video_id in unique_ids]) if cache_manager else {}
+    for video_id in unique_ids:
+        cached_result = cached.get(f"video_details_{video_id}")
+        if cached_result is not None:
+            details_by_id[video_id] = cached_result
+        else:
+            missing_ids.append(video_id)
+    
+    if missing_ids and api_key:
+        async with session_scope(session) as session:
+            url = 'https://www.googleapis.com/youtube/v3/videos'
+            
+            for i in range(0, len(missing_ids), MAX_IDS_PER_REQUEST):
+                chunk = missing_ids[i:i + MAX_IDS_PER_REQUEST]
+                params = {
+                    'part': 'snippet,contentDetails',
+                    'id': ','.join(chunk),
+                    'key': api_key,
+                    'maxResults': len(chunk),
+                    'fields': VIDEO_FIELDS
+                }
+                
+                if quota and not await quota.acquire('videos'):
+                    break
+                
+                try:
+                    async with session.get(url, params=params) as response:
+                        if response.status == 200:
+                            results = await response.json()
+                            answered_ids.update(chunk)
+                            for item in results.get('items', []):
+                                details = _parse_video_item(item)
+                                details_by_id[details['id']] = details
+                                
+                                # Cache the result if cache manager provided
+                                if cache_manager:
+                                    cache_manager.add_to_cache(f"video_details_{details['id']}", details)
+                        elif quota:
+                            await quota.check_response(response)
+                except Exception as e:
+                    print(f"Error getting video details batch: {e}")
+    
+    # Fill in defaults for anything the API did not return
+    for video_id in missing_ids:
+        if video_id not in details_by_id:
+            details_by_id[video_id] = {
+                'id': video_id,
+                'title': 'Unknown Video',
+                'channel': 'Unknown Channel',
+                'thumbnail': '',
+                'duration': 0
+            }
+            
+            # Omitted from a successful response: deleted or private, cache that briefly
+            if cache_manager and video_id in answered_ids:
+                cache_manager.add_negative(f"video_details_{video_id}", details_by_id[video_id])
+    
+    return details_by_id
+
+def _parse_video_item(item):
+    """
+    Convert a videos endpoint item into a video details dict
+    
+    Args:
+        item (dict): Item from the videos endpoint response
+        
+    Returns:
+        dict: Video details including title, channel, thumbnail, duration
+    """
+    # Parse duration from ISO 8601 format
+    duration_str = item['contentDetails']['duration'] if 'contentDetails' in item and 'duration' in item['contentDetails'] else 'PT0S'
+    duration_seconds = parse_duration(duration_str)
+    
+    return {
+        'id': item['id'],
+        'title': item['snippet']['title'],
+        'channel': item['snippet']['channelTitle'],
+        'thumbnail': item['snippet']['thumbnails']['medium']['url'] if 'thumbnails' in item['snippet'] and 'medium' in item['snippet']['thumbnails'] else '',
+        'duration': duration_seconds
+    }
\ No newline at end of file
@@ -2,7 +2,10 @@ from api_client_youtube.extractors.video_id import extract_video_id
 from api_client_youtube.extractors.playlist_id import extract_playlist_id
 from api_client_youtube.extractors.playlist_url import normalize_playlist_url
 from api_client_youtube.extractors.duration import parse_duration, format_duration
-from api_client_youtube.extractors.audio_url import extract_audio_url, get_ffmpeg_options, process_youtube_url
+from api_client_youtube.extractors.stream_expiry import get_stream_expiry
+from api_client_youtube.extractors.audio_url import extract_audio_url, resolve_stream, get_ffmpeg_options, process_youtube_url
+from api_client_youtube.extractors.playlist_entries import iter_playlist_entries
+from api_client_youtube.extractors.ytsearch import search_videos_ytdlp
 
 __all__ = [
     'extract_video_id', 
@@ -10,7 +13,11 @@ __all__ = [
     'normalize_playlist_url', 
     'parse_duration', 
     'format_duration', 
+    'get_stream_expiry', 
     'extract_audio_url', 
+    'resolve_stream', 
     'get_ffmpeg_options', 
-    'process_youtube_url'
+    'process_youtube_url', 
+    'iter_playlist_entries', 
+    'search_videos_ytdlp'
 ]
\ No newline at end of file
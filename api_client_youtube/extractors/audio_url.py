@@ -1,4 +1,5 @@
-import yt_dlp
+from api_client_youtube.core.ydl_pool import get_pool
+from api_client_youtube.extractors.stream_expiry import get_stream_expiry
 
 async def extract_audio_url(self, video_id_or_url):
     """
@@ -10,6 +11,20 @@ async def extract_audio_url(self, video_id_or_url):
     Returns:
         str: Direct audio URL
     """
+    stream = await self.resolve_stream(video_id_or_url)
+    return stream['url'] if stream else None
+
+async def resolve_stream(self, video_id_or_url):
+    """
+    Resolve the direct stream URL, format and duration for a YouTube video
+    
+    Args:
+        video_id_or_url (str): YouTube video ID or URL
+        
+    Returns:
+        dict: Stream info with id, url, format_id, acodec, duration and expires_at
+              (epoch seconds when the signed URL stops working), or None
+    """
     # Check if input is a URL or just a video ID
     if video_id_or_url.startswith(('http://', 'https://')):
         video_id = self.extract_video_id(video_id_or_url)
@@ -19,42 +34,68 @@ async def extract_audio_url(self, video_id_or_url):
     else:
         video_id = video_id_or_url
     
-    ydl_opts = {
-        'format': 'bestaudio/best',
-        'noplaylist': True,
-        'quiet': True,
-        'no_warnings': True,
-        # Add these options to ensure full song duration
-        'fragment_retries': 10,
-        'retries': 10,
-        'skip_unavailable_fragments': False,
-        # Add postprocessing to get consistent audio quality
-        'postprocessor_args': [
-            '-reconnect', '1',
-            '-reconnect_streamed', '1',
-            '-reconnect_delay_max', '5'
-        ]
-    }
+    # Reuse a still-valid signed URL, and share one extraction between
+    # concurrent requests for the same video
+    return await self.stream_cache.get_or_resolve(video_id, lambda: _extract_stream(self, video_id))
+
+async def _extract_stream(self, video_id):
+    """
+    Resolve a stream with yt-dlp, bypassing the stream cache
     
+    Args:
+        video_id (str): YouTube video ID
+        
+    Returns:
+        dict: Stream info (see resolve_stream) or None
+    """
     url = f"https://www.youtube.com/watch?v={video_id}"
     
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=False)
-            audio_url = info.get('url')
-            if not audio_url:
-                print(f"Warning: No audio URL found for video ID: {video_id}")
-            return audio_url
+        # Run yt-dlp on the extraction pool so the event loop stays free,
+        # ahead of any interactive or playlist work waiting for a slot
+        async with self.scheduler.slot('stream'):
+            stream = await self.extraction_executor.run(_resolve_stream_blocking, url)
     except Exception as e:
         print(f"Error extracting audio URL for {video_id}: {e}")
         return None
+    
+    if not stream or not stream.get('url'):
+        print(f"Warning: No audio URL found for video ID: {video_id}")
+        return None
+    
+    stream['id'] = video_id
+    stream['expires_at'] = get_stream_expiry(stream['url'])
+    return stream
 
-def get_ffmpeg_options(self, quality='medium'):
+def _resolve_stream_blocking(url):
+    """
+    Blocking yt-dlp stream extraction, run on the extraction pool
+    
+    Args:
+        url (str): YouTube video URL
+        
+    Returns:
+        dict: Stream url, format_id, acodec and duration, or None
+    """
+    with get_pool().checkout('stream') as ydl:
+        info = ydl.extract_info(url, download=False)
+        if not info:
+            return None
+        return {
+            'url': info.get('url'),
+            'format_id': info.get('format_id'),
+            'acodec': info.get('acodec'),
+            'duration': info.get('duration') or 0
+        }
+
+def get_ffmpeg_options(self, quality='medium', volume=None, passthrough=False):
     """
     Get FFmpeg options for audio playback
     
     Args:
         quality (str): Audio quality level (low, medium, high)
+        volume (float, optional): Volume multiplier applied by FFmpeg's volume filter
+        passthrough (bool): Copy the Opus stream as-is (no filters, so quality/volume are ignored)
         
     Returns:
         dict: FFmpeg options
@@ -63,13 +104,25 @@ def get_ffmpeg_options(self, quality='medium'):
         'before_options': '-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5',
     }
     
+    if passthrough:
+        # Stream copy - FFmpeg only remuxes, filters cannot be applied
+        base_options['options'] = '-vn'
+        return base_options
+    
+    extra_options = ''
     if quality == 'low':
-        base_options['options'] = '-vn -af "loudnorm=I=-16:TP=-1.5:LRA=11, aresample=48000, asetrate=48000*0.9"'
+        audio_filters = 'loudnorm=I=-16:TP=-1.5:LRA=11, aresample=48000, asetrate=48000*0.9'
     elif quality == 'high':
-        base_options['options'] = '-vn -af "loudnorm=I=-14:TP=-1:LRA=9" -b:a 192k'
+        audio_filters = 'loudnorm=I=-14:TP=-1:LRA=9'
+        extra_options = ' -b:a 192k'
     else:  # medium (default)
-        base_options['options'] = '-vn -af "loudnorm=I=-16:TP=-1.5:LRA=11"'
-        
+        audio_filters = 'loudnorm=I=-16:TP=-1.5:LRA=11'
+    
+    # Scale volume inside FFmpeg instead of in Python (PCMVolumeTransformer)
+    if volume is not None:
+        audio_filters += f', volume={volume}'
+    
+    base_options['options'] = f'-vn -af "{audio_filters}"{extra_options}'
     return base_options
 
 async def process_youtube_url(self, url):
@@ -84,50 +137,57 @@ async def process_youtube_url(self, url):
     - For playlist: {'type': 'playlist', 'info': playlist_info, 'entries': playlist_entries}
     - For search query: {'type': 'video', 'info': video_info}
     """
-    # Configure yt-dlp options
-    ydl_opts = {
-        'quiet': True,
-        'no_warnings': True,
-        'extract_flat': True,  # Extract basic metadata without downloading
-        'ignoreerrors': True,  # Continue processing if an individual video fails
-        'no_color': True,
-        'default_search': 'ytsearch',  # Ensure YouTube search
-        'max_downloads': 1  # Limit to first result for non-URL input
-    }
-    
     # Check if the input looks like a URL
     if not url.startswith(('http://', 'https://')):
         url = f"ytsearch1:{url}"
     
-    # Use yt-dlp to extract information
-    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-        try:
-            # Extract information about the URL or search query
-            info = ydl.extract_info(url, download=False)
-            
-            # Check if it's a playlist
-            if info and 'entries' in info:
-                # Validate it's actually a playlist (some YouTube URLs might look like playlists)
-                entries = [entry for entry in info['entries'] if entry]
-                
-                if entries:
-                    return {
-                        'type': 'playlist',
-                        'info': info,
-                        'entries': entries
-                    }
+    try:
+        # Run yt-dlp on the extraction pool so the event loop stays free
+        async with self.scheduler.slot('interactive'):
+            result = await self.extraction_executor.run(_process_youtube_url_blocking, url)
+    except Exception as e:
+        print(f"Error processing {url}: {e}")
+        return None
+    
+    if not result:
+        print(f"Warning: Could not process YouTube URL: {url}")
+    return result
+
+def _process_youtube_url_blocking(url):
+    """
+    Blocking yt-dlp metadata extraction, run on the extraction pool
+    
+    Args:
+        url (str): YouTube URL or ytsearch query
+        
+    Returns:
+        dict: Processed result (see process_youtube_url) or None
+    """
+    with get_pool().checkout('metadata') as ydl:
+        # Extract information about the URL or search query
+        info = ydl.extract_info(url, download=False)
+        if info:
+            # Make the info dict safe to return from a worker process
+            info = ydl.sanitize_info(info)
+        
+        # Check if it's a playlist
+        if info and 'entries' in info:
+            # Validate it's actually a playlist (some YouTube URLs might look like playlists)
+            entries = [entry for entry in info['entries'] if entry]
             
-            # If not a playlist, treat as a single video
-            if info and 'id' in info:
+            if entries:
                 return {
-                    'type': 'video',
-                    'info': info
+                    'type': 'playlist',
+                    'info': info,
+                    'entries': entries
                 }
-            
-            # If no valid info found
-            print(f"Warning: Could not process YouTube URL: {url}")
-            return None
         
-        except Exception as e:
-            print(f"Error processing {url}: {e}")
-            return None
\ No newline at end of file
+        # If not a playlist, treat as a single video
+        if info and 'id' in info:
+            return {
+                'type': 'video',
+                'info': info
+            }
+        
+        # If no valid info found
+        return None
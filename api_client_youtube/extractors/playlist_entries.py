@@ -0,0 +1,123 @@
+import itertools
+import threading
+
+from api_client_youtube.core.ydl_pool import get_pool
+
+# Entries taken by the first yt-dlp call; later calls double up to the maximum
+FIRST_CHUNK = 50
+MAX_CHUNK = 800
+
+async def iter_playlist_entries(self, playlist_id, start=0, stop=None, lane='background'):
+    """
+    Stream the videos of a YouTube playlist with yt-dlp (used without an API key)
+    
+    The playlist is extracted once with process=False, which leaves its
+    entries as yt-dlp's lazy generator: continuation pages are only fetched
+    as entries are taken, and each page is fetched once. Entries are taken
+    in growing chunks, so the first tracks arrive after the first page.
+    
+    Args:
+        playlist_id (str): YouTube playlist ID
+        start (int): Index of the first video to yield (0-based)
+        stop (int, optional): Index after the last video to yield
+        lane (str): Scheduler lane each chunk is extracted in
+    
+    Yields:
+        dict: Video with id, title, channel and position
+    """
+    walker = _PlaylistWalker(f"https://www.youtube.com/playlist?list={playlist_id}", start)
+    position = start
+    chunk = FIRST_CHUNK
+    
+    try:
+        while stop is None or position < stop:
+            count = chunk if stop is None else min(chunk, stop - position)
+            
+            try:
+                # The slot is released before the entries are yielded, so a slow
+                # consumer never holds up other guilds. The walk keeps state
+                # between calls, so it runs on a thread of this process.
+                async with self.scheduler.slot(lane):
+                    entries = await self.extraction_executor.run_local(walker.take, count)
+            except Exception as e:
+                print(f"Error extracting playlist entries for {playlist_id}: {e}")
+                return
+            
+            for offset, entry in enumerate(entries):
+                if entry and entry.get('id'):
+                    yield {
+                        'id': entry['id'],
+                        'title': entry.get('title') or 'Unknown Title',
+                        'channel': entry.get('channel') or entry.get('uploader') or 'Unknown',
+                        'position': position + offset
+                    }
+            
+            # A short chunk means the end of the playlist was reached
+            if len(entries) < count:
+                return
+            position += count
+            chunk = min(chunk * 2, MAX_CHUNK)
+    finally:
+        walker.close()
+
+class _PlaylistWalker:
+    """
+    One lazy yt-dlp walk over a playlist, keeping its pooled instance until closed
+    
+    take() runs on a worker thread and close() on the event loop. If close()
+    is called while a take() is still running (e.g. after a timeout), the
+    instance is returned to the pool by that take() once it finishes.
+    """
+    def __init__(self, url, start):
+        self.url = url
+        self.start = start
+        self._checkout = None
+        self._entries = None
+        self._lock = threading.Lock()
+        self._busy = False
+        self._closed = False
+    
+    def take(self, count):
+        """
+        Take the next entries of the playlist (blocking)
+        
+        Args:
+            count (int): Number of entries to take
+        
+        Returns:
+            list: Flat entries (None for entries that could not be read)
+        """
+        with self._lock:
+            if self._closed:
+                return []
+            self._busy = True
+        
+        try:
+            if self._entries is None:
+                self._checkout = get_pool().checkout('playlist')
+                ydl = self._checkout.__enter__()
+                info = ydl.extract_info(self.url, download=False, process=False)
+                # Entries before start are still walked, playlist pages cannot be skipped
+                self._entries = itertools.islice(iter((info or {}).get('entries') or []), self.start, None)
+            return list(itertools.islice(self._entries, count))
+        finally:
+            with self._lock:
+                self._busy = False
+                release = self._closed
+            if release:
+                self._release()
+    
+    def close(self):
+        """Return the instance to the pool, or leave that to a take() still running"""
+        with self._lock:
+            self._closed = True
+            if self._busy:
+                return
+        self._release()
+    
+    def _release(self):
+        """Exit the pool checkout"""
+        checkout, self._checkout = self._checkout, None
+        self._entries = None
+        if checkout is not None:
+            checkout.__exit__(None, None, None)
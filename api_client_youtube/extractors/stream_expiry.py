@@ -0,0 +1,24 @@
+import time
+from urllib.parse import urlparse, parse_qs
+
+# googlevideo URLs are normally signed for about six hours
+DEFAULT_STREAM_LIFETIME = 5 * 3600
+
+def get_stream_expiry(stream_url):
+    """
+    Get the expiry time of a signed googlevideo stream URL
+    
+    Args:
+        stream_url (str): Direct stream URL returned by yt-dlp
+        
+    Returns:
+        float: Expiry time in epoch seconds (estimated if the URL has no expire parameter)
+    """
+    try:
+        expire = parse_qs(urlparse(stream_url).query).get('expire')
+        if expire:
+            return float(expire[0])
+    except (TypeError, ValueError):
+        pass
+    
+    return time.time() + DEFAULT_STREAM_LIFETIME
\ No newline at end of file
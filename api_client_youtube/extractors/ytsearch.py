@@ -0,0 +1,53 @@
+from api_client_youtube.core.ydl_pool import get_pool
+
+async def search_videos_ytdlp(self, query, max_results=10):
+    """
+    Search YouTube for videos with yt-dlp instead of the Data API
+    
+    Costs no API quota, so it is used when there is no API key or the daily
+    budget is too low for another search.
+    
+    Args:
+        query (str): Search query
+        max_results (int): Maximum number of results to return
+        
+    Returns:
+        list: List of video objects with id, title, thumbnail, channel and duration
+    """
+    try:
+        entries = await self.extraction_executor.run(_ytsearch_blocking, query, max_results)
+    except Exception as e:
+        print(f"Error searching YouTube with yt-dlp: {e}")
+        return []
+    
+    videos = []
+    for entry in entries:
+        if not entry or not entry.get('id'):
+            continue
+        
+        thumbnails = entry.get('thumbnails') or []
+        videos.append({
+            'id': entry['id'],
+            'title': entry.get('title') or 'Unknown Title',
+            'thumbnail': thumbnails[-1].get('url', '') if thumbnails else '',
+            'channel': entry.get('channel') or entry.get('uploader') or 'Unknown',
+            'duration': int(entry.get('duration') or 0)
+        })
+    return videos
+
+def _ytsearch_blocking(query, max_results):
+    """
+    Blocking yt-dlp search, run on the extraction pool
+    
+    Args:
+        query (str): Search query
+        max_results (int): Maximum number of results
+        
+    Returns:
+        list: Flat search entries
+    """
+    with get_pool().checkout('search') as ydl:
+        info = ydl.extract_info(f"ytsearch{max_results}:{query}", download=False)
+        if not info:
+            return []
+        return list(ydl.sanitize_info(info).get('entries') or [])
@@ -1,5 +1,5 @@
-from api_client_youtube.search.videos import search_videos
+from api_client_youtube.search.videos import search_videos, search_videos_enriched, VideoSearchResult
 from api_client_youtube.search.playlists import search_playlists
 from api_client_youtube.search.artists import search_artists
 
-__all__ = ['search_videos', 'search_playlists', 'search_artists']
\ No newline at end of file
+__all__ = ['search_videos', 'search_videos_enriched', 'VideoSearchResult', 'search_playlists', 'search_artists']
\ No newline at end of file
@@ -1,6 +1,6 @@
-import aiohttp
+from api_client_youtube.core.http import session_scope
 
-async def search_artists(api_key, query, max_results=10):
+async def search_artists(api_key, query, max_results=10, session=None, quota=None):
     """
     Search for YouTube channels (artists) based on a query
     
@@ -8,6 +8,8 @@ async def search_artists(api_key, query, max_results=10):
         api_key (str): YouTube API key
         query (str): Search query
         max_results (int): Maximum number of results to return
+        session (aiohttp.ClientSession, optional): Shared HTTP session
+        quota (QuotaTracker, optional): Quota tracker charged for each request
         
     Returns:
         list: List of channel objects with id, title, description, thumbnail
@@ -16,8 +18,11 @@ async def search_artists(api_key, query, max_results=10):
     if not api_key:
         return []
         
+    if quota and not await quota.acquire('search'):
+        return []
+        
     search_results = []
-    async with aiohttp.ClientSession() as session:
+    async with session_scope(session) as session:
         url = 'https://www.googleapis.com/youtube/v3/search'
         params = {
             'part': 'snippet',
@@ -43,6 +48,8 @@ async def search_artists(api_key, query, max_results=10):
                                 )
                             }
                             search_results.append(channel)
+                elif quota:
+                    await quota.check_response(response)
         except Exception as e:
             print(f"Error searching YouTube channels: {e}")
     
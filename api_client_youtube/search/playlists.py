@@ -1,6 +1,6 @@
-import aiohttp
+from api_client_youtube.core.http import session_scope
 
-async def search_playlists(api_key, query, max_results=5, cache_manager=None):
+async def search_playlists(api_key, query, max_results=5, cache_manager=None, session=None, quota=None):
     """
     Search YouTube for playlists matching a query
     
@@ -9,6 +9,8 @@ async def search_playlists(api_key, query, max_results=5, cache_manager=None):
         query (str): Search query
         max_results (int): Maximum number of results to return
         cache_manager (CacheManager, optional): Cache manager instance
+        session (aiohttp.ClientSession, optional): Shared HTTP session
+        quota (QuotaTracker, optional): Quota tracker charged for each request
         
     Returns:
         list: List of playlist objects with id, title, thumbnail, channel
@@ -21,12 +23,16 @@ async def search_playlists(api_key, query, max_results=5, cache_manager=None):
     
     # Try to get from cache if cache manager provided
     if cache_manager:
-        cached_result = cache_manager.get_from_cache(cache_key)
+        cached_result = await cache_manager.get_cached(cache_key)
         if cached_result is not None:
             return cached_result
         
+    if quota and not await quota.acquire('search'):
+        return []
+        
     search_results = []
-    async with aiohttp.ClientSession() as session:
+    succeeded = False
+    async with session_scope(session) as session:
         url = 'https://www.googleapis.com/youtube/v3/search'
         params = {
             'part': 'snippet',
@@ -39,6 +45,7 @@ async def search_playlists(api_key, query, max_results=5, cache_manager=None):
             async with session.get(url, params=params) as response:
                 if response.status == 200:
                     results = await response.json()
+                    succeeded = True
                     if 'items' in results:
                         for item in results['items']:
                             playlist = {
@@ -48,11 +55,16 @@ async def search_playlists(api_key, query, max_results=5, cache_manager=None):
                                 'channel': item['snippet']['channelTitle']
                             }
                             search_results.append(playlist)
+                elif quota:
+                    await quota.check_response(response)
         except Exception as e:
             print(f"Error searching YouTube playlists: {e}")
     
-    # Cache results if cache manager provided
+    # Cache results if cache manager provided, failures only briefly
     if cache_manager:
-        cache_manager.add_to_cache(cache_key, search_results)
+        if succeeded:
+            cache_manager.add_to_cache(cache_key, search_results)
+        else:
+            cache_manager.add_negative(cache_key, search_results)
     
     return search_results
\ No newline at end of file
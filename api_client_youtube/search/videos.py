@@ -1,58 +1,136 @@
-import aiohttp
+from typing import TypedDict
 
-async def search_videos(api_key, query, max_results=10, cache_manager=None):
+from api_client_youtube.core.http import session_scope
+from api_client_youtube.details.video_details import get_video_details_batch
+from api_client_youtube.extractors.duration import format_duration
+
+# Partial response for search.list: only what a search result shows
+SEARCH_FIELDS = 'items(id/videoId,snippet(title,channelTitle,thumbnails/medium/url))'
+
+class VideoSearchResult(TypedDict):
+    """Search hit merged with its video details"""
+    id: str
+    title: str
+    thumbnail: str
+    channel: str
+    duration: int
+    duration_str: str
+
+async def search_videos(api_key, query, max_results=10, cache_manager=None, session=None, quota=None):
     """
-    Search YouTube for videos matching a query
+    Search YouTube for videos matching a query (kept for compatibility)
+    
+    Same as search_videos_enriched, so results also carry their duration.
     
     Args:
         api_key (str): YouTube API key
         query (str): Search query
         max_results (int): Maximum number of results to return
         cache_manager (CacheManager, optional): Cache manager instance
+        session (aiohttp.ClientSession, optional): Shared HTTP session
+        quota (QuotaTracker, optional): Quota tracker charged for each request
         
     Returns:
-        list: List of video objects with id, title, thumbnail, channel
+        list: VideoSearchResult dicts with id, title, thumbnail, channel, duration, duration_str
+    """
+    return await search_videos_enriched(api_key, query, max_results, cache_manager, session=session, quota=quota)
+
+async def search_videos_enriched(api_key, query, max_results=10, cache_manager=None, session=None, quota=None):
+    """
+    Search YouTube for videos and attach each result's duration
+    
+    Runs one search.list request for the IDs and one batched videos.list
+    request (snippet + contentDetails) for everything else, both with
+    partial responses. The merged results are cached under their own key,
+    so repeating a search makes no HTTP calls at all.
+    
+    Args:
+        api_key (str): YouTube API key
+        query (str): Search query
+        max_results (int): Maximum number of results to return
+        cache_manager (CacheManager, optional): Cache manager instance
+        session (aiohttp.ClientSession, optional): Shared HTTP session
+        quota (QuotaTracker, optional): Quota tracker charged for each request
+        
+    Returns:
+        list: VideoSearchResult dicts in search order
     """
-    # If no API key, return empty results
     if not api_key:
         return []
-        
-    cache_key = f"videos_{query}_{max_results}"
     
-    # Try to get from cache if cache manager provided
+    cache_key = f"videos_enriched_{query}_{max_results}"
+    
     if cache_manager:
-        cached_result = cache_manager.get_from_cache(cache_key)
+        cached_result = await cache_manager.get_cached(cache_key)
         if cached_result is not None:
             return cached_result
-        
-    search_results = []
-    async with aiohttp.ClientSession() as session:
+    
+    if quota and not await quota.acquire('search'):
+        return []
+    
+    hits = None
+    async with session_scope(session) as session:
         url = 'https://www.googleapis.com/youtube/v3/search'
         params = {
             'part': 'snippet',
             'q': query,
             'key': api_key,
             'maxResults': max_results,
-            'type': 'video'
+            'type': 'video',
+            'fields': SEARCH_FIELDS
         }
         try:
             async with session.get(url, params=params) as response:
                 if response.status == 200:
                     results = await response.json()
-                    if 'items' in results:
-                        for item in results['items']:
-                            video = {
-                                'id': item['id']['videoId'],
-                                'title': item['snippet']['title'],
-                                'thumbnail': item['snippet']['thumbnails']['medium']['url'] if 'thumbnails' in item['snippet'] and 'medium' in item['snippet']['thumbnails'] else '',
-                                'channel': item['snippet']['channelTitle']
-                            }
-                            search_results.append(video)
+                    hits = [item for item in results.get('items', []) if item.get('id', {}).get('videoId')]
+                elif quota:
+                    await quota.check_response(response)
         except Exception as e:
             print(f"Error searching YouTube: {e}")
+        
+        if hits is None:
+            if cache_manager:
+                cache_manager.add_negative(cache_key, [])
+            return []
+        
+        # Titles from videos.list are not HTML-escaped like search snippets,
+        # so details win and the search snippet is only the fallback
+        details_by_id = await get_video_details_batch(
+            api_key, [item['id']['videoId'] for item in hits], cache_manager, session=session, quota=quota
+        )
+    
+    search_results = []
+    complete = True  # Every hit got its details (and so its duration)
+    for item in hits:
+        video_id = item['id']['videoId']
+        details = details_by_id.get(video_id)
+        
+        # Not returned by videos.list (or out of quota), fall back to the search snippet
+        if not details or details.get('title') == 'Unknown Video':
+            complete = False
+            snippet = item.get('snippet', {})
+            details = {
+                'title': snippet.get('title', 'Unknown Title'),
+                'channel': snippet.get('channelTitle', 'Unknown'),
+                'thumbnail': snippet.get('thumbnails', {}).get('medium', {}).get('url', ''),
+                'duration': 0
+            }
+        
+        search_results.append(VideoSearchResult(
+            id=video_id,
+            title=details['title'],
+            thumbnail=details['thumbnail'],
+            channel=details['channel'],
+            duration=details['duration'],
+            duration_str=format_duration(details['duration'])
+        ))
     
-    # Cache results if cache manager provided
+    # Results with missing durations are only kept briefly so the details are retried soon
     if cache_manager:
-        cache_manager.add_to_cache(cache_key, search_results)
+        if complete:
+            cache_manager.add_to_cache(cache_key, search_results)
+        else:
+            cache_manager.add_negative(cache_key, search_results)
     
-    return search_results
\ No newline at end of file
+    return search_results
@@ -11,8 +11,9 @@ from .pause import pause_command, toggle_playback
 from .resume import resume_command
 from .skip import skip_command, skip_track
 from .stop import stop_command, stop_playback
-from .queue import queue_command, clear_command, shuffle_command, move_command, clear_queue, shuffle_queue, reorder_queue
-from .search import search_command, add_to_queue
+from .queue import queue_command, clear_command, shuffle_command, move_command, remove_command, clear_queue, shuffle_queue, reorder_queue, remove_from_queue
+from .search import search_command, add_to_queue, add_tracks_to_queue
+from .prefetch import prefetch_upcoming
 from .slash_commands import apply_slash_commands
 
 def apply(bot):
@@ -34,6 +35,7 @@ def apply(bot):
     bot.add_command(clear_command)
     bot.add_command(shuffle_command)
     bot.add_command(move_command)
+    bot.add_command(remove_command)
     bot.add_command(search_command)
     bot.play_next = types.MethodType(play_next, bot)
     bot.get_voice_client = types.MethodType(get_voice_client, bot)
@@ -46,7 +48,10 @@ def apply(bot):
     bot.clear_queue = types.MethodType(clear_queue, bot)
     bot.shuffle_queue = types.MethodType(shuffle_queue, bot)
     bot.reorder_queue = types.MethodType(reorder_queue, bot)
+    bot.remove_from_queue = types.MethodType(remove_from_queue, bot)
     bot.add_to_queue = types.MethodType(add_to_queue, bot)
+    bot.add_tracks_to_queue = types.MethodType(add_tracks_to_queue, bot)
+    bot.prefetch_upcoming = types.MethodType(prefetch_upcoming, bot)
 
     # Apply slash commands
     apply_slash_commands(bot)
\ No newline at end of file
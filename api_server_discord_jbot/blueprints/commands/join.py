@@ -1,5 +1,6 @@
 import discord
 import asyncio
+from ...core.track_queue import TrackQueue
 
 class Silence(discord.AudioSource):
     def read(self):
@@ -108,6 +109,7 @@ async def follow_to_voice_channel(bot, guild_id, current_channel_id, new_channel
             
             # Stop current playback if any
             if was_playing or was_paused:
+                bot.manual_stops.add(old_queue_id)
                 voice_client.stop()
             
             # Disconnect from the current voice channel
@@ -122,8 +124,10 @@ async def follow_to_voice_channel(bot, guild_id, current_channel_id, new_channel
             print(f"Error connecting to new voice channel: {e}")
             return {"success": False, "message": f"Failed to connect to new voice channel: {str(e)}"}
         
-        # Transfer queue from old to new channel
-        bot.music_queues[new_queue_id] = bot.music_queues.pop(old_queue_id, [])
+        # Transfer queue and its control panels from old to new channel
+        bot.music_queues[new_queue_id] = bot.music_queues.pop(old_queue_id, None) or TrackQueue()
+        for text_channel_id, _ in bot.control_panels.for_queue(old_queue_id):
+            bot.control_panels.bind(text_channel_id, new_queue_id)
         
         # Set the interruption flag to stop any ongoing playlist processing
         bot.playlist_processing[old_queue_id] = True
@@ -133,7 +137,7 @@ async def follow_to_voice_channel(bot, guild_id, current_channel_id, new_channel
         
         # If we had a current track, add it back to the front of the queue to resume
         if current_track and (was_playing or was_paused):
-            bot.music_queues[new_queue_id].insert(0, current_track)
+            bot.music_queues[new_queue_id].appendleft(current_track)
             # Clear the currently playing track for the old queue
             bot.currently_playing.pop(old_queue_id, None)
             
@@ -145,13 +149,10 @@ async def follow_to_voice_channel(bot, guild_id, current_channel_id, new_channel
                 asyncio.create_task(play_next(bot, guild_id, new_channel_id))
         
         # Update all control panels
-        for text_channel_id, message_id in list(bot.control_panels.items()):
-            try:
-                text_channel = guild.get_channel(text_channel_id)
-                if text_channel:
-                    await bot.update_control_panel(guild_id, new_channel_id)
-            except Exception as e:
-                print(f"Error updating control panel: {e}")
+        try:
+            await bot.update_control_panel(guild_id, new_channel_id)
+        except Exception as e:
+            print(f"Error updating control panel: {e}")
         
         return {
             "success": True,
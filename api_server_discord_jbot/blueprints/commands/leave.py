@@ -65,10 +65,10 @@ async def disconnect_from_voice(bot, guild_id, channel_id=None, preserve_queue=T
                 current_track = bot.currently_playing.get(queue_id)
                 if current_track:
                     # Add current track back to the front of the queue
-                    bot.music_queues[queue_id].insert(0, current_track)
+                    bot.music_queues[queue_id].appendleft(current_track)
             else:
                 # If not preserving queue, clear it
-                bot.music_queues[queue_id] = []
+                bot.music_queues[queue_id].clear()
             
             # Always clear the currently playing track
             bot.currently_playing.pop(queue_id, None)
@@ -95,10 +95,10 @@ async def disconnect_from_voice(bot, guild_id, channel_id=None, preserve_queue=T
                 current_track = bot.currently_playing.get(queue_id)
                 if current_track:
                     # Add current track back to the front of the queue
-                    bot.music_queues[queue_id].insert(0, current_track)
+                    bot.music_queues[queue_id].appendleft(current_track)
             else:
                 # If not preserving queue, clear it
-                bot.music_queues[queue_id] = []
+                bot.music_queues[queue_id].clear()
             
             # Always clear the currently playing track
             bot.currently_playing.pop(queue_id, None)
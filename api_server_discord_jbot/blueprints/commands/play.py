@@ -1,9 +1,20 @@
 """
 Play command for Discord bot - includes play_next functionality
 """
+import os
 import discord
 from discord.ext import commands
 import asyncio
+from .prefetch import prefetch_upcoming
+
+# A track that stops within this many seconds is treated as a failed stream
+STREAM_FAILURE_WINDOW = 3
+
+# How audio is handed to Discord: opus (default), passthrough or pcm
+PLAYBACK_MODE = os.environ.get('PLAYBACK_MODE', 'opus')
+
+# Playback volume multiplier
+PLAYBACK_VOLUME = 0.5
 
 @commands.command(name="play", aliases=["p"])
 async def play_command(ctx, *, query=None):
@@ -28,6 +39,9 @@ async def play_command(ctx, *, query=None):
     
     voice_channel = ctx.author.voice.channel
     
+    # Lookups made for this command are queued under this guild
+    ctx.bot.youtube_client.scheduler.bind_guild(ctx.guild.id)
+    
     # If no query is provided, show the control panel
     if not query:
         await ctx.bot.join_and_show_controls(ctx.channel, voice_channel, ctx.guild.id)
@@ -45,8 +59,12 @@ async def play_command(ctx, *, query=None):
             # Join voice channel and show controls first
             await ctx.bot.join_and_show_controls(ctx.channel, voice_channel, ctx.guild.id)
             
+            # Stream playlists page by page so playback starts with the first tracks
+            result = await stream_playlist(ctx.bot.youtube_client, url)
+            
             # Process the URL
-            result = await ctx.bot.youtube_client.process_youtube_url(url)
+            if not result:
+                result = await ctx.bot.youtube_client.process_youtube_url(url)
             
             if not result:
                 message = await ctx.send("Could not process the URL. Please check the link and try again.")
@@ -59,62 +77,39 @@ async def play_command(ctx, *, query=None):
                 video_info = result['info']
                 
                 # Add to queue
-                await add_to_queue(
-                    ctx.bot,
+                await ctx.bot.add_to_queue(
                     str(ctx.guild.id), 
                     str(voice_channel.id), 
                     video_info['id'], 
-                    video_info['title']
+                    video_info['title'],
+                    channel=video_info.get('channel'),
+                    duration=video_info.get('duration')
                 )
                 
             elif result['type'] == 'playlist':
                 # Display loading message
-                loading_msg = await ctx.send(f"Loading playlist: **{result['info'].get('title', 'Unknown')}**...")
+                playlist_title = result['info'].get('title', 'Unknown')
+                loading_msg = await ctx.send(f"Loading playlist: **{playlist_title}**...")
                 
-                # Process playlist - add all tracks
-                entries = result['entries']
+                # Edit the loading message with progress while tracks are added
+                async def report_progress(done, total):
+                    await loading_msg.edit(content=f"Loading playlist: **{playlist_title}**... {done}/{total} tracks")
                 
-                # Set flag for processing
-                queue_id = ctx.bot.get_queue_id(str(ctx.guild.id), str(voice_channel.id))
-                ctx.bot.playlist_processing[queue_id] = False
-                
-                # Add tracks
-                added_count = 0
-                failed_count = 0
-                
-                for entry in entries:
-                    # Check if processing has been interrupted
-                    if ctx.bot.playlist_processing.get(queue_id, False):
-                        break
-                    
-                    try:
-                        result = await add_to_queue(
-                            ctx.bot,
-                            str(ctx.guild.id), 
-                            str(voice_channel.id), 
-                            entry['id'], 
-                            entry['title']
-                        )
-                        
-                        if result["success"]:
-                            added_count += 1
-                        else:
-                            failed_count += 1
-                    except Exception as e:
-                        print(f"Error adding track {entry['title']}: {e}")
-                        failed_count += 1
-                
-                # Clean up processing flag
-                ctx.bot.playlist_processing.pop(queue_id, None)
-                
-                # Delete loading message
-                await loading_msg.delete()
-                
-                # Send summary
-                summary_msg = await ctx.send(
-                    f"Added **{added_count}** tracks from playlist to queue. Failed: **{failed_count}**"
+                # Process playlist - add all tracks in one go
+                queue_result = await ctx.bot.add_tracks_to_queue(
+                    str(ctx.guild.id),
+                    str(voice_channel.id),
+                    result['entries'],
+                    on_progress=report_progress,
+                    total=result.get('playlist_length')
                 )
-                await summary_msg.delete(delay=ctx.bot.cleartimer)
+                
+                # Turn the loading message into the summary
+                summary = f"Added **{queue_result['added']}** tracks from playlist to queue. Failed: **{queue_result['failed']}**"
+                if queue_result.get('interrupted'):
+                    summary += " (interrupted)"
+                await loading_msg.edit(content=summary)
+                await loading_msg.delete(delay=ctx.bot.cleartimer)
                 
         except Exception as e:
             error_msg = await ctx.send(f"Error processing URL: {str(e)}")
@@ -141,12 +136,13 @@ async def play_command(ctx, *, query=None):
             video = search_results[0]
             
             # Add to queue
-            result = await add_to_queue(
-                ctx.bot,
+            result = await ctx.bot.add_to_queue(
                 str(ctx.guild.id), 
                 str(voice_channel.id), 
                 video['id'], 
-                video['title']
+                video['title'],
+                channel=video.get('channel'),
+                duration=video.get('duration')
             )
             
             if result["success"]:
@@ -163,6 +159,33 @@ async def play_command(ctx, *, query=None):
 
 
 
+async def stream_playlist(youtube_client, url):
+    """
+    Prepare a playlist URL for streaming instead of extracting every entry up front
+    
+    Args:
+        youtube_client: YouTube client
+        url (str): Normalized YouTube URL
+        
+    Returns:
+        dict: {'type': 'playlist', 'info', 'entries' (async iterator), 'playlist_length'},
+              or None if the URL is not a playlist the API can page through (e.g. mixes)
+    """
+    playlist_id = youtube_client.extract_playlist_id(url)
+    if not playlist_id:
+        return None
+    
+    details = await youtube_client.get_playlist_details(playlist_id)
+    if youtube_client.api_key and not details.get('video_count'):
+        return None
+    
+    return {
+        'type': 'playlist',
+        'info': details,
+        'entries': youtube_client.iter_playlist(playlist_id),
+        'playlist_length': details.get('video_count') or None
+    }
+
 
 # Core play_next functionality - manages actual playback
 async def play_next(bot, guild_id, channel_id):
@@ -176,6 +199,7 @@ async def play_next(bot, guild_id, channel_id):
     """
     queue_id = bot.get_queue_id(guild_id, channel_id)
     print(f"play_next called for queue {queue_id}")
+    bot.youtube_client.scheduler.bind_guild(guild_id)
     
     # Check if there are songs in the queue
     if not bot.music_queues[queue_id]:
@@ -193,29 +217,27 @@ async def play_next(bot, guild_id, channel_id):
         return
     
     # Get next song
-    song = bot.music_queues[queue_id].pop(0)
+    song = bot.music_queues[queue_id].popleft()
     bot.currently_playing[queue_id] = song
     
     try:
-        # Use the music client to get the audio URL
-        audio_url = await bot.youtube_client.extract_audio_url(song['id'])
-        
-        if not audio_url:
-            raise Exception(f"Failed to extract audio URL for {song['id']}")
+        # Served instantly from the stream cache when the track was prefetched
+        stream = await bot.youtube_client.resolve_stream(song.id)
         
-        # Get FFmpeg options from the service
-        ffmpeg_options = bot.youtube_client.get_ffmpeg_options('medium')
+        if not stream:
+            raise Exception(f"Failed to extract audio URL for {song.id}")
         
         # Create FFmpeg audio source
-        audio_source = discord.FFmpegPCMAudio(audio_url, **ffmpeg_options)
+        audio_source = create_audio_source(bot, stream)
         
         # Play the song
+        started_at = bot.loop.time()
         voice_client.play(audio_source, after=lambda e: asyncio.run_coroutine_threadsafe(
-            play_next(bot, guild_id, channel_id), bot.loop) if e is None else print(f'Player error: {e}'))
+            playback_finished(bot, guild_id, channel_id, song, started_at), bot.loop) if e is None else print(f'Player error: {e}'))
+        print(f"Now playing: {song.title} in guild {guild_id}")
         
-        # Set the volume to a reasonable level
-        voice_client.source = discord.PCMVolumeTransformer(voice_client.source, volume=0.5)
-        print(f"Now playing: {song['title']} in guild {guild_id}")
+        # Resolve the next tracks in the background while this one plays
+        asyncio.create_task(prefetch_upcoming(bot, guild_id, channel_id))
         
         # Update control panels with now playing information
         await bot.update_control_panel(guild_id, channel_id)
@@ -224,4 +246,77 @@ async def play_next(bot, guild_id, channel_id):
         print(f"Error playing song: {e}")
         # Try to play the next song
         bot.currently_playing.pop(queue_id, None)
-        asyncio.create_task(play_next(bot, guild_id, channel_id))
\ No newline at end of file
+        asyncio.create_task(play_next(bot, guild_id, channel_id))
+
+
+def create_audio_source(bot, stream):
+    """
+    Create the audio source for a resolved stream according to PLAYBACK_MODE
+    
+    - opus: FFmpeg applies loudnorm/volume and encodes Opus itself, so the bot
+      process neither decodes PCM nor runs libopus (default)
+    - passthrough: Opus streams are copied without re-encoding (volume is not
+      applied); other codecs fall back to opus mode
+    - pcm: legacy FFmpegPCMAudio + PCMVolumeTransformer path
+    
+    Args:
+        bot: The Discord bot instance
+        stream (dict): Stream info from resolve_stream
+        
+    Returns:
+        discord.AudioSource: Audio source ready to play
+    """
+    if PLAYBACK_MODE == 'pcm':
+        ffmpeg_options = bot.youtube_client.get_ffmpeg_options('medium')
+        return discord.PCMVolumeTransformer(
+            discord.FFmpegPCMAudio(stream['url'], **ffmpeg_options),
+            volume=PLAYBACK_VOLUME
+        )
+    
+    # The codec is already known from yt-dlp, so there is no need for an ffprobe round-trip
+    passthrough = PLAYBACK_MODE == 'passthrough' and stream.get('acodec') == 'opus'
+    ffmpeg_options = bot.youtube_client.get_ffmpeg_options(
+        'medium',
+        volume=None if passthrough else PLAYBACK_VOLUME,
+        passthrough=passthrough
+    )
+    return discord.FFmpegOpusAudio(
+        stream['url'],
+        bitrate=128,
+        codec='copy' if passthrough else None,
+        **ffmpeg_options
+    )
+
+
+async def playback_finished(bot, guild_id, channel_id, song, started_at):
+    """
+    Handle the end of a track and move on to the next one
+    
+    If the track ended almost immediately without anyone skipping it, FFmpeg
+    was most likely refused by googlevideo (HTTP 403 on an expired or revoked
+    signed URL). The cached stream is then dropped and the track retried once
+    with a freshly resolved URL.
+    
+    Args:
+        bot: The Discord bot instance
+        guild_id (str): Discord guild ID
+        channel_id (str): Discord channel ID
+        song (Track): Track that just finished
+        started_at (float): Event loop time playback started
+    """
+    queue_id = bot.get_queue_id(guild_id, channel_id)
+    stopped_manually = queue_id in bot.manual_stops
+    bot.manual_stops.discard(queue_id)
+    
+    ended_early = bot.loop.time() - started_at < STREAM_FAILURE_WINDOW
+    if ended_early and not stopped_manually and bot.currently_playing.get(queue_id) is song:
+        bot.youtube_client.invalidate_stream(song.id)
+        
+        if bot.stream_retries.get(queue_id) != song.id:
+            print(f"Stream for {song.title} ended immediately, retrying with a fresh URL")
+            bot.stream_retries[queue_id] = song.id
+            bot.music_queues[queue_id].appendleft(song)
+    else:
+        bot.stream_retries.pop(queue_id, None)
+    
+    await play_next(bot, guild_id, channel_id)
\ No newline at end of file
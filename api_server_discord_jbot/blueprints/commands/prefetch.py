@@ -0,0 +1,51 @@
+"""
+Prefetch stage for Discord bot - resolves upcoming tracks while the current one plays
+"""
+import asyncio
+import os
+
+# Number of queued tracks to resolve ahead of playback
+PREFETCH_TRACKS = int(os.environ.get('PREFETCH_TRACKS', 2))
+
+
+async def prefetch_upcoming(bot, guild_id, channel_id):
+    """
+    Resolve stream URL, format and duration for the next tracks in the queue
+    
+    Resolved streams land in the YouTube client's stream cache, so play_next
+    starts instantly from a pre-resolved entry while it is still valid.
+    
+    Args:
+        bot: The Discord bot instance
+        guild_id (str): Discord guild ID
+        channel_id (str): Discord channel ID
+    """
+    queue_id = bot.get_queue_id(guild_id, channel_id)
+    bot.youtube_client.scheduler.bind_guild(guild_id)
+    upcoming = bot.music_queues[queue_id].peek(PREFETCH_TRACKS)
+    
+    pending = [
+        _prefetch_track(bot, track)
+        for track in upcoming
+        if not bot.youtube_client.has_fresh_stream(track.id)
+    ]
+    
+    if pending:
+        await asyncio.gather(*pending)
+
+
+async def _prefetch_track(bot, track):
+    """
+    Resolve a single track into the stream cache
+    
+    Args:
+        bot: The Discord bot instance
+        track (Track): Queued track
+    """
+    try:
+        # Concurrent requests for the same video share one extraction
+        stream = await bot.youtube_client.resolve_stream(track.id)
+        if stream:
+            print(f"Prefetched stream for {track.title}")
+    except Exception as e:
+        print(f"Error prefetching {track.id}: {e}")
\ No newline at end of file
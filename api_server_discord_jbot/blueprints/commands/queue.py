@@ -1,11 +1,10 @@
 """
 Queue command and functionality for Discord bot
-Includes core queue management functions (display, clear, shuffle, reorder)
+Includes core queue management functions (display, clear, shuffle, reorder, remove)
 """
 import discord
 from discord.ext import commands
 import asyncio
-import random
 
 @commands.command(name="queue", aliases=["q"])
 async def queue_command(ctx):
@@ -44,7 +43,7 @@ async def queue_command(ctx):
     if current_track:
         embed.add_field(
             name="Now Playing",
-            value=f"[{current_track['title']}](https://www.youtube.com/watch?v={current_track['id']})",
+            value=f"[{current_track.title}]({current_track.url})",
             inline=False
         )
     
@@ -52,8 +51,11 @@ async def queue_command(ctx):
     if queue:
         # Build queue text
         queue_text = ""
-        for i, track in enumerate(queue[:10]):
-            queue_text += f"{i+1}. [{track['title']}](https://www.youtube.com/watch?v={track['id']})\n"
+        for i, track in enumerate(queue.peek(10)):
+            queue_text += f"{i+1}. [{track.title}]({track.url})"
+            if track.duration:
+                queue_text += f" `{track.duration_str}`"
+            queue_text += "\n"
         
         if len(queue) > 10:
             queue_text += f"\n... and {len(queue) - 10} more"
@@ -186,6 +188,54 @@ async def move_command(ctx, old_pos: int = None, new_pos: int = None):
     await message.delete(delay=ctx.bot.cleartimer)
 
 
+@commands.command(name="remove", aliases=["rm"])
+async def remove_command(ctx, start_pos: int = None, end_pos: int = None):
+    """
+    Remove a track, or a range of tracks, from the queue.
+    
+    Usage:
+    !remove <position> [end_position]
+    
+    Example:
+    !remove 3
+    !remove 5 20
+    """
+    # Delete command message after a short delay
+    asyncio.create_task(ctx.message.delete(delay=ctx.bot.cleartimer))
+    
+    if start_pos is None:
+        message = await ctx.send("Please provide a position. Example: `!remove 3` or `!remove 5 20`")
+        await message.delete(delay=ctx.bot.cleartimer)
+        return
+    
+    # Convert to a 0-based, end-exclusive range
+    start_index = start_pos - 1
+    end_index = end_pos if end_pos is not None else start_pos
+    
+    # Check if bot is in a voice channel in this guild
+    voice_client = discord.utils.get(ctx.bot.voice_clients, guild=ctx.guild)
+    if not voice_client or not voice_client.is_connected():
+        message = await ctx.send("I'm not currently in a voice channel.")
+        await message.delete(delay=ctx.bot.cleartimer)
+        return
+    
+    # Check if user is in the same voice channel
+    if not ctx.author.voice or ctx.author.voice.channel != voice_client.channel:
+        message = await ctx.send("You need to be in the same voice channel to use this command.")
+        await message.delete(delay=ctx.bot.cleartimer)
+        return
+    
+    # Get channel ID
+    channel_id = str(voice_client.channel.id)
+    
+    # Remove the tracks
+    result = await remove_from_queue(ctx.bot, str(ctx.guild.id), channel_id, start_index, end_index)
+    
+    # Send response
+    message = await ctx.send(result["message"])
+    await message.delete(delay=ctx.bot.cleartimer)
+
+
 # Core queue functionality - can be called by API handlers or commands
 
 async def clear_queue(bot, guild_id, channel_id=None):
@@ -206,15 +256,16 @@ async def clear_queue(bot, guild_id, channel_id=None):
     if channel_id:
         # Clear a specific queue
         queue_id = bot.get_queue_id(guild_id, channel_id)
-        bot.music_queues[queue_id] = []
+        bot.music_queues[queue_id].clear()
         bot.currently_playing.pop(queue_id, None)
         channel_ids.append(channel_id)
         queues_cleared = 1
     else:
-        # Clear all queues for this guild
+        # Clear all queues for this guild, including stored ones not restored yet
+        bot.music_queues.restore_guild(guild_id)
         for queue_id in list(bot.music_queues.keys()):
             if queue_id.startswith(f"{guild_id}_"):
-                bot.music_queues[queue_id] = []
+                bot.music_queues[queue_id].clear()
                 bot.currently_playing.pop(queue_id, None)
                 this_channel_id = queue_id.split('_')[1]
                 channel_ids.append(this_channel_id)
@@ -247,7 +298,7 @@ async def shuffle_queue(bot, guild_id, channel_id):
     if not bot.music_queues[queue_id]:
         return {"success": False, "message": "Queue is empty, nothing to shuffle"}
     
-    random.shuffle(bot.music_queues[queue_id])
+    bot.music_queues[queue_id].shuffle()
     
     # Update control panels
     await bot.update_control_panel(guild_id, channel_id)
@@ -271,14 +322,11 @@ async def reorder_queue(bot, guild_id, channel_id, old_index, new_index):
     """
     queue_id = bot.get_queue_id(guild_id, channel_id)
     
-    # Make sure indices are valid
-    if not bot.music_queues[queue_id] or old_index < 0 or old_index >= len(bot.music_queues[queue_id]) or \
-    new_index < 0 or new_index >= len(bot.music_queues[queue_id]):
-        return {"success": False, "message": "Invalid index"}
-    
     # Move the track from old_index to new_index
-    track = bot.music_queues[queue_id].pop(old_index)
-    bot.music_queues[queue_id].insert(new_index, track)
+    try:
+        bot.music_queues[queue_id].move(old_index, new_index)
+    except IndexError:
+        return {"success": False, "message": "Invalid index"}
     
     # Update control panels
     await bot.update_control_panel(guild_id, channel_id)
@@ -286,4 +334,38 @@ async def reorder_queue(bot, guild_id, channel_id, old_index, new_index):
     return {
         "success": True,
         "message": f"Track moved from position {old_index+1} to {new_index+1}"
-    }
\ No newline at end of file
+    }
+
+
+async def remove_from_queue(bot, guild_id, channel_id, start_index, end_index=None):
+    """
+    Remove the tracks from start_index up to (not including) end_index
+    
+    Args:
+        bot: The Discord bot instance
+        guild_id (str): Discord guild ID
+        channel_id (str): Discord channel ID
+        start_index (int): Position of the first track to remove
+        end_index (int, optional): Position after the last track to remove. Defaults to start_index + 1.
+        
+    Returns:
+        dict: Result containing success status and message
+    """
+    queue_id = bot.get_queue_id(guild_id, channel_id)
+    queue = bot.music_queues[queue_id]
+    
+    if end_index is None:
+        end_index = start_index + 1
+    
+    # Make sure the range is valid
+    if start_index < 0 or start_index >= len(queue) or end_index <= start_index:
+        return {"success": False, "message": "Invalid index"}
+    
+    removed = queue.remove_range(start_index, end_index)
+    
+    # Update control panels
+    await bot.update_control_panel(guild_id, channel_id)
+    
+    if len(removed) == 1:
+        return {"success": True, "message": f"Removed from queue: {removed[0].title}"}
+    return {"success": True, "message": f"Removed {len(removed)} tracks from the queue"}
@@ -5,6 +5,14 @@ import discord
 from discord.ext import commands
 import asyncio
 from .play import play_next
+from .prefetch import prefetch_upcoming
+from ...core.track import Track
+
+# Tracks appended per step of a bulk enqueue before yielding to the event loop
+BULK_CHUNK_SIZE = 50
+
+# Minimum seconds between progress reports during a bulk enqueue
+PROGRESS_INTERVAL = 2.0
 
 @commands.command(name="search", aliases=["find"])
 async def search_command(ctx, *, query=None):
@@ -34,6 +42,9 @@ async def search_command(ctx, *, query=None):
     
     voice_channel = ctx.author.voice.channel
     
+    # Lookups made for this command are queued under this guild
+    ctx.bot.youtube_client.scheduler.bind_guild(ctx.guild.id)
+    
     # Join the voice channel if not already connected
     await ctx.bot.join_and_show_controls(ctx.channel, voice_channel, ctx.guild.id)
     
@@ -143,7 +154,9 @@ async def search_command(ctx, *, query=None):
                 str(ctx.guild.id),
                 str(voice_channel.id),
                 selected_track['id'],
-                selected_track['title']
+                selected_track['title'],
+                channel=selected_track.get('channel'),
+                duration=selected_track.get('duration')
             )
             
             if result["success"]:
@@ -175,7 +188,7 @@ async def search_command(ctx, *, query=None):
         await error_msg.delete(delay=ctx.bot.cleartimer)
 
 # Core add_to_queue functionality - can be called by API handlers or commands
-async def add_to_queue(bot, guild_id, channel_id, video_id, video_title):
+async def add_to_queue(bot, guild_id, channel_id, video_id, video_title, channel=None, duration=0):
     """
     Add a track to the queue and start playing if needed
     
@@ -185,6 +198,8 @@ async def add_to_queue(bot, guild_id, channel_id, video_id, video_title):
         channel_id (str): Discord channel ID
         video_id (str): YouTube video ID
         video_title (str): YouTube video title
+        channel (str, optional): YouTube channel name
+        duration (int, optional): Duration in seconds, 0 if unknown
         
     Returns:
         dict: Result containing success status, message, and queue length
@@ -195,15 +210,14 @@ async def add_to_queue(bot, guild_id, channel_id, video_id, video_title):
         return {"success": False, "message": "Could not connect to voice channel"}
     
     # Add to queue
-    bot.music_queues[queue_id].append({
-        "id": video_id,
-        "title": video_title,
-        "url": f"https://www.youtube.com/watch?v={video_id}"
-    })
+    bot.music_queues[queue_id].append(Track(video_id, video_title, channel, duration))
     
     # If we're not playing anything in this queue, start playing
     if queue_id not in bot.currently_playing:
         asyncio.create_task(play_next(bot, guild_id, channel_id))
+    else:
+        # Resolve the new track ahead of time if it is coming up soon
+        asyncio.create_task(prefetch_upcoming(bot, guild_id, channel_id))
     
     # Update control panels
     await bot.update_control_panel(guild_id, channel_id)
@@ -213,3 +227,152 @@ async def add_to_queue(bot, guild_id, channel_id, video_id, video_title):
         "message": f"Added to queue: {video_title}",
         "queue_length": len(bot.music_queues[queue_id])
     }
+
+
+async def add_tracks_to_queue(bot, guild_id, channel_id, tracks, on_progress=None, total=None):
+    """
+    Add many tracks to the queue at once (e.g. a playlist selection)
+    
+    The voice client is looked up once, playback is started once as soon as
+    the first tracks are queued and the control panels are refreshed once at
+    the end. Tracks can also be streamed from an async iterable (e.g.
+    YouTubeService.iter_playlist), in which case playback starts with the
+    first page while the rest is still being fetched. Setting
+    bot.playlist_processing[queue_id] to True (stop, follow) interrupts the
+    remaining tracks.
+    
+    Args:
+        bot: The Discord bot instance
+        guild_id (str): Discord guild ID
+        channel_id (str): Discord channel ID
+        tracks (list or async iterable): Tracks with at least id and title
+        on_progress (callable, optional): Coroutine function called with (processed, total),
+            at most every PROGRESS_INTERVAL seconds
+        total (int, optional): Expected number of tracks when streaming
+        
+    Returns:
+        dict: Result containing success status, message, added/failed counts,
+            whether processing was interrupted and queue length
+    """
+    if total is None and hasattr(tracks, '__len__'):
+        total = len(tracks)
+    
+    # Playlist pages fetched while streaming count against this guild's share
+    bot.youtube_client.scheduler.bind_guild(guild_id)
+    
+    voice_client, queue_id = await bot.get_voice_client(guild_id, channel_id, connect=True)
+    
+    if not voice_client:
+        return {"success": False, "message": "Could not connect to voice channel", "added": 0, "failed": total or 0}
+    
+    bot.playlist_processing[queue_id] = False
+    queue = bot.music_queues[queue_id]
+    was_playing = queue_id in bot.currently_playing
+    playback_started = was_playing
+    
+    added_count = 0
+    failed_count = 0
+    interrupted = False
+    last_report = bot.loop.time()
+    
+    chunks = _iter_chunks(tracks, BULK_CHUNK_SIZE)
+    try:
+        async for chunk in chunks:
+            # Check if processing has been interrupted
+            if bot.playlist_processing.get(queue_id, False):
+                interrupted = True
+                break
+            
+            for entry in chunk:
+                try:
+                    queue.append(Track.coerce(entry))
+                    added_count += 1
+                except (KeyError, TypeError) as e:
+                    print(f"Error adding track {entry}: {e}")
+                    failed_count += 1
+            
+            # Start playback once, as soon as the first tracks are queued
+            if not playback_started and queue:
+                playback_started = True
+                asyncio.create_task(play_next(bot, guild_id, channel_id))
+            
+            if on_progress and bot.loop.time() - last_report >= PROGRESS_INTERVAL:
+                last_report = bot.loop.time()
+                try:
+                    await on_progress(added_count + failed_count, max(total or 0, added_count + failed_count))
+                except Exception as e:
+                    print(f"Error reporting queue progress: {e}")
+            
+            # Let playback and other guilds run between chunks
+            await asyncio.sleep(0)
+    finally:
+        await chunks.aclose()
+        bot.playlist_processing.pop(queue_id, None)
+    
+    # Resolve the new tracks ahead of time if they are coming up soon
+    if was_playing:
+        asyncio.create_task(prefetch_upcoming(bot, guild_id, channel_id))
+    
+    # Update control panels once for the whole batch
+    await bot.update_control_panel(guild_id, channel_id)
+    
+    return {
+        "success": added_count > 0,
+        "message": f"Added {added_count} tracks to queue",
+        "added": added_count,
+        "failed": failed_count,
+        "interrupted": interrupted,
+        "queue_length": len(queue)
+    }
+
+
+async def _iter_chunks(tracks, size):
+    """
+    Group tracks into lists of up to size items
+    
+    Async sources are read by a background task into a bounded buffer, so
+    the next page is fetched while the current one is queued but the reader
+    never runs more than a couple of chunks ahead.
+    
+    Args:
+        tracks (list or async iterable): Tracks to group
+        size (int): Maximum chunk length
+        
+    Yields:
+        list: Chunk of tracks
+    """
+    if not hasattr(tracks, '__aiter__'):
+        for start in range(0, len(tracks), size):
+            yield tracks[start:start + size]
+        return
+    
+    buffer = asyncio.Queue(maxsize=size * 2)
+    done = object()
+    
+    async def read():
+        try:
+            async for track in tracks:
+                await buffer.put(track)
+        except Exception as e:
+            print(f"Error reading tracks: {e}")
+        finally:
+            if hasattr(tracks, 'aclose'):
+                await tracks.aclose()
+        await buffer.put(done)
+    
+    reader = asyncio.create_task(read())
+    try:
+        chunk = []
+        while True:
+            track = await buffer.get()
+            if track is done:
+                break
+            chunk.append(track)
+            # Hand over a chunk when it is full or the reader is waiting on the network
+            if len(chunk) >= size or buffer.empty():
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    finally:
+        reader.cancel()
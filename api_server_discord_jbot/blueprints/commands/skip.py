@@ -63,6 +63,8 @@ async def skip_track(bot, guild_id, channel_id):
         return {"success": False, "message": "Not connected to a voice channel"}
     
     if voice_client.is_playing() or voice_client.is_paused():
+        # Let play_next know this stop was intentional, not a failed stream
+        bot.manual_stops.add(queue_id)
         voice_client.stop()
         return {"success": True, "message": "⏭️ Skipped to next track"}
     else:
@@ -62,7 +62,7 @@ async def stop_playback(bot, guild_id, channel_id):
     bot.playlist_processing[queue_id] = True
     
     # Clear queue and stop playing
-    bot.music_queues[queue_id] = []
+    bot.music_queues[queue_id].clear()
     bot.currently_playing.pop(queue_id, None)
     
     if voice_client.is_playing() or voice_client.is_paused():
@@ -4,6 +4,9 @@ Handles Discord event callbacks
 """
 import types
 from .on_ready import on_ready
+from .on_guild_channel_delete import on_guild_channel_delete
+from .on_guild_join import on_guild_join
+from .on_guild_remove import on_guild_remove
 
 def apply(bot):
     """
@@ -13,4 +16,7 @@ def apply(bot):
         bot: The Discord bot instance
     """
     # Register event handlers
-    bot.on_ready = types.MethodType(on_ready, bot)
\ No newline at end of file
+    bot.on_ready = types.MethodType(on_ready, bot)
+    bot.on_guild_channel_delete = types.MethodType(on_guild_channel_delete, bot)
+    bot.on_guild_join = types.MethodType(on_guild_join, bot)
+    bot.on_guild_remove = types.MethodType(on_guild_remove, bot)
\ No newline at end of file
@@ -0,0 +1,26 @@
+"""
+Handler for channel deletion events
+"""
+import discord
+
+async def on_guild_channel_delete(self, channel):
+    """
+    Called when a channel is deleted in a guild the bot is in
+    
+    Drops the control panel of a deleted text channel and the queue state
+    of a deleted voice channel.
+    
+    Args:
+        channel (discord.abc.GuildChannel): Deleted channel
+    """
+    if self.control_panels.remove(channel.id) is not None:
+        self.panel_renderer.forget(channel.id)
+        print(f"Removed control panel for deleted channel {channel.id}")
+    
+    if isinstance(channel, (discord.VoiceChannel, discord.StageChannel)):
+        queue_id = self.get_queue_id(str(channel.guild.id), str(channel.id))
+        self.music_queues.pop(queue_id, None)
+        self.currently_playing.pop(queue_id, None)
+        self.playlist_processing.pop(queue_id, None)
+        self.stream_retries.pop(queue_id, None)
+
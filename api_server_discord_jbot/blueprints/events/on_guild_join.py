@@ -0,0 +1,19 @@
+"""
+Handler for the bot joining a guild
+"""
+
+async def on_guild_join(self, guild):
+    """
+    Called when the bot joins a guild
+    
+    Args:
+        guild (discord.Guild): Guild that was joined
+    """
+    print(f"Joined guild {guild.name} (ID: {guild.id})")
+    
+    # Make the slash commands available right away instead of on the next restart
+    if self.tree.get_commands():
+        try:
+            await self.command_sync.sync_guilds([guild])
+        except Exception as e:
+            print(f"Command sync failed for {guild.name}: {e}")
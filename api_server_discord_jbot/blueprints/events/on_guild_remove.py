@@ -0,0 +1,32 @@
+"""
+Handler for the bot leaving a guild
+"""
+
+async def on_guild_remove(self, guild):
+    """
+    Called when the bot leaves or is removed from a guild
+    
+    Args:
+        guild (discord.Guild): Guild that was left
+    """
+    for text_channel_id in self.control_panels.remove_guild(str(guild.id)):
+        self.panel_renderer.forget(text_channel_id)
+    
+    # Interrupt playlists still being added, add_tracks_to_queue drops the flag when it stops
+    prefix = f"{guild.id}_"
+    for queue_id in list(self.playlist_processing):
+        if queue_id.startswith(prefix):
+            self.playlist_processing[queue_id] = True
+    
+    # Drop the in-memory queue state, otherwise the next snapshot writes it back
+    for state in (self.music_queues, self.currently_playing, self.voice_connections, self.stream_retries):
+        for queue_id in [queue_id for queue_id in state if queue_id.startswith(prefix)]:
+            del state[queue_id]
+    self.manual_stops.difference_update({queue_id for queue_id in self.manual_stops if queue_id.startswith(prefix)})
+    
+    # Drop stored queues and panels that were never restored
+    if self.queue_store is not None:
+        self.queue_store.forget_guild(str(guild.id))
+    
+    # Sync again if the bot is ever re-added
+    self.command_sync.forget_guild(str(guild.id))
@@ -1,6 +1,7 @@
 """
 Handler for bot ready event
 """
+import asyncio
 
 async def on_ready(self):
     """
@@ -8,63 +9,53 @@ async def on_ready(self):
     """
     print(f"Bot is ready as {self.user.name} ({self.user.id})")
     
+    # Re-attach control panels from before the restart (queues restore on first use)
+    if self.queue_store is not None:
+        for guild in self.guilds:
+            _restore_panels(self, guild)
+    
     # Print all guilds the bot is in
     print(f"Bot is in {len(self.guilds)} guilds:")
     for guild in self.guilds:
         print(f"  • {guild.name} (ID: {guild.id})")
     
-    # Check if we have commands to sync
-    print(f"Commands available for sync: {len(self.tree.get_commands())}")
-    for cmd in self.tree.get_commands():
+    # Sync slash commands in the background, only to guilds whose commands changed
+    commands = self.tree.get_commands()
+    print(f"Commands available for sync: {len(commands)}")
+    for cmd in commands:
         print(f"  - {cmd.name}: {cmd.description}")
     
-    if len(self.tree.get_commands()) > 0:
-        print("Syncing slash commands to guilds...")
-        
-        # Try a different approach - sync to one guild first as a test
-        test_guild = self.guilds[0] if self.guilds else None
-        if test_guild:
-            print(f"Testing sync with guild: {test_guild.name}")
-            try:
-                # Clear any existing commands first
-                self.tree.clear_commands(guild=test_guild)
-                print("Cleared existing commands for test guild")
-                
-                # Copy commands to guild
-                self.tree.copy_global_to(guild=test_guild)
-                print("Copied global commands to test guild")
-                
-                # Now sync
-                synced = await self.tree.sync(guild=test_guild)
-                print(f"  🧪 TEST {test_guild.name}: {len(synced)} command(s)")
-                for cmd in synced:
-                    print(f"    - {cmd.name}")
-                
-                if len(synced) > 0:
-                    print("✅ SUCCESS! Test sync worked. Syncing to all guilds...")
-                    
-                    # Now sync to all guilds
-                    for guild in self.guilds[1:]:  # Skip the test guild
-                        try:
-                            self.tree.clear_commands(guild=guild)
-                            self.tree.copy_global_to(guild=guild)
-                            synced = await self.tree.sync(guild=guild)
-                            print(f"  ✅ {guild.name}: {len(synced)} command(s)")
-                        except Exception as e:
-                            print(f"  ❌ {guild.name}: Failed - {e}")
-                else:
-                    print("❌ Test sync failed - trying global sync instead")
-                    try:
-                        synced = await self.tree.sync()
-                        print(f"Global sync: {len(synced)} command(s) (will take up to 1 hour)")
-                    except Exception as e:
-                        print(f"Global sync failed: {e}")
-                        
-            except Exception as e:
-                print(f"Test sync failed: {e}")
-                import traceback
-                traceback.print_exc()
-        
-        print("Command sync process complete!")
+    if commands:
+        asyncio.create_task(_sync_commands(self))
     else:
-        print("No commands found in tree - skipping sync")
\ No newline at end of file
+        print("No commands found in tree - skipping sync")
+
+async def _sync_commands(bot):
+    """
+    Sync slash commands without delaying the rest of on_ready
+    
+    Args:
+        bot: The Discord bot instance
+    """
+    try:
+        await bot.command_sync.sync_guilds(bot.guilds)
+    except Exception as e:
+        print(f"Command sync failed: {e}")
+        import traceback
+        traceback.print_exc()
+
+def _restore_panels(bot, guild):
+    """
+    Register the stored control panels of a guild without fetching them
+    
+    Args:
+        bot: The Discord bot instance
+        guild (discord.Guild): Guild to restore panels for
+    """
+    for text_channel_id, queue_id, message_id in bot.queue_store.take_panels(guild.id):
+        channel = guild.get_channel(text_channel_id)
+        if channel is None or text_channel_id in bot.control_panels:
+            continue
+        
+        # Edits go straight to the old message; a deleted one is re-sent on NotFound
+        bot.control_panels.register(str(guild.id), text_channel_id, channel.get_partial_message(message_id), queue_id)
@@ -1,6 +1,7 @@
 """
 UI Components for Discord Bot
 """
+import types
 from .music_control_view import MusicControlView
 from ..modals import SearchModal, EnhancedURLModal
 
@@ -11,6 +12,13 @@ def register_components(bot):
     Args:
         bot: The Discord bot instance
     """
-    # This function can be expanded to register event listeners
-    # for interactions with components if needed
-    pass
\ No newline at end of file
+    bot.register_persistent_views = types.MethodType(register_persistent_views, bot)
+
+def register_persistent_views(self):
+    """
+    Register the control panel view once for every panel message
+    
+    Views need a running event loop, so this is called from setup_hook.
+    """
+    self.control_view = MusicControlView(self)
+    self.add_view(self.control_view)
\ No newline at end of file
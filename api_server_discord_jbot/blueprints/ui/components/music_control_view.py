@@ -13,12 +13,17 @@ from ..modals.enhanced_url_modal import EnhancedURLModal
 from ..helpers.playlist_help import show_playlist_help
 
 class MusicControlView(discord.ui.View):
-    def __init__(self, bot, guild_id, channel_id):
+    """
+    Buttons of the music control panel
+    
+    A single instance is registered with bot.add_view at startup and handles
+    the buttons of every panel message (and of panels sent before a restart),
+    so refreshing a panel only has to edit its embed. The guild and voice
+    channel are resolved per interaction from the panel registry.
+    """
+    def __init__(self, bot):
         super().__init__(timeout=None)
         self.bot = bot
-        self.guild_id = guild_id
-        self.channel_id = channel_id
-        self.queue_id = bot.get_queue_id(guild_id, channel_id)
 
         # Create a link button for web player
         web_player_button = discord.ui.Button(
@@ -29,15 +34,49 @@ class MusicControlView(discord.ui.View):
         )
         self.add_item(web_player_button)
 
+    def resolve_panel(self, interaction):
+        """
+        Find the guild and voice channel a panel belongs to
+        
+        Args:
+            interaction (discord.Interaction): Button interaction on a panel message
+            
+        Returns:
+            tuple: (guild ID, voice channel ID) as strings, or (None, None) if unknown
+        """
+        guild_id = str(interaction.guild_id)
+        
+        queue_id = self.bot.control_panels.queue_of(interaction.channel_id)
+        if queue_id is not None:
+            return guild_id, queue_id.split('_', 1)[1]
+        
+        # Panel not in the registry (e.g. never re-sent since a restart), use the bot's voice channel
+        voice_client = interaction.guild.voice_client if interaction.guild else None
+        if voice_client is not None and voice_client.channel is not None:
+            return guild_id, str(voice_client.channel.id)
+        return None, None
+
+    async def interaction_check(self, interaction):
+        # Help works everywhere, every other button needs to know its voice channel
+        if interaction.data.get('custom_id') == 'playlist_help':
+            return True
+        
+        if self.resolve_panel(interaction)[1] is None:
+            await interaction.response.send_message("This control panel is no longer active. Use !join to get a new one.", ephemeral=True, delete_after=10)
+            return False
+        return True
+
     @discord.ui.button(label="Search", style=discord.ButtonStyle.secondary, emoji="🔍", custom_id="search", row=2)
     async def search_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        guild_id, channel_id = self.resolve_panel(interaction)
         # Send the search modal
-        await interaction.response.send_modal(SearchModal(self.bot, self.guild_id, self.channel_id))
+        await interaction.response.send_modal(SearchModal(self.bot, guild_id, channel_id))
     
     @discord.ui.button(label="Add URL", style=discord.ButtonStyle.secondary, emoji="🔗", custom_id="add_url", row=2)
     async def add_url_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        guild_id, channel_id = self.resolve_panel(interaction)
         # Send the enhanced URL modal
-        await interaction.response.send_modal(EnhancedURLModal(self.bot, self.guild_id, self.channel_id))
+        await interaction.response.send_modal(EnhancedURLModal(self.bot, guild_id, channel_id))
     
     @discord.ui.button(label="?", style=discord.ButtonStyle.secondary, emoji="❓", custom_id="playlist_help", row=2)
     async def playlist_help_button(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -45,81 +84,86 @@ class MusicControlView(discord.ui.View):
     
     @discord.ui.button(label="Play/Pause", style=discord.ButtonStyle.primary, emoji="⏯️", custom_id="play_pause")
     async def play_pause_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        guild_id, channel_id = self.resolve_panel(interaction)
         await interaction.response.defer()
         
         # Check if user is in the same voice channel
-        if not await check_same_voice_channel(self.bot, interaction.user, self.channel_id):
+        if not await check_same_voice_channel(self.bot, interaction.user, channel_id):
             message = await interaction.followup.send("You need to be in the same voice channel to use this control.", ephemeral=True)
             await message.delete(delay=10)
             return
         
         # Use the shared toggle play/pause method
-        result = await toggle_playback(self.bot, self.guild_id, self.channel_id)
+        result = await toggle_playback(self.bot, guild_id, channel_id)
         message = await interaction.followup.send(result["message"], ephemeral=True)
         await message.delete(delay=10)
         
         # Update the control panel
-        await self.bot.update_control_panel(self.guild_id, self.channel_id)
+        await self.bot.update_control_panel(guild_id, channel_id)
     
     @discord.ui.button(label="Skip", style=discord.ButtonStyle.primary, emoji="⏭️", custom_id="skip")
     async def skip_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        guild_id, channel_id = self.resolve_panel(interaction)
         await interaction.response.defer()
         
         # Check if user is in the same voice channel
-        if not await check_same_voice_channel(self.bot, interaction.user, self.channel_id):
+        if not await check_same_voice_channel(self.bot, interaction.user, channel_id):
             message = await interaction.followup.send("You need to be in the same voice channel to use this control.", ephemeral=True)
             await message.delete(delay=10)
             return
         
         # Use the shared skip method
-        result = await skip_track(self.bot, self.guild_id, self.channel_id)
+        result = await skip_track(self.bot, guild_id, channel_id)
         message = await interaction.followup.send(result["message"], ephemeral=True)
         await message.delete(delay=10)
     
     @discord.ui.button(label="Stop", style=discord.ButtonStyle.danger, emoji="⏹️", custom_id="stop")
     async def stop_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        guild_id, channel_id = self.resolve_panel(interaction)
         await interaction.response.defer()
         
         # Check if user is in the same voice channel
-        if not await check_same_voice_channel(self.bot, interaction.user, self.channel_id):
+        if not await check_same_voice_channel(self.bot, interaction.user, channel_id):
             message = await interaction.followup.send("You need to be in the same voice channel to use this control.", ephemeral=True)
             await message.delete(delay=10)
             return
         
         # Set the interruption flag for any ongoing playlist additions
-        queue_id = self.bot.get_queue_id(self.guild_id, self.channel_id)
+        queue_id = self.bot.get_queue_id(guild_id, channel_id)
         self.bot.playlist_processing[queue_id] = True
         
         # Use the shared stop method
-        result = await stop_playback(self.bot, self.guild_id, self.channel_id)
+        result = await stop_playback(self.bot, guild_id, channel_id)
         message = await interaction.followup.send(result["message"], ephemeral=True)
         await message.delete(delay=10)
         
         # Update the control panel
-        await self.bot.update_control_panel(self.guild_id, self.channel_id)
+        await self.bot.update_control_panel(guild_id, channel_id)
     
     @discord.ui.button(label="Shuffle", style=discord.ButtonStyle.secondary, emoji="🔀", custom_id="shuffle", row=1)
     async def shuffle_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        guild_id, channel_id = self.resolve_panel(interaction)
         await interaction.response.defer()
         
         # Check if user is in the same voice channel
-        if not await check_same_voice_channel(self.bot, interaction.user, self.channel_id):
+        if not await check_same_voice_channel(self.bot, interaction.user, channel_id):
             message = await interaction.followup.send("You need to be in the same voice channel to use this control.", ephemeral=True)
             await message.delete(delay=10)
             return
         
         # Use the shared shuffle method
-        result = await shuffle_queue(self.bot, self.guild_id, self.channel_id)
+        result = await shuffle_queue(self.bot, guild_id, channel_id)
         
         # Send response that will auto-delete after 10 seconds
         message = await interaction.followup.send(result["message"])
         await message.delete(delay=10)
         
         # Update the control panel to show the new queue order
-        await self.bot.update_control_panel(self.guild_id, self.channel_id)
+        await self.bot.update_control_panel(guild_id, channel_id)
 
     @discord.ui.button(label="Follow VC", style=discord.ButtonStyle.secondary, emoji="👣", custom_id="follow_vc", row=1)
     async def follow_vc_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        guild_id, channel_id = self.resolve_panel(interaction)
         await interaction.response.defer()
         
         # Check if user is in a voice channel, but not necessarily the same one
@@ -132,7 +176,7 @@ class MusicControlView(discord.ui.View):
         new_voice_channel = interaction.user.voice.channel
         
         # If user is already in the same voice channel as the bot, no need to move
-        if str(new_voice_channel.id) == self.channel_id:
+        if str(new_voice_channel.id) == channel_id:
             message = await interaction.followup.send("I'm already in your voice channel!", ephemeral=True)
             await message.delete(delay=10)
             return
@@ -140,8 +184,8 @@ class MusicControlView(discord.ui.View):
         # Use the shared follow voice channel method
         result = await follow_to_voice_channel(
             self.bot,
-            self.guild_id,
-            self.channel_id,  # Current voice channel
+            guild_id,
+            channel_id,  # Current voice channel
             str(new_voice_channel.id),  # New voice channel
             interaction.user
         )
@@ -151,31 +195,30 @@ class MusicControlView(discord.ui.View):
 
     @discord.ui.button(label="Disconnect", style=discord.ButtonStyle.secondary, emoji="👋", custom_id="disconnect", row=1)
     async def disconnect_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        guild_id, channel_id = self.resolve_panel(interaction)
         await interaction.response.defer()
         
         # Check if user is in the same voice channel
-        if not await check_same_voice_channel(self.bot, interaction.user, self.channel_id):
+        if not await check_same_voice_channel(self.bot, interaction.user, channel_id):
             message = await interaction.followup.send("You need to be in the same voice channel to use this control.", ephemeral=True)
             await message.delete(delay=10)
             return
         
         # Set the interruption flag for any ongoing playlist additions
-        queue_id = self.bot.get_queue_id(self.guild_id, self.channel_id)
+        queue_id = self.bot.get_queue_id(guild_id, channel_id)
         self.bot.playlist_processing[queue_id] = True
         
         # Use the shared disconnect method
-        result = await disconnect_from_voice(self.bot, self.guild_id, self.channel_id, preserve_queue=True)
+        result = await disconnect_from_voice(self.bot, guild_id, channel_id, preserve_queue=True)
         message = await interaction.followup.send(result["message"], ephemeral=True)
         await message.delete(delay=10)
         
         # Delete the control panel message
         try:
             channel = interaction.channel
-            if channel.id in self.bot.control_panels:
-                message_id = self.bot.control_panels[channel.id]
-                message = await channel.fetch_message(message_id)
+            message = self.bot.control_panels.remove(channel.id)
+            self.bot.panel_renderer.forget(channel.id)
+            if message is not None:
                 await message.delete()
-                # Remove from control panels dictionary
-                self.bot.control_panels.pop(channel.id, None)
         except Exception as e:
             print(f"Error removing control panel: {e}")
\ No newline at end of file
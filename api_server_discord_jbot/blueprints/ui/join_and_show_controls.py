@@ -22,7 +22,7 @@ async def join_and_show_controls(self, text_channel, voice_channel, guild_id):
                 if existing_queue_id != queue_id and queue_id in self.currently_playing:
                     current_track = self.currently_playing.get(queue_id)
                     if current_track:
-                        self.music_queues[queue_id].insert(0, current_track)
+                        self.music_queues[queue_id].appendleft(current_track)
                 
                 await voice_client.disconnect(force=True)
                 self.voice_connections.pop(existing_queue_id, None)
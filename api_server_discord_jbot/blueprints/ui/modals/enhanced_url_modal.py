@@ -1,34 +1,59 @@
 """
 Enhanced URL Modal for adding songs and playlists - Single input with dynamic playlist selection
 """
-import os
 import discord
 import re
 import asyncio
-from api_client_youtube.__main__ import ClientYouTube
 
-# Get API key for services
-YOUTUBE_API_KEY = os.environ.get('YOUTUBE_API_KEY')
+# Playlist entries fetched up front for the selection preview
+PREVIEW_TRACKS = 5
 
-# Initialize shared YouTube client
-youtube_service = ClientYouTube(api_key=YOUTUBE_API_KEY)
+# Without an API key the playlist size is unknown, so the preview reads up to
+# the largest selection instead (one yt-dlp page) and offers those tracks
+KEYLESS_PREVIEW_TRACKS = 100
+
+
+async def stream_selection(youtube_client, playlist_id, selected_indices):
+    """
+    Stream the selected entries of a playlist
+    
+    Only the range between the first and last selected index is read, so
+    pages outside the selection are never fetched in full.
+    
+    Args:
+        youtube_client: YouTube client with iter_playlist
+        playlist_id (str): YouTube playlist ID
+        selected_indices (list): Sorted 0-based playlist positions
+        
+    Yields:
+        dict: Selected video with id, title, channel and position
+    """
+    if not selected_indices:
+        return
+    
+    wanted = set(selected_indices)
+    async for video in youtube_client.iter_playlist(playlist_id, selected_indices[0], selected_indices[-1] + 1):
+        if video['position'] in wanted:
+            yield video
 
 class PlaylistSelectionView(discord.ui.View):
     """View for playlist selection after detecting a playlist URL"""
     
-    def __init__(self, bot, guild_id, channel_id, playlist_info, entries):
+    def __init__(self, bot, guild_id, channel_id, playlist_info, entries, playlist_length=None):
         super().__init__(timeout=300)  # 5 minute timeout
         self.bot = bot
         self.guild_id = guild_id
         self.channel_id = channel_id
         self.playlist_info = playlist_info
         self.entries = entries
+        # Streamed playlists only hold a preview in entries, the selection is fetched later
+        self.playlist_length = playlist_length if playlist_length is not None else len(entries)
         
         # Add dropdown for quick selection
         self.add_quick_select_dropdown()
         
         # Add custom input for advanced selection
-        self.add_item(CustomSelectionButton(bot, guild_id, channel_id, playlist_info, entries))
+        self.add_item(CustomSelectionButton(bot, guild_id, channel_id, playlist_info, entries, self.playlist_length))
     
     def add_quick_select_dropdown(self):
         """Add dropdown for common playlist selection options"""
@@ -39,7 +64,7 @@ class PlaylistSelectionView(discord.ui.View):
             custom_id="playlist_quick_select"
         )
         
-        playlist_length = len(self.entries)
+        playlist_length = self.playlist_length
         
         # Add common options
         options = [
@@ -87,22 +112,22 @@ class PlaylistSelectionView(discord.ui.View):
         try:
             # Parse selection
             if selection == "all":
-                selected_indices = list(range(len(self.entries)))
+                selected_indices = list(range(self.playlist_length))
             elif selection.startswith("random-"):
                 import random
                 count = int(selection.split("-")[1])
-                selected_indices = random.sample(range(len(self.entries)), min(count, len(self.entries)))
+                selected_indices = random.sample(range(self.playlist_length), min(count, self.playlist_length))
                 selected_indices.sort()
             elif "-" in selection:
                 start, end = map(int, selection.split("-"))
-                selected_indices = list(range(start - 1, min(end, len(self.entries))))
+                selected_indices = list(range(start - 1, min(end, self.playlist_length)))
             else:
                 # Fallback - treat as single number
                 try:
                     index = int(selection) - 1
-                    selected_indices = [index] if 0 <= index < len(self.entries) else []
+                    selected_indices = [index] if 0 <= index < self.playlist_length else []
                 except:
-                    selected_indices = list(range(len(self.entries)))
+                    selected_indices = list(range(self.playlist_length))
             
             # Limit to prevent abuse
             max_tracks = 100
@@ -112,8 +137,8 @@ class PlaylistSelectionView(discord.ui.View):
             # Create selection summary
             if len(selected_indices) == 1:
                 selection_summary = f"track #{selected_indices[0]+1}"
-            elif len(selected_indices) == len(self.entries):
-                selection_summary = f"all {len(self.entries)} tracks"
+            elif len(selected_indices) == self.playlist_length:
+                selection_summary = f"all {self.playlist_length} tracks"
             else:
                 selection_summary = f"{len(selected_indices)} selected tracks"
             
@@ -156,60 +181,36 @@ class PlaylistSelectionView(discord.ui.View):
     
     async def add_tracks_to_queue(self, selected_indices, playlist_title, interaction):
         """Add selected tracks to the queue"""
-        queue_id = self.bot.get_queue_id(self.guild_id, self.channel_id)
-        self.bot.playlist_processing[queue_id] = False
-        
-        added_count = 0
-        failed_count = 0
-        batch_size = 10
         total_selected = len(selected_indices)
         
         try:
-            for i in range(0, len(selected_indices), batch_size):
-                # Check if processing was interrupted
-                if self.bot.playlist_processing.get(queue_id, False):
-                    break
-                
-                batch_indices = selected_indices[i:i + batch_size]
-                
-                # Process batch
-                for idx in batch_indices:
-                    if self.bot.playlist_processing.get(queue_id, False):
-                        break
-                        
-                    if 0 <= idx < len(self.entries):
-                        entry = self.entries[idx]
-                        try:
-                            queue_result = await self.bot.add_to_queue(
-                                self.guild_id, 
-                                self.channel_id, 
-                                entry['id'], 
-                                entry['title']
-                            )
-                            
-                            if queue_result['success']:
-                                added_count += 1
-                            else:
-                                failed_count += 1
-                        except Exception as e:
-                            print(f"Error adding track {entry.get('title', 'Unknown')}: {e}")
-                            failed_count += 1
-                
-                # Update progress every batch
-                progress = min(i + batch_size, total_selected)
-                if progress < total_selected and not self.bot.playlist_processing.get(queue_id, False):
-                    try:
-                        embed = discord.Embed(
-                            title="🔄 Processing Playlist",
-                            description=f"**{playlist_title}**\nProgress: {progress}/{total_selected} tracks...",
-                            color=discord.Color.orange()
-                        )
-                        await interaction.edit_original_response(embed=embed)
-                    except:
-                        pass
-            
-            # Clean up processing flag
-            self.bot.playlist_processing.pop(queue_id, None)
+            if self.playlist_length > len(self.entries):
+                # Stream only the pages covering the selection
+                tracks = stream_selection(self.bot.youtube_client, self.playlist_info['id'], selected_indices)
+            else:
+                tracks = [self.entries[idx] for idx in selected_indices if 0 <= idx < len(self.entries)]
+            
+            # Edit the selection message with progress, throttled by the bulk enqueue
+            async def report_progress(done, total):
+                embed = discord.Embed(
+                    title="🔄 Processing Playlist",
+                    description=f"**{playlist_title}**\nProgress: {done}/{total} tracks...",
+                    color=discord.Color.orange()
+                )
+                await interaction.edit_original_response(embed=embed)
+            
+            queue_result = await self.bot.add_tracks_to_queue(
+                self.guild_id,
+                self.channel_id,
+                tracks,
+                on_progress=report_progress,
+                total=total_selected
+            )
+            added_count = queue_result['added']
+            failed_count = queue_result['failed']
+            if not queue_result.get('interrupted'):
+                # Selected tracks that were unavailable or missing from the playlist
+                failed_count = max(failed_count, total_selected - added_count)
             
             # Create final result embed
             embed = discord.Embed(
@@ -222,7 +223,7 @@ class PlaylistSelectionView(discord.ui.View):
                 result_text += f"✅ Added {added_count} tracks\n"
             if failed_count > 0:
                 result_text += f"❌ Failed to add {failed_count} tracks\n"
-            if self.bot.playlist_processing.get(queue_id, False):
+            if queue_result.get('interrupted'):
                 result_text += "⏹️ Process interrupted"
             
             embed.description = result_text
@@ -275,12 +276,11 @@ class PlaylistSelectionView(discord.ui.View):
             )
             
             # Update all control panels with DJ-ing message and no buttons
-            for text_channel_id, message_id in list(self.bot.control_panels.items()):
+            for text_channel_id, message in self.bot.control_panels.for_guild(self.guild_id):
                 try:
-                    text_channel = guild.get_channel(text_channel_id)
-                    if text_channel:
-                        message = await text_channel.fetch_message(message_id)
-                        await message.edit(embed=embed, view=None)
+                    await message.edit(embed=embed, view=None)
+                    # The panel no longer shows the rendered state
+                    self.bot.panel_renderer.forget(text_channel_id)
                 except Exception as e:
                     print(f"Error updating control panel to DJ mode: {e}")
                     
@@ -291,7 +291,7 @@ class PlaylistSelectionView(discord.ui.View):
         """Restore the main control panel with all buttons"""
         try:
             # Update the control panel to show current state with buttons restored
-            await self.bot.update_control_panel(self.guild_id, self.channel_id)
+            await self.bot.update_control_panel(self.guild_id, self.channel_id, flush=True)
         except Exception as e:
             print(f"Error restoring main control panel: {e}")
 
@@ -299,7 +299,7 @@ class PlaylistSelectionView(discord.ui.View):
 class CustomSelectionButton(discord.ui.Button):
     """Button to open custom selection modal"""
     
-    def __init__(self, bot, guild_id, channel_id, playlist_info, entries):
+    def __init__(self, bot, guild_id, channel_id, playlist_info, entries, playlist_length=None):
         super().__init__(
             label="Custom Selection",
             style=discord.ButtonStyle.secondary,
@@ -310,12 +310,13 @@ class CustomSelectionButton(discord.ui.Button):
         self.channel_id = channel_id
         self.playlist_info = playlist_info
         self.entries = entries
+        self.playlist_length = playlist_length
     
     async def callback(self, interaction):
         # Show custom selection modal
         custom_modal = CustomPlaylistSelectionModal(
             self.bot, self.guild_id, self.channel_id, 
-            self.playlist_info, self.entries
+            self.playlist_info, self.entries, self.playlist_length
         )
         await interaction.response.send_modal(custom_modal)
 
@@ -323,13 +324,14 @@ class CustomSelectionButton(discord.ui.Button):
 class CustomPlaylistSelectionModal(discord.ui.Modal):
     """Modal for custom playlist selection input"""
     
-    def __init__(self, bot, guild_id, channel_id, playlist_info, entries):
+    def __init__(self, bot, guild_id, channel_id, playlist_info, entries, playlist_length=None):
         super().__init__(title="Custom Playlist Selection")
         self.bot = bot
         self.guild_id = guild_id
         self.channel_id = channel_id
         self.playlist_info = playlist_info
         self.entries = entries
+        self.playlist_length = playlist_length if playlist_length is not None else len(entries)
         
         self.selection_input = discord.ui.TextInput(
             label="Track Selection",
@@ -380,7 +382,7 @@ class CustomPlaylistSelectionModal(discord.ui.Modal):
         await interaction.response.defer()
         
         try:
-            selected_indices = self.parse_selection(self.selection_input.value, len(self.entries))
+            selected_indices = self.parse_selection(self.selection_input.value, self.playlist_length)
             
             # Limit selection
             max_tracks = 100
@@ -399,8 +401,8 @@ class CustomPlaylistSelectionModal(discord.ui.Modal):
             # Create selection summary
             if len(selected_indices) == 1:
                 selection_summary = f"track #{selected_indices[0]+1}"
-            elif len(selected_indices) == len(self.entries):
-                selection_summary = f"all {len(self.entries)} tracks"
+            elif len(selected_indices) == self.playlist_length:
+                selection_summary = f"all {self.playlist_length} tracks"
             else:
                 selection_summary = f"{len(selected_indices)} selected tracks"
             
@@ -418,7 +420,7 @@ class CustomPlaylistSelectionModal(discord.ui.Modal):
             # Create a view to process the selection
             view = PlaylistSelectionView(
                 self.bot, self.guild_id, self.channel_id,
-                self.playlist_info, self.entries
+                self.playlist_info, self.entries, self.playlist_length
             )
             
             # Disable main control panel during processing
@@ -440,7 +442,7 @@ class CustomPlaylistSelectionModal(discord.ui.Modal):
             try:
                 view = PlaylistSelectionView(
                     self.bot, self.guild_id, self.channel_id,
-                    self.playlist_info, self.entries
+                    self.playlist_info, self.entries, self.playlist_length
                 )
                 await view.restore_main_control_panel()
             except:
@@ -543,8 +545,20 @@ class EnhancedURLModal(discord.ui.Modal):
             # Disable main control panel during processing
             await self.disable_main_control_panel("🔄 Analyzing URL...")
             
+            # Lookups made for this URL are queued under this guild
+            self.bot.youtube_client.scheduler.bind_guild(interaction.guild_id)
+            
+            # Playlists are previewed from their details and first entries,
+            # the selected tracks are streamed once the user has chosen
+            playlist_id = self.bot.youtube_client.extract_playlist_id(url)
+            if playlist_id:
+                result = await self.preview_playlist(playlist_id)
+                if result:
+                    await self.handle_playlist(interaction, result)
+                    return
+            
             # Process URL
-            result = await youtube_service.process_youtube_url(url)
+            result = await self.bot.youtube_client.process_youtube_url(url)
             
             if not result:
                 await self.restore_main_control_panel()
@@ -583,7 +597,9 @@ class EnhancedURLModal(discord.ui.Modal):
                 self.guild_id, 
                 self.channel_id, 
                 video_info['id'], 
-                video_info['title']
+                video_info['title'],
+                channel=video_info.get('channel'),
+                duration=video_info.get('duration')
             )
             
             if queue_result['success']:
@@ -614,11 +630,45 @@ class EnhancedURLModal(discord.ui.Modal):
                 ephemeral=True
             )
 
+    async def preview_playlist(self, playlist_id):
+        """
+        Get playlist details and the first entries without extracting the whole playlist
+        
+        Returns:
+            dict: Playlist result with a playlist_length, or None if the playlist
+                  cannot be read this way (e.g. mixes the API cannot page through)
+        """
+        youtube_client = self.bot.youtube_client
+        try:
+            details = await youtube_client.get_playlist_details(playlist_id)
+            video_count = details.get('video_count')
+            if youtube_client.api_key and not video_count:
+                return None
+            
+            # The user is waiting on the preview, so it is not queued behind playlist paging
+            entries = [
+                video async for video in
+                youtube_client.iter_playlist(playlist_id, stop=PREVIEW_TRACKS if video_count else KEYLESS_PREVIEW_TRACKS, lane='interactive')
+            ]
+            if not entries:
+                return None
+            
+            return {
+                'type': 'playlist',
+                'info': details,
+                'entries': entries,
+                'playlist_length': video_count or len(entries)
+            }
+        except Exception as e:
+            print(f"Error previewing playlist {playlist_id}: {e}")
+            return None
+
     async def handle_playlist(self, interaction, result):
         """Handle playlist URL - show selection interface"""
         try:
             playlist_info = result['info']
             entries = result['entries']
+            playlist_length = result.get('playlist_length', len(entries))
             
             if not entries:
                 await self.restore_main_control_panel()
@@ -636,7 +686,7 @@ class EnhancedURLModal(discord.ui.Modal):
             
             embed = discord.Embed(
                 title="🎵 Playlist Detected",
-                description=f"**{playlist_title}**\n\n📊 Contains **{len(entries)}** tracks\n\nHow many tracks would you like to add?",
+                description=f"**{playlist_title}**\n\n📊 Contains **{playlist_length}** tracks\n\nHow many tracks would you like to add?",
                 color=discord.Color.blue()
             )
             
@@ -658,7 +708,7 @@ class EnhancedURLModal(discord.ui.Modal):
             # Create selection view
             view = PlaylistSelectionView(
                 self.bot, self.guild_id, self.channel_id,
-                playlist_info, entries
+                playlist_info, entries, playlist_length
             )
             
             # Send as followup message
@@ -687,12 +737,11 @@ class EnhancedURLModal(discord.ui.Modal):
             )
             
             # Update all control panels with DJ-ing message and no buttons
-            for text_channel_id, message_id in list(self.bot.control_panels.items()):
+            for text_channel_id, message in self.bot.control_panels.for_guild(self.guild_id):
                 try:
-                    text_channel = guild.get_channel(text_channel_id)
-                    if text_channel:
-                        message = await text_channel.fetch_message(message_id)
-                        await message.edit(embed=embed, view=None)
+                    await message.edit(embed=embed, view=None)
+                    # The panel no longer shows the rendered state
+                    self.bot.panel_renderer.forget(text_channel_id)
                 except Exception as e:
                     print(f"Error updating control panel to DJ mode: {e}")
                     
@@ -703,6 +752,6 @@ class EnhancedURLModal(discord.ui.Modal):
         """Restore the main control panel with all buttons"""
         try:
             # Update the control panel to show current state with buttons restored
-            await self.bot.update_control_panel(self.guild_id, self.channel_id)
+            await self.bot.update_control_panel(self.guild_id, self.channel_id, flush=True)
         except Exception as e:
             print(f"Error restoring main control panel: {e}")
\ No newline at end of file
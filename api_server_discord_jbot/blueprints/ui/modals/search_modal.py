@@ -1,15 +1,7 @@
 """
 Search Modal for the Discord Bot
 """
-import os
 import discord
-from api_client_youtube.__main__ import ClientYouTube
-
-# Get API key for services
-YOUTUBE_API_KEY = os.environ.get('YOUTUBE_API_KEY')
-
-# Initialize shared services
-youtube_service = ClientYouTube(api_key=YOUTUBE_API_KEY)
 
 class SearchModal(discord.ui.Modal):
     def __init__(self, bot, guild_id, channel_id):
@@ -38,9 +30,10 @@ class SearchModal(discord.ui.Modal):
             return
         
         # Use the shared MusicService for search
+        self.bot.youtube_client.scheduler.bind_guild(modal_interaction.guild_id)
         try:
             # Use optimized search instead of direct yt-dlp
-            results = await youtube_service.search_videos(self.query.value)
+            results = await self.bot.youtube_client.search_videos(self.query.value)
             
             if not results:
                 message = await modal_interaction.followup.send(f"No results found for: {self.query.value}", ephemeral=True)
@@ -135,7 +128,9 @@ class SearchModal(discord.ui.Modal):
                     self.guild_id, 
                     self.channel_id, 
                     selected_track['id'], 
-                    selected_track['title']
+                    selected_track['title'],
+                    channel=selected_track.get('channel'),
+                    duration=selected_track.get('duration')
                 )
                 
                 # Confirm selection
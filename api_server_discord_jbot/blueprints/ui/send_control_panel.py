@@ -1,8 +1,8 @@
 """
 Function to send a control panel to a text channel
 """
+import json
 import discord
-from .components.music_control_view import MusicControlView
 
 async def send_control_panel(self, text_channel, voice_channel, guild_id):
     """
@@ -23,13 +23,14 @@ async def send_control_panel(self, text_channel, voice_channel, guild_id):
     )
     
     # Add queue info if there are songs
-    if self.music_queues[queue_id]:
+    queue = self.music_queues[queue_id]
+    if queue:
         queue_text = "\n".join(
-            f"{i+1}. {track['title']}" 
-            for i, track in enumerate(self.music_queues[queue_id][:5])
+            f"{i+1}. {track.title}" + (f" `{track.duration_str}`" if track.duration else "")
+            for i, track in enumerate(queue.peek(5))
         )
-        if len(self.music_queues[queue_id]) > 5:
-            queue_text += f"\n... and {len(self.music_queues[queue_id]) - 5} more"
+        if len(queue) > 5:
+            queue_text += f"\n... and {len(queue) - 5} more"
         embed.add_field(name="Queue", value=queue_text or "Empty", inline=False)
     else:
         embed.add_field(name="Queue", value="Empty", inline=False)
@@ -39,24 +40,38 @@ async def send_control_panel(self, text_channel, voice_channel, guild_id):
     if current_track:
         embed.add_field(
             name="Now Playing",
-            value=f"[{current_track['title']}](https://www.youtube.com/watch?v={current_track['id']})",
+            value=f"[{current_track.title}]({current_track.url})",
             inline=False
         )
     
-    # Create view with buttons
-    view = MusicControlView(self, guild_id, str(voice_channel.id))
+    # Skip the edit if the panel already shows exactly this state
+    digest = hash((voice_channel.id, json.dumps(embed.to_dict(), sort_keys=True)))
+    if text_channel.id in self.control_panels and self.panel_renderer.is_unchanged(text_channel.id, digest):
+        return
     
     # Send or update the control panel
-    if text_channel.id in self.control_panels:
+    existing_message = self.control_panels.get(text_channel.id)
+    if existing_message is not None:
         try:
-            # Try to edit existing message
-            existing_message = await text_channel.fetch_message(self.control_panels[text_channel.id])
-            await existing_message.edit(embed=embed, view=view)
+            # Edit the stored message handle directly, no fetch needed. The
+            # buttons are routed by the persistent view, so they are only
+            # re-attached when the panel lost them (DJ mode, restored panels)
+            if self.panel_renderer.is_rendered(text_channel.id):
+                await existing_message.edit(embed=embed)
+            else:
+                await existing_message.edit(embed=embed, view=self.control_view)
+            self.control_panels.bind(text_channel.id, queue_id)
+            self.panel_renderer.remember(text_channel.id, digest)
+            return
+        except discord.NotFound:
+            # Message was deleted, send a new one
+            self.control_panels.remove(text_channel.id)
+            self.panel_renderer.forget(text_channel.id)
+        except discord.HTTPException as e:
+            print(f"Error editing control panel: {e}")
             return
-        except (discord.NotFound, discord.HTTPException):
-            # Message doesn't exist anymore, send a new one
-            pass
     
     # Send new control panel
-    message = await text_channel.send(embed=embed, view=view)
-    self.control_panels[text_channel.id] = message.id
\ No newline at end of file
+    message = await text_channel.send(embed=embed, view=self.control_view)
+    self.control_panels.register(guild_id, text_channel.id, message, queue_id)
+    self.panel_renderer.remember(text_channel.id, digest)
\ No newline at end of file
@@ -2,33 +2,44 @@
 Function to update control panels for a guild/channel
 """
 
-async def update_control_panel(self, guild_id, channel_id):
+async def update_control_panel(self, guild_id, channel_id, flush=False):
     """
-    Update all control panels for a guild/channel
+    Schedule an update of all control panels for a guild/channel
+    
+    Updates are coalesced by the bot's panel renderer, so a burst of queue
+    changes (e.g. adding a playlist) results in a single edit per panel.
     
     Args:
         guild_id (str): Discord guild ID
         channel_id (str): Discord channel ID
+        flush (bool, optional): Render immediately and wait for the edits to finish
     """
-    queue_id = self.get_queue_id(guild_id, channel_id)
-    
     # Find text channels with control panels for this guild
     guild = self.get_guild(int(guild_id))
     if not guild:
         return
     
-    # Update all control panels in this guild
-    for text_channel_id, message_id in list(self.control_panels.items()):
-        try:
-            text_channel = guild.get_channel(text_channel_id)
-            if not text_channel:
-                continue
-            
-            voice_channel = guild.get_channel(int(channel_id))
-            if not voice_channel:
-                continue
-            
-            # Update the control panel
-            await self.send_control_panel(text_channel, voice_channel, guild_id)
-        except Exception as e:
-            print(f"Error updating control panel: {e}")
\ No newline at end of file
+    voice_channel = guild.get_channel(int(channel_id))
+    if not voice_channel:
+        return
+    
+    # Only panels bound to this queue need updating. If none are, the bot
+    # has moved to this channel and the guild's panels follow it.
+    queue_id = self.get_queue_id(guild_id, channel_id)
+    panels = self.control_panels.for_queue(queue_id) or self.control_panels.for_guild(guild_id)
+    
+    # Mark the panels dirty
+    scheduled = []
+    for text_channel_id, _ in panels:
+        text_channel = guild.get_channel(text_channel_id)
+        if not text_channel:
+            continue
+        
+        self.panel_renderer.mark_dirty(
+            text_channel_id,
+            lambda text_channel=text_channel: self.send_control_panel(text_channel, voice_channel, guild_id)
+        )
+        scheduled.append(text_channel_id)
+    
+    if flush and scheduled:
+        await self.panel_renderer.flush(*scheduled)
@@ -2,5 +2,11 @@
 Core module initialization for Discord Bot
 """
 from .bot import JBotDiscord
+from .track import Track
+from .track_queue import TrackQueue
+from .queue_store import QueueStore, QueueMap
+from .panel_scheduler import PanelRenderScheduler
+from .panel_registry import PanelRegistry
+from .command_sync import CommandSyncManager
 
-__all__ = ['JBotDiscord']
\ No newline at end of file
+__all__ = ['JBotDiscord', 'Track', 'TrackQueue', 'QueueStore', 'QueueMap', 'PanelRenderScheduler', 'PanelRegistry', 'CommandSyncManager']
\ No newline at end of file
@@ -1,11 +1,15 @@
 """
 Core Discord bot class
 """
+import asyncio
 import os
-from collections import defaultdict
-import discord
 from discord.ext import commands
 
+from .queue_store import QueueStore, QueueMap
+from .panel_scheduler import PanelRenderScheduler
+from .panel_registry import PanelRegistry
+from .command_sync import CommandSyncManager
+
 # Import blueprint registration
 from ..blueprints import (
     commands_blueprint,
@@ -35,23 +39,116 @@ class JBotDiscord(commands.Bot):
         # Initialize API server attribute
         self.api_server = None
         
-        # Initialize YouTube client
-        self.youtube_client = ClientYouTube(
-            api_key=os.environ.get('YOUTUBE_API_KEY')
-        )
+        # YouTube client shared by commands, modals and the API server, created on first use
+        self._youtube_client = None
+        self._warmup_task = None
+        
+        # Queue and control panel state survives restarts when QUEUE_STORE_DB is set
+        self.queue_store = self._create_queue_store()
         
         # Music queue management
-        self.music_queues = defaultdict(list)  # Queue ID -> list of tracks
+        self.music_queues = QueueMap(self.queue_store)  # Queue ID -> TrackQueue, restored lazily
         self.currently_playing = {}  # Queue ID -> current track info
         self.voice_connections = {}  # Queue ID -> voice client
+        self.manual_stops = set()  # Queue IDs whose current track was stopped on purpose
+        self.stream_retries = {}  # Queue ID -> video ID already retried after a failed stream
         
         # UI and control panel tracking
-        self.control_panels = {}  # Channel ID -> Message ID
+        self.control_panels = PanelRegistry()  # Text channel ID -> panel message, indexed by guild and queue
         self.playlist_processing = {}  # Queue ID -> boolean flag to interrupt playlist processing
+        self.panel_renderer = PanelRenderScheduler(
+            delay=float(os.environ.get('PANEL_RENDER_DELAY', 0.75))
+        )
+        
+        # Slash command sync, skipped for guilds that already have the current commands
+        self.command_sync = CommandSyncManager(
+            self.tree,
+            state_path=os.environ.get('COMMAND_SYNC_STATE'),
+            concurrency=int(os.environ.get('COMMAND_SYNC_CONCURRENCY', 4))
+        )
         
         # Message auto-deletion time (in seconds)
         self.cleartimer = 10
     
+    async def setup_hook(self):
+        """
+        Called once before the bot connects to Discord
+        
+        Opens the YouTube client's shared HTTP session up front so the
+        first search does not pay for the connection pool setup
+        """
+        await self.youtube_client.get_session()
+        
+        # Load yt-dlp's extractors in the background so the first song is not the slow one
+        self._warmup_task = asyncio.create_task(self.youtube_client.warm_up())
+        
+        # One shared view routes the buttons of every control panel, including old ones
+        self.register_persistent_views()
+        
+        # Read stored queues now, they are rebuilt on first use
+        if self.queue_store is not None:
+            await self.queue_store.load()
+            self.queue_store.start(self.music_queues, self.currently_playing, self.control_panels)
+    
+    async def close(self):
+        """
+        Shut down the bot and release the YouTube client's resources
+        """
+        self.panel_renderer.cancel_all()
+        if self._warmup_task is not None and not self._warmup_task.done():
+            # The extraction it waits on is dropped by the executor shutdown in the client's close()
+            self._warmup_task.cancel()
+            try:
+                await self._warmup_task
+            except asyncio.CancelledError:
+                pass
+        self._warmup_task = None
+        if self.queue_store is not None:
+            try:
+                await self.queue_store.close(self.music_queues, self.currently_playing, self.control_panels)
+            except Exception as e:
+                print(f"Error saving queues: {e}")
+        if self._youtube_client is not None:
+            try:
+                await self._youtube_client.close()
+            except Exception as e:
+                print(f"Error closing YouTube client: {e}")
+        await super().close()
+    
+    @property
+    def youtube_client(self):
+        """
+        The YouTube service used everywhere in the bot
+        
+        Every search and URL lookup goes through this one instance, so they
+        share one metadata cache, one HTTP connection pool and one API quota.
+        
+        Returns:
+            ClientYouTube: Shared YouTube service
+        """
+        if self._youtube_client is None:
+            self._youtube_client = ClientYouTube(
+                api_key=os.environ.get('YOUTUBE_API_KEY')
+            )
+        return self._youtube_client
+    
+    def _create_queue_store(self):
+        """
+        Create the queue store if QUEUE_STORE_DB is configured
+        
+        Returns:
+            QueueStore: Queue store or None if persistence is disabled
+        """
+        queue_db = os.environ.get('QUEUE_STORE_DB')
+        if not queue_db:
+            return None
+        
+        try:
+            return QueueStore(queue_db, interval=float(os.environ.get('QUEUE_SNAPSHOT_INTERVAL', 5)))
+        except Exception as e:
+            print(f"WARNING: Could not open queue store at {queue_db}: {e}")
+            return None
+    
     def get_queue_id(self, guild_id, channel_id):
         """
         Create a unique queue ID from guild and channel IDs
@@ -0,0 +1,169 @@
+"""
+Slash command sync that only talks to Discord when the command tree changed
+"""
+import asyncio
+import hashlib
+import json
+import os
+
+import discord
+
+
+class CommandSyncManager:
+    """
+    Syncs the global slash commands to guilds
+
+    The command tree is hashed and the hash last synced to each guild is
+    kept (in a JSON file when a state path is given), so a restart with
+    unchanged commands makes no REST calls at all. Guilds that do need a
+    sync are synced concurrently, bounded by a semaphore. 429 responses are
+    waited out by discord.py's HTTP client itself; only when the client has
+    a max_ratelimit_timeout does it raise RateLimited instead, and the sync
+    is then retried after the reported retry_after. The hashes stay in
+    memory, so on_ready firing again after a reconnect only retries guilds
+    whose sync failed.
+    """
+    def __init__(self, tree, state_path=None, concurrency=4, max_retries=2):
+        """
+        Initialize the sync manager
+
+        Args:
+            tree (discord.app_commands.CommandTree): Bot command tree
+            state_path (str, optional): JSON file keeping the hash synced to each guild
+            concurrency (int): Guild syncs allowed to run at once
+            max_retries (int): Retries of a guild sync after discord.RateLimited
+        """
+        self.tree = tree
+        self.state_path = state_path
+        self.max_retries = max_retries
+
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._lock = asyncio.Lock()
+        self._synced = None  # Guild ID -> tree hash, loaded on first use
+
+        self.stats = {'synced': 0, 'skipped': 0, 'failed': 0, 'rate_limited': 0}
+
+    def tree_hash(self):
+        """
+        Hash the global commands as they would be sent to Discord
+
+        Returns:
+            str: SHA-256 hex digest of the command payloads
+        """
+        payloads = []
+        for command in self.tree.get_commands():
+            try:
+                payloads.append(command.to_dict(self.tree))
+            except TypeError:
+                payloads.append(command.to_dict())  # discord.py before 2.4
+
+        payloads.sort(key=lambda payload: (payload.get('type', 1), payload.get('name', '')))
+        return hashlib.sha256(json.dumps(payloads, sort_keys=True, default=str).encode()).hexdigest()
+
+    async def sync_guilds(self, guilds, force=False):
+        """
+        Sync the commands to every guild whose last synced hash differs
+
+        Args:
+            guilds (iterable): Guilds to check
+            force (bool): Sync even if the stored hash matches
+
+        Returns:
+            dict: Counts of synced, skipped and failed guilds
+        """
+        async with self._lock:
+            if self._synced is None:
+                self._synced = await asyncio.to_thread(self._load_state)
+
+            digest = self.tree_hash()
+            pending = []
+            skipped = 0
+            for guild in guilds:
+                if not force and self._synced.get(str(guild.id)) == digest:
+                    skipped += 1
+                    continue
+                pending.append(guild)
+
+            self.stats['skipped'] += skipped
+            if not pending:
+                print(f"Slash commands up to date in {skipped} guild(s), nothing to sync")
+                return {'synced': 0, 'skipped': skipped, 'failed': 0}
+
+            print(f"Syncing slash commands to {len(pending)} guild(s) ({skipped} already up to date)...")
+            results = await asyncio.gather(*(self._sync_guild(guild) for guild in pending))
+
+            synced = 0
+            for guild, ok in zip(pending, results):
+                if ok:
+                    self._synced[str(guild.id)] = digest
+                    synced += 1
+
+            if synced:
+                try:
+                    await asyncio.to_thread(self._save_state, dict(self._synced))
+                except Exception as e:
+                    print(f"Error saving command sync state: {e}")
+
+            failed = len(pending) - synced
+            print(f"Command sync complete: {synced} synced, {skipped} skipped, {failed} failed")
+            return {'synced': synced, 'skipped': skipped, 'failed': failed}
+
+    def forget_guild(self, guild_id):
+        """
+        Drop the stored hash of a guild (e.g. after leaving it)
+
+        Args:
+            guild_id (str): Discord guild ID
+        """
+        if self._synced is not None:
+            self._synced.pop(str(guild_id), None)
+
+    async def _sync_guild(self, guild):
+        """Copy the global commands to one guild and sync them"""
+        async with self._semaphore:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    self.tree.clear_commands(guild=guild)
+                    self.tree.copy_global_to(guild=guild)
+                    synced = await self.tree.sync(guild=guild)
+                    print(f"  ✅ {guild.name}: {len(synced)} command(s)")
+                    self.stats['synced'] += 1
+                    return True
+                except discord.RateLimited as e:
+                    # Longer than the client's max_ratelimit_timeout, wait here instead
+                    self.stats['rate_limited'] += 1
+                    if attempt < self.max_retries:
+                        await asyncio.sleep(e.retry_after)
+                        continue
+                    print(f"  ❌ {guild.name}: Failed - {e}")
+                except Exception as e:
+                    print(f"  ❌ {guild.name}: Failed - {e}")
+                break
+
+        self.stats['failed'] += 1
+        return False
+
+    def _load_state(self):
+        """Read the stored guild -> hash mapping"""
+        if not self.state_path or not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error reading command sync state: {e}")
+            return {}
+
+    def _save_state(self, synced):
+        """Write the guild -> hash mapping atomically"""
+        if not self.state_path:
+            return
+
+        directory = os.path.dirname(self.state_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+
+        temp_path = f"{self.state_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(synced, f)
+        os.replace(temp_path, self.state_path)
@@ -0,0 +1,186 @@
+"""
+Registry of control panel messages
+"""
+
+
+class PanelRegistry:
+    """
+    Keeps a message handle for every control panel, indexed by guild and queue
+
+    Handles are the Message returned when the panel was sent, or a
+    PartialMessage when only the ID is known, so panels can be edited
+    directly without fetching them first. Each panel is bound to the queue
+    (guild + voice channel) it displays, and reverse lookups from text
+    channel to guild and queue make every removal O(1).
+    """
+    def __init__(self):
+        """Initialize an empty registry"""
+        self._panels = {}  # Text channel ID -> message handle
+        self._guilds = {}  # Text channel ID -> guild ID
+        self._queues = {}  # Text channel ID -> queue ID
+        self._by_guild = {}  # Guild ID -> {text channel ID: message handle}
+        self._by_queue = {}  # Queue ID -> {text channel ID: message handle}
+        self.version = 0  # Bumped on every change, for snapshots
+
+    def register(self, guild_id, text_channel_id, message, queue_id=None):
+        """
+        Store the panel message for a text channel, replacing any previous one
+
+        Args:
+            guild_id (str): Discord guild ID
+            text_channel_id (int): Text channel the panel was sent to
+            message (discord.Message or discord.PartialMessage): Panel message
+            queue_id (str, optional): Queue the panel displays
+        """
+        guild_id = str(guild_id)
+        self.remove(text_channel_id)
+
+        self._panels[text_channel_id] = message
+        self._guilds[text_channel_id] = guild_id
+        self._by_guild.setdefault(guild_id, {})[text_channel_id] = message
+        if queue_id is not None:
+            self._queues[text_channel_id] = queue_id
+            self._by_queue.setdefault(queue_id, {})[text_channel_id] = message
+        self.version += 1
+
+    def bind(self, text_channel_id, queue_id):
+        """
+        Bind an existing panel to a different queue (e.g. after the bot moved channels)
+
+        Args:
+            text_channel_id (int): Text channel ID
+            queue_id (str): Queue the panel now displays
+        """
+        message = self._panels.get(text_channel_id)
+        if message is None or self._queues.get(text_channel_id) == queue_id:
+            return
+
+        self._unbind(text_channel_id)
+        self._queues[text_channel_id] = queue_id
+        self._by_queue.setdefault(queue_id, {})[text_channel_id] = message
+        self.version += 1
+
+    def get(self, text_channel_id):
+        """
+        Get the panel message in a text channel
+
+        Args:
+            text_channel_id (int): Text channel ID
+
+        Returns:
+            discord.Message or discord.PartialMessage: Panel message or None
+        """
+        return self._panels.get(text_channel_id)
+
+    def queue_of(self, text_channel_id):
+        """
+        Get the queue a panel is bound to
+
+        Args:
+            text_channel_id (int): Text channel ID
+
+        Returns:
+            str: Queue ID or None
+        """
+        return self._queues.get(text_channel_id)
+
+    def guild_of(self, text_channel_id):
+        """
+        Get the guild a panel belongs to
+
+        Args:
+            text_channel_id (int): Text channel ID
+
+        Returns:
+            str: Guild ID or None
+        """
+        return self._guilds.get(text_channel_id)
+
+    def remove(self, text_channel_id):
+        """
+        Forget the panel in a text channel
+
+        Args:
+            text_channel_id (int): Text channel ID
+
+        Returns:
+            discord.Message or discord.PartialMessage: Removed panel message or None
+        """
+        message = self._panels.pop(text_channel_id, None)
+        if message is None:
+            return None
+
+        _discard(self._by_guild, self._guilds.pop(text_channel_id, None), text_channel_id)
+        self._unbind(text_channel_id)
+        self.version += 1
+        return message
+
+    def remove_guild(self, guild_id):
+        """
+        Forget every panel of a guild (e.g. when the bot leaves it)
+
+        Args:
+            guild_id (str): Discord guild ID
+
+        Returns:
+            list: Text channel IDs whose panels were removed
+        """
+        text_channel_ids = list(self._by_guild.get(str(guild_id), {}))
+        for text_channel_id in text_channel_ids:
+            self.remove(text_channel_id)
+        return text_channel_ids
+
+    def for_guild(self, guild_id):
+        """
+        Get the panels of one guild
+
+        Args:
+            guild_id (str): Discord guild ID
+
+        Returns:
+            list: (text channel ID, message handle) pairs
+        """
+        return list(self._by_guild.get(str(guild_id), {}).items())
+
+    def for_queue(self, queue_id):
+        """
+        Get the panels bound to one queue
+
+        Args:
+            queue_id (str): Queue ID
+
+        Returns:
+            list: (text channel ID, message handle) pairs
+        """
+        return list(self._by_queue.get(queue_id, {}).items())
+
+    def __contains__(self, text_channel_id):
+        return text_channel_id in self._panels
+
+    def __len__(self):
+        return len(self._panels)
+
+    def items(self):
+        """
+        Get every registered panel
+
+        Returns:
+            list: (text channel ID, message handle) pairs
+        """
+        return list(self._panels.items())
+
+    def _unbind(self, text_channel_id):
+        """Remove a panel from the queue index"""
+        _discard(self._by_queue, self._queues.pop(text_channel_id, None), text_channel_id)
+
+
+def _discard(index, group, text_channel_id):
+    """Remove a panel from one group of an index, dropping the group once empty"""
+    if group is None:
+        return
+
+    panels = index.get(group)
+    if panels is not None:
+        panels.pop(text_channel_id, None)
+        if not panels:
+            del index[group]
@@ -0,0 +1,142 @@
+"""
+Debounced rendering of control panel messages
+"""
+import asyncio
+
+
+class PanelRenderScheduler:
+    """
+    Coalesces control panel updates
+
+    Callers mark a panel dirty instead of editing it directly. Each dirty
+    panel is rendered once after a short window, using the most recent
+    render request, and at most one render per panel runs at a time. The
+    hash of the last rendered state is kept so renders that would produce
+    an identical message can skip the edit.
+    """
+    def __init__(self, delay=0.75):
+        """
+        Initialize the scheduler
+
+        Args:
+            delay (float): Seconds to wait for further updates before rendering
+        """
+        self.delay = delay
+
+        self._pending = {}  # Panel key -> latest render coroutine function
+        self._tasks = {}  # Panel key -> task rendering that panel
+        self._wakeups = {}  # Panel key -> event that cuts the delay short
+        self._hashes = {}  # Panel key -> hash of the last rendered state
+
+        self.stats = {'requested': 0, 'rendered': 0, 'unchanged': 0}
+
+    def mark_dirty(self, key, render):
+        """
+        Request a render of a panel
+
+        Args:
+            key (hashable): Panel identifier (e.g. text channel ID)
+            render (callable): No-argument coroutine function that renders the panel
+        """
+        self.stats['requested'] += 1
+        self._pending[key] = render
+
+        if key not in self._tasks:
+            self._wakeups[key] = asyncio.Event()
+            self._tasks[key] = asyncio.create_task(self._run(key))
+
+    async def flush(self, *keys):
+        """
+        Render dirty panels now and wait for them to finish
+
+        Args:
+            *keys: Panel keys to flush, every dirty panel if none are given
+        """
+        keys = keys or tuple(self._tasks)
+        tasks = []
+        for key in keys:
+            task = self._tasks.get(key)
+            if task is not None:
+                self._wakeups[key].set()
+                tasks.append(task)
+
+        if tasks:
+            await asyncio.gather(*(asyncio.shield(task) for task in tasks), return_exceptions=True)
+
+    def is_unchanged(self, key, digest):
+        """
+        Check whether a panel was last rendered with the same state
+
+        Args:
+            key (hashable): Panel identifier
+            digest (int): Hash of the state about to be rendered
+
+        Returns:
+            bool: True if the edit can be skipped
+        """
+        if self._hashes.get(key) == digest:
+            self.stats['unchanged'] += 1
+            return True
+        return False
+
+    def is_rendered(self, key):
+        """
+        Check whether a panel currently shows a state rendered by this scheduler
+
+        Args:
+            key (hashable): Panel identifier
+
+        Returns:
+            bool: False if the panel was never rendered or was forgotten since
+        """
+        return key in self._hashes
+
+    def remember(self, key, digest):
+        """
+        Record the state a panel was rendered with
+
+        Args:
+            key (hashable): Panel identifier
+            digest (int): Hash of the rendered state
+        """
+        self._hashes[key] = digest
+
+    def forget(self, key):
+        """
+        Drop the recorded state of a panel, e.g. after it was edited elsewhere or deleted
+
+        Args:
+            key (hashable): Panel identifier
+        """
+        self._hashes.pop(key, None)
+
+    def cancel_all(self):
+        """Cancel every scheduled render"""
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+        self._pending.clear()
+        self._wakeups.clear()
+
+    async def _run(self, key):
+        """Render a panel until no further updates are pending"""
+        try:
+            while key in self._pending:
+                wakeup = self._wakeups[key]
+                try:
+                    await asyncio.wait_for(wakeup.wait(), self.delay)
+                except asyncio.TimeoutError:
+                    pass
+                wakeup.clear()
+
+                render = self._pending.pop(key, None)
+                if render is None:
+                    continue
+                try:
+                    await render()
+                    self.stats['rendered'] += 1
+                except Exception as e:
+                    print(f"Error rendering control panel: {e}")
+        finally:
+            self._tasks.pop(key, None)
+            self._wakeups.pop(key, None)
@@ -0,0 +1,364 @@
+"""
+Persistence of queues and control panels across bot restarts, backed by SQLite
+"""
+import asyncio
+import json
+import os
+import queue
+import sqlite3
+import threading
+from collections import defaultdict
+
+from .track import Track
+from .track_queue import TrackQueue
+
+_STOP = object()
+
+
+class QueueStore:
+    """
+    Write-behind journal of queue and control panel state
+
+    A snapshot pass runs on the event loop every few seconds and only
+    collects queues whose version, object or current track changed since
+    the last pass. On the loop a changed queue is only copied as a tuple of
+    its Track references (a C-level copy, the deque keeps changing); the
+    tracks are converted, serialised and committed in one transaction by a
+    background thread, so commands never wait on disk I/O.
+
+    On startup the stored rows are read once (off the event loop) and kept
+    unparsed. A queue is only rebuilt when it is first accessed through
+    QueueMap, and panels are handed out per guild once the guild is known.
+    """
+    def __init__(self, path, interval=5.0):
+        """
+        Initialize the queue store
+
+        Args:
+            path (str): SQLite database file (e.g. on a mounted volume)
+            interval (float): Seconds between snapshot passes
+
+        Raises:
+            sqlite3.Error: If the database cannot be opened or is not a valid SQLite file
+        """
+        self.path = path
+        self.interval = interval
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+
+        self._snapshots = {}  # Queue ID -> (current JSON, tracks JSON) not restored yet
+        self._panels = {}  # Text channel ID -> (guild ID, queue ID, message ID) not restored yet
+        self._persisted = {}  # Queue ID -> (queue, version, current track) last written
+        self._panels_version = 0
+
+        # Opened here so a bad path or a corrupt file fails the constructor,
+        # then owned by the writer thread
+        connection = self._connect(check_same_thread=False)
+
+        self._writes = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, args=(connection,), name='queue-store-writer', daemon=True)
+        self._writer.start()
+        self._snapshot_task = None
+
+    async def load(self):
+        """Read the stored queues and panels without parsing the tracks yet"""
+        try:
+            queues, panels = await asyncio.to_thread(self._read_all)
+        except Exception as e:
+            print(f"Error loading stored queues: {e}")
+            return
+
+        self._snapshots = queues
+        self._panels = panels
+        if queues or panels:
+            print(f"Found {len(queues)} stored queue(s) and {len(panels)} control panel(s) to restore")
+
+    def start(self, queues, currently_playing, panels):
+        """
+        Start the periodic snapshot pass
+
+        Args:
+            queues (dict): Queue ID -> TrackQueue
+            currently_playing (dict): Queue ID -> current track
+            panels (PanelRegistry): Control panel registry
+        """
+        if self._snapshot_task is None or self._snapshot_task.done():
+            self._snapshot_task = asyncio.create_task(self._snapshot_loop(queues, currently_playing, panels))
+
+    async def close(self, queues, currently_playing, panels):
+        """
+        Write a final snapshot and stop the writer thread
+
+        Args:
+            queues (dict): Queue ID -> TrackQueue
+            currently_playing (dict): Queue ID -> current track
+            panels (PanelRegistry): Control panel registry
+        """
+        if self._snapshot_task is not None:
+            self._snapshot_task.cancel()
+            self._snapshot_task = None
+
+        self.snapshot(queues, currently_playing, panels)
+        self._writes.put(_STOP)
+        await asyncio.to_thread(self._writer.join, 5)
+
+    # Restoring
+
+    def restore_queue(self, queue_id):
+        """
+        Rebuild a stored queue, the track that was playing goes back to the front
+
+        Args:
+            queue_id (str): Queue ID
+
+        Returns:
+            TrackQueue: Restored queue or None if nothing was stored
+        """
+        stored = self._snapshots.pop(queue_id, None)
+        if stored is None:
+            return None
+
+        current, tracks = stored
+        try:
+            entries = json.loads(tracks)
+            if current:
+                entries.insert(0, json.loads(current))
+            restored = TrackQueue(Track.from_tuple(entry) for entry in entries)
+        except (TypeError, ValueError) as e:
+            print(f"Error restoring queue {queue_id}: {e}")
+            restored = TrackQueue()
+
+        # Already on disk in this state, and deleted by the next pass if dropped
+        self._persisted[queue_id] = (restored, restored.version, None)
+        print(f"Restored {len(restored)} track(s) for queue {queue_id}")
+        return restored
+
+    def pending_queue_ids(self, guild_id):
+        """
+        Get stored queues of a guild that have not been restored yet
+
+        Args:
+            guild_id (str): Discord guild ID
+
+        Returns:
+            list: Queue IDs
+        """
+        prefix = f"{guild_id}_"
+        return [queue_id for queue_id in self._snapshots if queue_id.startswith(prefix)]
+
+    def take_panels(self, guild_id):
+        """
+        Hand out the stored control panels of a guild (each panel only once)
+
+        Args:
+            guild_id (str): Discord guild ID
+
+        Returns:
+            list: (text channel ID, queue ID, message ID) tuples
+        """
+        guild_id = str(guild_id)
+        taken = []
+        for text_channel_id, (panel_guild_id, queue_id, message_id) in list(self._panels.items()):
+            if panel_guild_id == guild_id:
+                del self._panels[text_channel_id]
+                taken.append((text_channel_id, queue_id, message_id))
+        return taken
+
+    def forget_guild(self, guild_id):
+        """
+        Drop everything stored for a guild that has not been restored (e.g. after leaving it)
+
+        Args:
+            guild_id (str): Discord guild ID
+        """
+        for queue_id in self.pending_queue_ids(guild_id):
+            del self._snapshots[queue_id]
+            self._persisted[queue_id] = (None, None, None)  # Deleted by the next pass
+        if self.take_panels(guild_id):
+            self._panels_version = -1  # Force the panel rows to be rewritten
+
+    # Snapshotting
+
+    def snapshot(self, queues, currently_playing, panels):
+        """
+        Queue writes for everything that changed since the last pass
+
+        Args:
+            queues (dict): Queue ID -> TrackQueue
+            currently_playing (dict): Queue ID -> current track
+            panels (PanelRegistry): Control panel registry
+
+        Returns:
+            int: Number of queues written or deleted
+        """
+        # Nothing would drain the writes, keep them from piling up in memory
+        if not self._writer.is_alive():
+            return 0
+
+        changes = []
+        seen = set()
+
+        for queue_id, track_queue in list(queues.items()):
+            current = currently_playing.get(queue_id)
+            if not track_queue and current is None:
+                continue
+            seen.add(queue_id)
+
+            previous = self._persisted.get(queue_id)
+            if previous is not None and previous[0] is track_queue and previous[1] == track_queue.version and previous[2] is current:
+                continue
+
+            self._persisted[queue_id] = (track_queue, track_queue.version, current)
+            changes.append((queue_id, current, tuple(track_queue)))
+
+        for queue_id in list(self._persisted):
+            if queue_id not in seen:
+                del self._persisted[queue_id]
+                changes.append((queue_id, None, None))
+
+        if changes:
+            self._writes.put(('queues', changes))
+
+        if panels.version != self._panels_version:
+            self._panels_version = panels.version
+            rows = [
+                (text_channel_id, panels.guild_of(text_channel_id), panels.queue_of(text_channel_id), message.id)
+                for text_channel_id, message in panels.items()
+            ]
+            # Keep panels of guilds that have not been restored yet
+            rows.extend((text_channel_id, *stored) for text_channel_id, stored in self._panels.items())
+            self._writes.put(('panels', rows))
+
+        return len(changes)
+
+    async def _snapshot_loop(self, queues, currently_playing, panels):
+        """Periodically snapshot changed state"""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.snapshot(queues, currently_playing, panels)
+            except Exception as e:
+                print(f"Error snapshotting queues: {e}")
+
+    # Database access (writer thread and startup read)
+
+    def _connect(self, check_same_thread=True):
+        """Open a connection and make sure the schema exists"""
+        connection = sqlite3.connect(self.path, timeout=5, check_same_thread=check_same_thread)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS queues ('
+            'queue_id TEXT PRIMARY KEY, current TEXT, tracks TEXT NOT NULL)'
+        )
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS panels ('
+            'text_channel_id INTEGER PRIMARY KEY, guild_id TEXT NOT NULL, queue_id TEXT, message_id INTEGER NOT NULL)'
+        )
+        return connection
+
+    def _read_all(self):
+        """Read every stored queue and panel"""
+        connection = self._connect()
+        try:
+            queues = {
+                queue_id: (current, tracks)
+                for queue_id, current, tracks in connection.execute('SELECT queue_id, current, tracks FROM queues')
+            }
+            panels = {
+                text_channel_id: (guild_id, queue_id, message_id)
+                for text_channel_id, guild_id, queue_id, message_id in connection.execute(
+                    'SELECT text_channel_id, guild_id, queue_id, message_id FROM panels'
+                )
+            }
+        finally:
+            connection.close()
+        return queues, panels
+
+    def _write_loop(self, connection):
+        """Background thread: apply queued snapshots in batched transactions"""
+        while True:
+            batch = [self._writes.get()]
+            # Drain whatever else is queued so bursts share one commit
+            while True:
+                try:
+                    batch.append(self._writes.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = False
+            try:
+                for entry in batch:
+                    if entry is _STOP:
+                        stop = True
+                    elif entry[0] == 'queues':
+                        for queue_id, current, tracks in entry[1]:
+                            if tracks is None:
+                                connection.execute('DELETE FROM queues WHERE queue_id = ?', (queue_id,))
+                            else:
+                                connection.execute(
+                                    'INSERT OR REPLACE INTO queues (queue_id, current, tracks) VALUES (?, ?, ?)',
+                                    (
+                                        queue_id,
+                                        json.dumps(Track.coerce(current).to_tuple()) if current is not None else None,
+                                        json.dumps([track.to_tuple() for track in tracks])
+                                    )
+                                )
+                    elif entry[0] == 'panels':
+                        connection.execute('DELETE FROM panels')
+                        connection.executemany(
+                            'INSERT INTO panels (text_channel_id, guild_id, queue_id, message_id) VALUES (?, ?, ?, ?)',
+                            entry[1]
+                        )
+                connection.commit()
+            except Exception as e:
+                print(f"Error writing queue store: {e}")
+
+            if stop:
+                connection.close()
+                return
+
+
+class QueueMap(defaultdict):
+    """
+    Queue ID -> TrackQueue mapping that restores stored queues on first access
+
+    Missing keys are looked up in the QueueStore before an empty queue is
+    created, so only the queues that are actually used get rebuilt.
+    """
+    def __init__(self, store=None):
+        """
+        Initialize the mapping
+
+        Args:
+            store (QueueStore, optional): Store to restore queues from
+        """
+        super().__init__(TrackQueue)
+        self.store = store
+
+    def __missing__(self, queue_id):
+        restored = self.store.restore_queue(queue_id) if self.store is not None else None
+        if restored is None:
+            return super().__missing__(queue_id)
+
+        self[queue_id] = restored
+        return restored
+
+    def pop(self, queue_id, *default):
+        if queue_id not in self and self.store is not None:
+            restored = self.store.restore_queue(queue_id)
+            if restored is not None:
+                return restored
+        return super().pop(queue_id, *default)
+
+    def restore_guild(self, guild_id):
+        """
+        Restore every stored queue of a guild (e.g. before acting on all of them)
+
+        Args:
+            guild_id (str): Discord guild ID
+        """
+        if self.store is not None:
+            for queue_id in self.store.pending_queue_ids(guild_id):
+                self[queue_id]
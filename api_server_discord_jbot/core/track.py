@@ -0,0 +1,138 @@
+"""
+Compact value type for tracks passed around the bot
+"""
+import sys
+
+from api_client_youtube.extractors.duration import format_duration
+
+
+class Track:
+    """
+    A YouTube track as it is queued, played and shown on the control panel
+
+    Only the video ID, title, channel and duration are stored. Channel names
+    are interned because the tracks of a playlist usually share a handful of
+    them, and the watch URL and formatted duration are derived on access
+    instead of being kept on every queued track.
+
+    Supports item access (track['title'], track.get('url')) so code written
+    against the old dict entries keeps working.
+    """
+    __slots__ = ('id', 'title', 'channel', 'duration')
+
+    def __init__(self, id, title, channel=None, duration=0):
+        """
+        Initialize a track
+
+        Args:
+            id (str): YouTube video ID
+            title (str): Video title
+            channel (str, optional): Channel name
+            duration (int, optional): Duration in seconds, 0 if unknown
+        """
+        self.id = id
+        self.title = title
+        self.channel = sys.intern(channel) if channel else None
+        self.duration = int(duration or 0)
+
+    @property
+    def url(self):
+        """Watch URL of the video"""
+        return f"https://www.youtube.com/watch?v={self.id}"
+
+    @property
+    def duration_str(self):
+        """Duration as MM:SS or HH:MM:SS, empty if unknown"""
+        if not self.duration:
+            return ""
+        return format_duration(self.duration)
+
+    @classmethod
+    def coerce(cls, track):
+        """
+        Convert a dict entry (search result, playlist entry) to a Track
+
+        Args:
+            track (Track or dict): Track with at least id and title
+
+        Returns:
+            Track: Track record (Tracks are returned as-is)
+        """
+        if isinstance(track, cls):
+            return track
+        return cls(track['id'], track.get('title') or 'Unknown Title', track.get('channel'), track.get('duration'))
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key) from None
+
+    def get(self, key, default=None):
+        return getattr(self, key, default) if isinstance(key, str) else default
+
+    def __eq__(self, other):
+        if not isinstance(other, Track):
+            return NotImplemented
+        return self.to_tuple() == other.to_tuple()
+
+    def __hash__(self):
+        return hash(self.to_tuple())
+
+    def __repr__(self):
+        return f"Track(id={self.id!r}, title={self.title!r})"
+
+    # Serialisation
+
+    def to_tuple(self):
+        """
+        Get the track as a compact tuple (cheapest form for JSON or pickling)
+
+        Returns:
+            tuple: (id, title, channel, duration)
+        """
+        return (self.id, self.title, self.channel, self.duration)
+
+    @classmethod
+    def from_tuple(cls, values):
+        """
+        Rebuild a track from to_tuple() output (a list after a JSON round trip)
+
+        Args:
+            values (tuple or list): (id, title, channel, duration)
+
+        Returns:
+            Track: Track record
+        """
+        return cls(*values)
+
+    def to_dict(self):
+        """
+        Get the track as a plain dict, e.g. for API responses
+
+        Returns:
+            dict: id, title, url and, when known, channel, duration and duration_str
+        """
+        data = {'id': self.id, 'title': self.title, 'url': self.url}
+        if self.channel:
+            data['channel'] = self.channel
+        if self.duration:
+            data['duration'] = self.duration
+            data['duration_str'] = self.duration_str
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Rebuild a track from to_dict() output
+
+        Args:
+            data (dict): Track dict
+
+        Returns:
+            Track: Track record
+        """
+        return cls.coerce(data)
+
+    def __reduce__(self):
+        return (self.__class__.from_tuple, (self.to_tuple(),))
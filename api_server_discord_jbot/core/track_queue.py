@@ -0,0 +1,296 @@
+"""
+Per-channel music queue with constant-time head operations and a track index
+"""
+import random
+from collections import deque
+from itertools import islice
+
+from .track import Track
+
+
+class TrackQueue:
+    """
+    Queue of tracks backed by a deque
+
+    Popping the next track and pushing a track back to the front are O(1).
+    A video ID -> count index answers membership and de-duplication in O(1),
+    and a video ID -> position index is kept with absolute positions so it
+    survives head pops and appends; it is only rebuilt after reorders.
+    """
+    __slots__ = ('_tracks', '_counts', '_positions', '_positions_valid', '_head', 'version')
+
+    def __init__(self, tracks=()):
+        """
+        Initialize the queue
+
+        Args:
+            tracks (iterable, optional): Initial tracks (dicts or Tracks)
+        """
+        self._tracks = deque()
+        self._counts = {}  # Video ID -> number of queued copies
+        self._positions = {}  # Video ID -> absolute position of its first copy
+        self._positions_valid = True
+        self._head = 0  # Absolute position of the track at index 0
+        self.version = 0  # Bumped on every change, for renderers and snapshots
+        self.extend(tracks)
+
+    def __len__(self):
+        return len(self._tracks)
+
+    def __bool__(self):
+        return bool(self._tracks)
+
+    def __iter__(self):
+        return iter(self._tracks)
+
+    def __contains__(self, video_id):
+        return video_id in self._counts
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self._tracks))
+            return list(islice(self._tracks, start, stop, step))
+        return self._tracks[index]
+
+    def __repr__(self):
+        return f"TrackQueue(len={len(self._tracks)})"
+
+    # Adding tracks
+
+    def append(self, track, skip_duplicates=False):
+        """
+        Add a track to the end of the queue
+
+        Args:
+            track (Track or dict): Track to add
+            skip_duplicates (bool): Do nothing if the video is already queued
+
+        Returns:
+            Track: The queued track, or None if it was skipped as a duplicate
+        """
+        track = Track.coerce(track)
+        if skip_duplicates and track.id in self._counts:
+            return None
+
+        if track.id not in self._counts:
+            self._positions[track.id] = self._head + len(self._tracks)
+        self._tracks.append(track)
+        self._count(track.id, 1)
+        self.version += 1
+        return track
+
+    def extend(self, tracks, skip_duplicates=False):
+        """
+        Add several tracks to the end of the queue
+
+        Args:
+            tracks (iterable): Tracks to add
+            skip_duplicates (bool): Skip videos that are already queued
+
+        Returns:
+            int: Number of tracks added
+        """
+        added = 0
+        for track in tracks:
+            if self.append(track, skip_duplicates) is not None:
+                added += 1
+        return added
+
+    def appendleft(self, track):
+        """
+        Put a track at the front of the queue (e.g. to resume the current track)
+
+        Args:
+            track (Track or dict): Track to add
+
+        Returns:
+            Track: The queued track
+        """
+        track = Track.coerce(track)
+        self._tracks.appendleft(track)
+        self._head -= 1
+        self._positions[track.id] = self._head
+        self._count(track.id, 1)
+        self.version += 1
+        return track
+
+    # Removing tracks
+
+    def popleft(self):
+        """
+        Remove and return the next track
+
+        Returns:
+            Track: Next track
+
+        Raises:
+            IndexError: If the queue is empty
+        """
+        track = self._tracks.popleft()
+        self._head += 1
+        if self._count(track.id, -1):
+            # Another copy is queued further back, its position is unknown
+            self._positions_valid = False
+        self.version += 1
+        return track
+
+    def remove_range(self, start, stop):
+        """
+        Remove tracks from index start up to (not including) stop
+
+        Args:
+            start (int): First index to remove
+            stop (int): Index after the last one to remove
+
+        Returns:
+            list: Removed tracks
+        """
+        start, stop, _ = slice(start, stop).indices(len(self._tracks))
+        if start >= stop:
+            return []
+
+        # Rotate the range to the head so each removal is a popleft
+        self._tracks.rotate(-start)
+        removed = [self._tracks.popleft() for _ in range(stop - start)]
+        self._tracks.rotate(start)
+
+        for track in removed:
+            self._count(track.id, -1)
+        self._positions_valid = False
+        self.version += 1
+        return removed
+
+    def remove(self, index):
+        """
+        Remove the track at an index
+
+        Args:
+            index (int): Index of the track
+
+        Returns:
+            Track: Removed track
+
+        Raises:
+            IndexError: If the index is out of range
+        """
+        if not -len(self._tracks) <= index < len(self._tracks):
+            raise IndexError("queue index out of range")
+        index %= len(self._tracks)
+        return self.remove_range(index, index + 1)[0]
+
+    def clear(self):
+        """Remove every track"""
+        self._tracks.clear()
+        self._counts.clear()
+        self._positions.clear()
+        self._positions_valid = True
+        self._head = 0
+        self.version += 1
+
+    # Reordering
+
+    def move(self, old_index, new_index):
+        """
+        Move a track to a new position
+
+        Args:
+            old_index (int): Current index of the track
+            new_index (int): Index the track should end up at
+
+        Returns:
+            Track: Moved track
+
+        Raises:
+            IndexError: If either index is out of range
+        """
+        size = len(self._tracks)
+        if not (0 <= old_index < size and 0 <= new_index < size):
+            raise IndexError("queue index out of range")
+
+        track = self._tracks[old_index]
+        if old_index != new_index:
+            del self._tracks[old_index]
+            self._tracks.insert(new_index, track)
+            self._positions_valid = False
+            self.version += 1
+        return track
+
+    def shuffle(self, start=0):
+        """
+        Shuffle the queue in place
+
+        Args:
+            start (int): Leave tracks before this index where they are
+        """
+        if len(self._tracks) - start < 2:
+            return
+
+        head = list(islice(self._tracks, start))
+        tail = list(islice(self._tracks, start, None))
+        random.shuffle(tail)
+        self._tracks = deque(head + tail)
+        self._positions_valid = False
+        self.version += 1
+
+    # Lookups
+
+    def peek(self, count=1, start=0):
+        """
+        Get upcoming tracks without removing them
+
+        Args:
+            count (int): Number of tracks to return
+            start (int): Index of the first track to return
+
+        Returns:
+            list: Up to count tracks
+        """
+        return list(islice(self._tracks, start, start + count))
+
+    def index_of(self, video_id):
+        """
+        Get the index of the first queued copy of a video
+
+        Args:
+            video_id (str): YouTube video ID
+
+        Returns:
+            int: Index in the queue or -1 if the video is not queued
+        """
+        if video_id not in self._counts:
+            return -1
+        if not self._positions_valid:
+            self._rebuild_positions()
+        return self._positions[video_id] - self._head
+
+    def count(self, video_id):
+        """
+        Get how many copies of a video are queued
+
+        Args:
+            video_id (str): YouTube video ID
+
+        Returns:
+            int: Number of queued copies
+        """
+        return self._counts.get(video_id, 0)
+
+    # Internal helpers
+
+    def _count(self, video_id, delta):
+        """Adjust a video's copy count and return the new count"""
+        remaining = self._counts.get(video_id, 0) + delta
+        if remaining > 0:
+            self._counts[video_id] = remaining
+        else:
+            self._counts.pop(video_id, None)
+            self._positions.pop(video_id, None)
+        return max(remaining, 0)
+
+    def _rebuild_positions(self):
+        """Recompute the first position of every queued video"""
+        self._head = 0
+        self._positions = {}
+        for index, track in enumerate(self._tracks):
+            self._positions.setdefault(track.id, index)
+        self._positions_valid = True